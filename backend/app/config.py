@@ -3,9 +3,18 @@ Application configuration management.
 Uses pydantic-settings for type-safe environment variables.
 """
 
-from typing import List
+from typing import Dict, List, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
+
+
+class WebhookDestination(BaseModel):
+    """Additional webhook sink that receives every submission."""
+
+    name: str = Field(..., min_length=1, max_length=50)
+    url: HttpUrl
+    secret: str = ""  # Signing secret for this destination
+    timeout: Optional[float] = Field(None, gt=0, le=30)  # seconds, defaults to n8n_timeout
 
 
 class Settings(BaseSettings):
@@ -35,7 +44,17 @@ class Settings(BaseSettings):
 
     # Rate Limiting
     rate_limit_per_hour: int = Field(3, validation_alias="RATE_LIMIT_PER_HOUR", ge=1, le=100)
-    rate_limit_storage_url: str = "memory://"  # Use Redis in production
+    rate_limit_capacity: int = Field(65536, ge=16)  # tracked clients per worker, 16 bytes each
+    rate_limit_proxy_hops: int = Field(1, ge=0, le=5)  # trusted X-Forwarded-For hops, 0 = ignore
+    rate_limit_shared_path: str = ""  # mmap file shared by all workers, empty = per-worker table
+    rate_limit_ipv4_prefix: int = Field(32, ge=8, le=32)  # IPv4 addresses per client (/32 = one)
+    rate_limit_ipv6_prefix: int = Field(
+        64, ge=16, le=128
+    )  # IPv6 addresses per client (/64 = one site)
+    rate_limit_network_per_hour: int = Field(0, ge=0)  # limit per wider network, 0 = none
+    rate_limit_network_ipv4_prefix: int = Field(24, ge=8, le=32)
+    rate_limit_network_ipv6_prefix: int = Field(48, ge=16, le=128)
+    max_request_body_bytes: int = Field(16384, ge=1024)  # larger bodies get 413 before parsing
 
     # n8n Webhook
     n8n_webhook_url: HttpUrl = Field(..., validation_alias="N8N_WEBHOOK_URL")
@@ -43,6 +62,108 @@ class Settings(BaseSettings):
     n8n_webhook_secret: str = Field(
         "", validation_alias="N8N_WEBHOOK_SECRET"
     )  # Optional signing secret
+    # Extra sinks (backup n8n, archive...) as a JSON list of {name, url, secret, timeout}
+    n8n_destinations: List[WebhookDestination] = []
+    # Acknowledgements required: "any", "all" or a number of destinations
+    n8n_quorum: str = Field("any", pattern=r"^(any|all|[1-9][0-9]*)$")
+    n8n_max_retries: int = Field(3, ge=1, le=10)  # total attempts per submission
+    n8n_retry_base_delay: float = Field(0.25, ge=0, le=10)  # seconds, doubled per attempt
+    n8n_retry_max_delay: float = Field(5.0, ge=0, le=60)  # also caps honoured Retry-After
+    n8n_retry_budget_ratio: float = Field(0.2, ge=0, le=1)  # retries per request
+    n8n_retry_budget_min_per_second: float = Field(0.5, ge=0)
+    n8n_retry_budget_burst: float = Field(10.0, ge=1)
+
+    # n8n Micro-batching (1 = one POST per submission)
+    n8n_batch_max_size: int = Field(1, ge=1, le=500)
+    n8n_batch_max_linger_ms: float = Field(25.0, ge=0, le=5000)
+
+    # n8n Circuit Breaker (fail fast while n8n is down or too slow)
+    n8n_breaker_failure_rate: float = Field(0.5, gt=0, le=1)
+    n8n_breaker_slow_call_seconds: float = Field(5.0, gt=0)
+    n8n_breaker_slow_call_rate: float = Field(0.8, gt=0, le=1)
+    n8n_breaker_minimum_calls: int = Field(10, ge=1)
+    n8n_breaker_window_seconds: int = Field(30, ge=1, le=600)
+    n8n_breaker_open_seconds: float = Field(15.0, gt=0)
+    n8n_breaker_half_open_probes: int = Field(2, ge=1)
+
+    # n8n Outbound Queue (calls over the cap wait in a fair queue per client)
+    n8n_max_in_flight: int = Field(10, ge=0)  # concurrent calls per destination, 0 = no cap
+    n8n_queue_timeout: float = Field(5.0, ge=0)  # seconds waiting for a slot before 503
+    n8n_queue_weights: Dict[str, float] = {}  # client identifier -> share (default 1)
+
+    # n8n Connection Pool (one pooled client per worker)
+    n8n_max_connections: int = Field(20, ge=1, le=1000)
+    n8n_max_keepalive_connections: int = Field(10, ge=0, le=1000)
+    n8n_keepalive_expiry: float = Field(30.0, ge=0, le=600)  # seconds
+    n8n_http2: bool = False  # Requires the optional h2 package (httpx[http2])
+
+    # n8n Latency Histograms (per destination, outcome and attempt)
+    latency_window_seconds: float = Field(300.0, gt=0)  # span covered by percentiles
+    latency_window_slots: int = Field(5, ge=1, le=60)  # rotation granularity
+    latency_log_interval: float = Field(60.0, ge=0)  # seconds between summary logs, 0 = off
+
+    # n8n Health Probing (background pings served from a cached snapshot)
+    webhook_health_interval: float = Field(30.0, ge=0)  # seconds, 0 = on-demand only
+    webhook_health_window: int = Field(20, ge=1, le=1000)  # probes in the success ratio
+    webhook_health_ewma_alpha: float = Field(0.3, gt=0, le=1)  # latency smoothing
+
+    # Contact Delivery
+    # "sync" forwards to n8n before responding; "queued" spools to disk and returns 202
+    contact_delivery_mode: Literal["sync", "queued"] = Field(
+        "sync", validation_alias="CONTACT_DELIVERY_MODE"
+    )
+    spool_path: str = "data/contact_spool.db"  # SQLite (WAL) spool file
+    spool_workers: int = Field(2, ge=1, le=32)
+    spool_batch_size: int = Field(64, ge=1, le=1000)  # submissions per fsync
+    spool_max_attempts: int = Field(8, ge=1, le=100)
+    spool_lease_seconds: float = Field(60.0, gt=0)
+    spool_poll_interval: float = Field(1.0, gt=0)  # seconds
+
+    # Dead Letters (undeliverable submissions, re-driven with python -m app.tools.replay)
+    dead_letter_path: str = "data/dead_letters.db"  # empty disables dead-lettering
+
+    # Validation Execution (where sanitization runs, so floods cannot stall the event loop)
+    validation_strategy: Literal["inline", "thread", "process"] = "inline"
+    validation_workers: int = Field(2, ge=1, le=64)  # thread/process pool size
+    validation_max_pending: int = Field(64, ge=1)  # queued + running before 503
+    validation_offload_min_chars: int = Field(512, ge=0)  # smaller submissions stay inline
+
+    # Disposable Email Domains (subdomains match too, reloaded on change or SIGHUP)
+    disposable_domains_path: str = ""  # one domain per line, empty = bundled list
+    disposable_domains_allowlist: List[str] = []  # JSON list in env, wins over the blocklist
+    disposable_domains_reload_interval: float = Field(30.0, ge=0)  # mtime polling, 0 = off
+
+    # Near-duplicate Detection (same message with small edits, per worker)
+    near_duplicate_action: Literal["off", "flag", "reject"] = "flag"  # flag = webhook metadata
+    near_duplicate_threshold: float = Field(0.6, gt=0, le=1)  # word 3-gram Jaccard estimate
+    near_duplicate_ttl_seconds: float = Field(86400.0, gt=0)
+    # About 1 KB each per worker (~5 MB at the default); the oldest are evicted first
+    near_duplicate_max_entries: int = Field(5000, ge=1)
+    near_duplicate_min_words: int = Field(8, ge=1)  # shorter messages are not compared
+
+    # Spam Scoring (hashed n-gram model from python -m app.tools.train_spam, needs numpy)
+    spam_model_path: str = ""  # .npz model file, empty disables scoring
+    spam_threshold: float = Field(0.99, gt=0, le=1)  # at or above: not forwarded to n8n
+    spam_batch_max_size: int = Field(64, ge=1, le=4096)  # concurrent texts per scoring pass
+    spam_batch_linger_ms: float = Field(0.0, ge=0, le=100)  # 0 = next event-loop iteration
+
+    # Idempotency (repeats of a submission get the original response, per worker)
+    idempotency_ttl_seconds: float = Field(600.0, ge=0)  # 0 disables duplicate suppression
+    idempotency_max_entries: int = Field(10000, ge=1)
+
+    # Request Deadlines (end-to-end budget enforced at the ASGI edge)
+    request_timeout_seconds: float = Field(20.0, gt=0, le=300)
+    route_timeouts: Dict[str, float] = {"/api/contact": 15.0}  # JSON object in env
+
+    # Admission Control (adaptive per-route concurrency limits, excess load gets 503)
+    admission_enabled: bool = True  # False = adapt and report limits, never shed
+    admission_routes: List[str] = ["/api/contact"]  # own limit each, other paths share one
+    admission_initial_limit: int = Field(32, ge=1)
+    admission_min_limit: int = Field(4, ge=1)
+    admission_max_limit: int = Field(256, ge=1)
+    admission_backoff_ratio: float = Field(0.9, gt=0, lt=1)  # limit factor on congestion
+    admission_latency_target_seconds: float = Field(5.0, gt=0)  # slower requests = congestion
+    admission_max_loop_lag_ms: float = Field(50.0, gt=0)  # event-loop lag = congestion
 
     # Logging
     log_level: str = Field("INFO", validation_alias="LOG_LEVEL")
@@ -51,7 +172,7 @@ class Settings(BaseSettings):
     # CORS
     cors_allow_credentials: bool = False
     cors_allow_methods: List[str] = ["GET", "POST", "OPTIONS"]
-    cors_allow_headers: List[str] = ["Content-Type", "Authorization"]
+    cors_allow_headers: List[str] = ["Content-Type", "Authorization", "Idempotency-Key"]
     cors_max_age: int = 600  # 10 minutes
 
     @property
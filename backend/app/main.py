@@ -4,33 +4,46 @@ Initializes the app, middleware, and routes.
 """
 
 import logging
+import math
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from app.config import settings
 from app.routes import contact, health, webhook_health
 from app.utils.logger import setup_logging
-from app.utils.exceptions import WebhookError
+from app.utils.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    ValidationBusyError,
+    WebhookBusyError,
+    WebhookError,
+)
+from app.middleware.admission import AdmissionMiddleware, mark_overloaded
+from app.middleware.deadline import DEADLINE_EXCEEDED_BODY, DeadlineMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.services.admission import start_admission_controller, stop_admission_controller
+from app.services.webhook import close_webhook_client
+from app.services.dispatcher import get_webhook_dispatcher, close_webhook_dispatcher
+from app.services.delivery_queue import start_delivery_queue, stop_delivery_queue
+from app.services.dead_letter import close_dead_letter_store
+from app.services.health_probe import start_health_prober, stop_health_prober
+from app.services.latency import get_latency_recorder
+from app.services.domain_blocklist import start_domain_blocklist, stop_domain_blocklist
+from app.services.rate_limiter import close_rate_limiter, get_rate_limiter
+from app.services.spam_scorer import get_spam_scorer
+from app.services.validation_executor import (
+    start_validation_executor,
+    stop_validation_executor,
+)
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
 
-# Rate limiter instance
-limiter = Limiter(
-    key_func=get_remote_address,
-    storage_uri=settings.rate_limit_storage_url,
-    default_limits=[f"{settings.rate_limit_per_hour}/hour"],
-)
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
@@ -44,10 +57,48 @@ async def lifespan(app: FastAPI):
         },
     )
 
+    # Pooled n8n clients (one per destination) shared by all requests of this worker
+    app.state.webhook_dispatcher = get_webhook_dispatcher()
+
+    # Durable spool + background workers for 202 Accepted mode
+    if settings.contact_delivery_mode == "queued":
+        await start_delivery_queue(app.state.webhook_dispatcher)
+
+    # Thread/process pool for sanitization (pre-warmed in process mode)
+    await start_validation_executor()
+
+    # Fixed-size client table for rate limiting (per worker, or mapped from a shared file)
+    get_rate_limiter()
+
+    # Spam model weights, loaded once per worker (no-op unless SPAM_MODEL_PATH is set)
+    get_spam_scorer()
+
+    # Disposable email blocklist, reloaded when the file changes or on SIGHUP
+    await start_domain_blocklist()
+
+    # Background n8n health probes served by /api/webhook/health
+    await start_health_prober()
+
+    # Periodic structured logs of webhook latency percentiles
+    await get_latency_recorder().start()
+
+    # Event-loop lag sampling for the adaptive concurrency limits
+    await start_admission_controller()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Portfolio Contact API")
+    await stop_admission_controller()
+    await stop_health_prober()
+    await stop_domain_blocklist()
+    await stop_validation_executor()
+    await get_latency_recorder().stop()
+    await stop_delivery_queue()
+    await close_webhook_dispatcher()
+    await close_webhook_client()
+    close_dead_letter_store()
+    close_rate_limiter()
 
 
 # Initialize FastAPI app
@@ -61,9 +112,24 @@ app = FastAPI(
 )
 
 
-# Add rate limiter state to app
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore
+# Deadline Middleware (per-request time budget, inside CORS so 504s keep CORS headers)
+app.add_middleware(
+    DeadlineMiddleware,
+    default_timeout=settings.request_timeout_seconds,
+    route_timeouts=settings.route_timeouts,
+)
+
+
+# Rate limit + body size cap before routing and body parsing (inside CORS for the same reason)
+app.add_middleware(
+    RateLimitMiddleware,
+    limited_paths=["/api/contact"],
+    max_body_bytes=settings.max_request_body_bytes,
+)
+
+
+# Load shedding ahead of everything else, except liveness checks (inside CORS as well)
+app.add_middleware(AdmissionMiddleware, exempt_paths=["/health", "/api/webhook/health"])
 
 
 # CORS Middleware
@@ -109,6 +175,12 @@ async def webhook_exception_handler(request: Request, exc: WebhookError):
     """Handle webhook-specific errors."""
     logger.error("Webhook error", extra={"error": str(exc), "path": request.url.path})
 
+    headers = {}
+    if isinstance(exc, CircuitOpenError):
+        headers["Retry-After"] = str(max(1, math.ceil(exc.retry_after)))
+    elif isinstance(exc, WebhookBusyError):
+        headers["Retry-After"] = "1"
+
     return JSONResponse(
         status_code=503,
         content={
@@ -116,6 +188,35 @@ async def webhook_exception_handler(request: Request, exc: WebhookError):
             "message": "Unable to process your request. Please try again later.",
             "error_code": "WEBHOOK_ERROR",
         },
+        headers=headers,
+    )
+
+
+@app.exception_handler(DeadlineExceededError)
+async def deadline_exception_handler(request: Request, exc: DeadlineExceededError):
+    """Handle requests that ran out of their time budget."""
+    logger.warning("Deadline exceeded", extra={"error": str(exc), "path": request.url.path})
+    mark_overloaded(request.scope)
+
+    return Response(content=DEADLINE_EXCEEDED_BODY, status_code=504, media_type="application/json")
+
+
+@app.exception_handler(ValidationBusyError)
+async def validation_busy_exception_handler(request: Request, exc: ValidationBusyError):
+    """Shed load when the validation queue is saturated."""
+    logger.warning(
+        "Validation queue saturated", extra={"error": str(exc), "path": request.url.path}
+    )
+    mark_overloaded(request.scope)
+
+    return JSONResponse(
+        status_code=503,
+        content={
+            "success": False,
+            "message": "The server is busy. Please try again in a moment.",
+            "error_code": "VALIDATION_BUSY",
+        },
+        headers={"Retry-After": "1"},
     )
 
 
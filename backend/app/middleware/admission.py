@@ -0,0 +1,89 @@
+"""
+Load shedding at the ASGI edge.
+Rejects requests over the adaptive concurrency limit with an immediate 503.
+
+A 503 is not in itself a congestion signal: a fast WEBHOOK_ERROR while
+n8n is down leaves the worker idle. Code answering because this worker
+is overloaded (validation queue full, deadline hit) flags the request
+with mark_overloaded() instead.
+"""
+
+import json
+import logging
+from typing import Iterable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.admission import get_admission_controller
+
+logger = logging.getLogger(__name__)
+
+# Scope key set by mark_overloaded()
+OVERLOADED_SCOPE_KEY = "app.overloaded"
+
+OVERLOADED_BODY = json.dumps(
+    {
+        "success": False,
+        "message": "The server is busy. Please try again in a moment.",
+        "error_code": "OVERLOADED",
+    }
+).encode("utf-8")
+
+
+def mark_overloaded(scope: Scope) -> None:
+    """Report that the request was answered because this worker is overloaded."""
+    scope[OVERLOADED_SCOPE_KEY] = True
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying the admission controller's per-route limits."""
+
+    def __init__(self, app: ASGIApp, exempt_paths: Iterable[str] = ("/health",)):
+        """
+        Initialize admission middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            exempt_paths: Paths (and their subpaths) never shed or counted,
+                so liveness checks keep answering under overload
+        """
+        self.app = app
+        self.exempt_paths = tuple(exempt_paths)
+        self._exempt_prefixes = tuple(f"{path.rstrip('/')}/" for path in self.exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or path in self.exempt_paths
+            or path.startswith(self._exempt_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        controller = get_admission_controller()
+        route = controller.route(path)
+        admitted_at = controller.try_acquire(route)
+        if admitted_at is None:
+            # Debug only: logging every shed request would add to the overload
+            logger.debug("Request shed", extra={"path": path, "limit": int(route.limit)})
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(OVERLOADED_BODY)).encode()),
+                        (b"retry-after", b"1"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": OVERLOADED_BODY})
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(
+                route, admitted_at, overloaded=scope.get(OVERLOADED_SCOPE_KEY, False)
+            )
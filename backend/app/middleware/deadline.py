@@ -0,0 +1,89 @@
+"""
+End-to-end request deadlines enforced at the ASGI edge.
+Bounds worst-case latency so it can be used in an SLO.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.admission import mark_overloaded
+from app.utils.deadline import reset_deadline, set_deadline
+
+logger = logging.getLogger(__name__)
+
+
+DEADLINE_EXCEEDED_BODY = json.dumps(
+    {
+        "success": False,
+        "message": "The request took too long to process. Please try again later.",
+        "error_code": "DEADLINE_EXCEEDED",
+    }
+).encode("utf-8")
+
+
+class DeadlineMiddleware:
+    """Pure ASGI middleware giving every HTTP request a time budget."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_timeout: float = 20.0,
+        route_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize deadline middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            default_timeout: Budget in seconds for routes without an override
+            route_timeouts: Per-path budgets in seconds (exact path match)
+        """
+        self.app = app
+        self.default_timeout = default_timeout
+        self.route_timeouts = route_timeouts or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = self.route_timeouts.get(scope["path"], self.default_timeout)
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = set_deadline(budget)
+        timeout = asyncio.timeout(budget)
+        try:
+            async with timeout:
+                await self.app(scope, receive, send_wrapper)
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            logger.warning(
+                "Request deadline exceeded",
+                extra={"path": scope["path"], "budget_seconds": budget},
+            )
+            mark_overloaded(scope)
+            if not response_started:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 504,
+                        "headers": [
+                            (b"content-type", b"application/json"),
+                            (b"content-length", str(len(DEADLINE_EXCEEDED_BODY)).encode()),
+                        ],
+                    }
+                )
+                await send({"type": "http.response.body", "body": DEADLINE_EXCEEDED_BODY})
+        finally:
+            reset_deadline(token)
@@ -3,10 +3,16 @@ Rate limiting configuration and utilities.
 Prevents abuse and DoS attacks.
 """
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from fastapi import Request
+import json
 import logging
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.services.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -16,38 +22,169 @@ def get_request_identifier(request: Request) -> str:
     Get unique identifier for rate limiting.
     Uses IP address with X-Forwarded-For support for proxies.
 
+    Only the last RATE_LIMIT_PROXY_HOPS entries of X-Forwarded-For were
+    added by our own proxies; anything before them is client-controlled,
+    so the entry the outermost trusted proxy appended is used.
+
     Args:
         request: FastAPI request object
 
     Returns:
         Unique identifier string
     """
-    # Check for forwarded IP (from reverse proxy)
-    forwarded = request.headers.get("X-Forwarded-For")
+    hops = settings.rate_limit_proxy_hops
+    forwarded = request.headers.get("X-Forwarded-For") if hops else None
     if forwarded:
-        # Get first IP in chain (original client)
-        ip = forwarded.split(",")[0].strip()
+        # Client address as seen by the outermost trusted proxy
+        chain = [ip.strip() for ip in forwarded.split(",")]
+        ip = chain[-min(hops, len(chain))]
     else:
         # Get direct connection IP
-        ip = get_remote_address(request)
+        ip = request.client.host if request.client else "127.0.0.1"
 
     logger.debug(f"Rate limit identifier: {ip}")
     return ip
 
 
-def create_limiter(storage_uri: str = "memory://") -> Limiter:
-    """
-    Create rate limiter instance.
+def _error_body(message: str, error_code: str) -> bytes:
+    return json.dumps({"success": False, "message": message, "error_code": error_code}).encode(
+        "utf-8"
+    )
 
-    Args:
-        storage_uri: Storage backend URI (memory:// or redis://)
 
-    Returns:
-        Configured Limiter instance
+RATE_LIMIT_EXCEEDED_BODY = _error_body(
+    "Too many requests. Please try again later.", "RATE_LIMIT_EXCEEDED"
+)
+PAYLOAD_TOO_LARGE_BODY = _error_body("The request body is too large.", "PAYLOAD_TOO_LARGE")
+
+
+class _BodyTooLarge(Exception):
+    """Raised into the application when a streamed body passes the byte cap."""
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware rejecting over-limit and oversized requests before routing.
+
+    Rejections are answered with precomputed bodies without reading the
+    request body, so a client over its quota costs one table lookup
+    instead of JSON parsing, model validation and dependency resolution.
     """
-    return Limiter(
-        key_func=get_request_identifier,
-        storage_uri=storage_uri,
-        headers_enabled=True,  # Send X-RateLimit-* headers
-        strategy="fixed-window",  # Fixed time window strategy
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limited_paths: Iterable[str] = ("/api/contact",),
+        max_body_bytes: int = 16384,
+    ):
+        """
+        Initialize rate limit middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            limited_paths: Paths whose POST requests count against the client's quota
+            max_body_bytes: Larger request bodies are rejected with 413
+        """
+        self.app = app
+        self.limited_paths = frozenset(limited_paths)
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        length = _content_length(scope)
+        if length is not None and length > self.max_body_bytes:
+            logger.warning(
+                "Request body too large", extra={"path": scope["path"], "content_length": length}
+            )
+            await _respond(send, 413, PAYLOAD_TOO_LARGE_BODY)
+            return
+
+        rate_headers: List[Tuple[bytes, bytes]] = []
+        if scope["method"] == "POST" and scope["path"] in self.limited_paths:
+            decision = get_rate_limiter().hit(get_request_identifier(Request(scope)))
+            limit = str(decision.limit).encode()
+            if not decision.allowed:
+                # Debug only: logging every rejection would make a flood expensive again
+                logger.debug("Rate limit exceeded", extra={"path": scope["path"]})
+                retry_after = str(max(1, math.ceil(decision.retry_after))).encode()
+                await _respond(
+                    send,
+                    429,
+                    RATE_LIMIT_EXCEEDED_BODY,
+                    [
+                        (b"retry-after", retry_after),
+                        (b"x-ratelimit-limit", limit),
+                        (b"x-ratelimit-remaining", b"0"),
+                    ],
+                )
+                return
+            rate_headers = [
+                (b"x-ratelimit-limit", limit),
+                (b"x-ratelimit-remaining", str(decision.remaining).encode()),
+                (b"x-ratelimit-reset", str(math.ceil(decision.reset_after)).encode()),
+            ]
+
+        received = 0
+        rejected = False
+        response_started = False
+
+        async def receive_capped() -> Message:
+            # Only needed without Content-Length: the server enforces a declared length
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    logger.warning("Streamed request body too large", extra={"path": scope["path"]})
+                    if not response_started:
+                        await _respond(send, 413, PAYLOAD_TOO_LARGE_BODY)
+                    rejected = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if rejected:
+                return  # the application's reaction to _BodyTooLarge; 413 was already sent
+            if message["type"] == "http.response.start":
+                response_started = True
+                if rate_headers:
+                    message = {**message, "headers": [*message.get("headers", ()), *rate_headers]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive if length is not None else receive_capped, send_wrapper)
+        except _BodyTooLarge:
+            pass  # the 413 was already sent
+
+
+def _content_length(scope: Scope) -> Optional[int]:
+    """Declared Content-Length of a request, if any."""
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+async def _respond(
+    send: Send, status: int, body: bytes, headers: Sequence[Tuple[bytes, bytes]] = ()
+) -> None:
+    """Send a complete JSON response."""
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        }
     )
+    await send({"type": "http.response.body", "body": body})
@@ -7,6 +7,9 @@ from typing import Optional
 from pydantic import BaseModel, EmailStr, Field, field_validator
 import re
 
+# Unicode letters, spaces, hyphens and apostrophes: \w without digits (one pass)
+NAME_PATTERN = re.compile(r"(?:[^\W\d]|[\s\-'])+")
+
 
 class ContactRequest(BaseModel):
     """Contact form submission request model."""
@@ -44,8 +47,8 @@ class ContactRequest(BaseModel):
     def validate_name(cls, v: str) -> str:
         """Validate name: letters (Unicode), spaces, hyphens, apostrophes only."""
         # Allow Unicode letters, spaces, hyphens, and apostrophes
-        # \w includes Unicode letters and digits, so we exclude digits explicitly
-        if not re.match(r"^[\w\s\-']+$", v, re.UNICODE) or re.search(r"\d", v):
+        # \w includes Unicode letters and digits, so NAME_PATTERN excludes digits explicitly
+        if NAME_PATTERN.fullmatch(v) is None:
             raise ValueError("Name must contain only letters, spaces, hyphens, and apostrophes")
         return v.strip()
 
@@ -53,10 +56,8 @@ class ContactRequest(BaseModel):
     @classmethod
     def sanitize_text(cls, v: str) -> str:
         """Trim whitespace and remove excessive newlines."""
-        # Replace multiple whitespaces with single space
-        v = re.sub(r"\s+", " ", v)
-        # Trim
-        return v.strip()
+        # Collapse whitespace runs to single spaces and trim (same set as regex \s)
+        return " ".join(v.split())
 
     class Config:
         """Pydantic model configuration."""
@@ -4,34 +4,49 @@ Contact form endpoint with full security.
 
 import logging
 import uuid
-from fastapi import APIRouter, Request, HTTPException, Depends
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from typing import Any, Dict, Optional, Tuple
+from fastapi import APIRouter, Request, Response, HTTPException, Depends
 
+from app.middleware.rate_limit import get_request_identifier
 from app.models import ContactRequest, ContactResponse, ErrorResponse
 from app.services.validation import InputValidator
-from app.services.webhook import WebhookClient
+from app.services.validation_executor import ValidationExecutor, get_validation_executor
+from app.services.near_duplicate import NearDuplicateIndex, get_near_duplicate_index
+from app.services.spam_scorer import SpamScorer, get_spam_scorer
+from app.services.dispatcher import WebhookDispatcher, get_webhook_dispatcher
+from app.services.delivery_queue import DeliveryQueue, get_delivery_queue
+from app.services.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    IdempotencyCache,
+    get_idempotency_cache,
+    idempotency_key,
+)
 from app.config import settings
-from app.utils.exceptions import WebhookError
+from app.utils import deadline
+from app.utils.client import reset_client, set_client
+from app.utils.exceptions import (
+    DeadlineExceededError,
+    IdempotencyConflictError,
+    ValidationBusyError,
+    WebhookError,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-# Get limiter from app state
-def get_limiter(request: Request) -> Limiter:
-    """Dependency to get limiter from app state."""
-    return request.app.state.limiter
-
-
 @router.post(
     "/contact",
     response_model=ContactResponse,
     responses={
         200: {"description": "Contact form submitted successfully"},
+        202: {"description": "Contact form accepted for background delivery (queued mode)"},
+        400: {"model": ErrorResponse, "description": "Rejected content or email domain"},
+        413: {"model": ErrorResponse, "description": "Request body too large"},
         422: {"model": ErrorResponse, "description": "Validation error"},
         429: {"description": "Rate limit exceeded"},
-        503: {"model": ErrorResponse, "description": "Webhook service unavailable"},
+        503: {"model": ErrorResponse, "description": "Webhook or validation busy/unavailable"},
+        504: {"model": ErrorResponse, "description": "Request deadline exceeded"},
     },
     summary="Submit Contact Form",
     description=f"""
@@ -43,25 +58,41 @@ def get_limiter(request: Request) -> Limiter:
     - XSS prevention (HTML sanitization)
     - SQL injection protection (pattern matching)
     - CORS protection (allowed origins only)
+    - Duplicate suppression (optional `Idempotency-Key` header, else a content hash)
 
     ## Process Flow
-    1. Validate request data (Pydantic)
-    2. Sanitize inputs (remove HTML, dangerous content)
-    3. Check rate limit
-    4. Forward to n8n webhook
-    5. Return success response
+    1. Check rate limit (429 with `Retry-After` once the hourly quota is used)
+    2. Validate request data (Pydantic)
+    3. Sanitize inputs (remove HTML, dangerous content)
+    4. Replay the original response for duplicates (`Idempotent-Replayed: true`)
+    5. Forward to n8n webhook (or spool it for background delivery in queued mode)
+    6. Return success response (202 Accepted in queued mode)
     """,
 )
 async def submit_contact_form(
-    request: Request, contact: ContactRequest, limiter: Limiter = Depends(get_limiter)
+    request: Request,
+    response: Response,
+    contact: ContactRequest,
+    dispatcher: WebhookDispatcher = Depends(get_webhook_dispatcher),
+    delivery_queue: Optional[DeliveryQueue] = Depends(get_delivery_queue),
+    idempotency: Optional[IdempotencyCache] = Depends(get_idempotency_cache),
+    validator: ValidationExecutor = Depends(get_validation_executor),
+    near_duplicates: Optional[NearDuplicateIndex] = Depends(get_near_duplicate_index),
+    spam_scorer: Optional[SpamScorer] = Depends(get_spam_scorer),
 ) -> ContactResponse:
     """
     Handle contact form submission.
 
     Args:
         request: FastAPI request object
+        response: Outgoing response (status is set to 202 in queued mode)
         contact: Validated contact form data
-        limiter: Rate limiter instance
+        dispatcher: Fans submissions out to the configured webhook destinations
+        delivery_queue: Durable delivery queue (None unless queued mode is enabled)
+        idempotency: Duplicate-submission cache (None if disabled)
+        validator: Runs sanitization inline or on a bounded pool
+        near_duplicates: Index of recent messages (None if detection is off)
+        spam_scorer: Spam model (None if no model is configured)
 
     Returns:
         ContactResponse with success status
@@ -71,50 +102,75 @@ async def submit_contact_form(
     """
     # Generate unique request ID for tracking
     request_id = f"req_{uuid.uuid4().hex[:12]}"
+    client = get_request_identifier(request)
 
     logger.info(
         "Contact form submission received",
         extra={
             "request_id": request_id,
-            "ip": get_remote_address(request),
+            "ip": client,
             "sender_name": contact.name,
             "message_subject": contact.subject,
         },
     )
 
+    # Fair share of the outbound n8n queue
+    client_token = set_client(client)
     try:
-        # Additional sanitization (defense in depth)
-        sanitized_data = InputValidator.sanitize_contact_form(contact.model_dump())
-
-        # Validate email domain (block disposable emails)
-        if not InputValidator.validate_email_domain(contact.email):
-            logger.warning(
-                "Disposable email rejected",
-                extra={"request_id": request_id, "email": contact.email},
+        if idempotency is None:
+            status_code, result = await _process_submission(
+                contact,
+                request_id,
+                dispatcher,
+                delivery_queue,
+                validator,
+                near_duplicates,
+                spam_scorer,
+            )
+        else:
+            key, fingerprint = idempotency_key(contact, request.headers.get(IDEMPOTENCY_KEY_HEADER))
+            (status_code, result), replayed = await idempotency.run(
+                key,
+                fingerprint,
+                lambda: _process_submission(
+                    contact,
+                    request_id,
+                    dispatcher,
+                    delivery_queue,
+                    validator,
+                    near_duplicates,
+                    spam_scorer,
+                ),
             )
-            raise HTTPException(status_code=400, detail="Please use a permanent email address")
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+                logger.info(
+                    "Duplicate contact form submission suppressed",
+                    extra={"request_id": request_id, "original_request_id": result.request_id},
+                )
 
-        # Forward to n8n webhook
-        webhook_client = WebhookClient(settings.n8n_webhook_url)
-        webhook_response = await webhook_client.send_contact_form(
-            data=sanitized_data, request_id=request_id
-        )
+        response.status_code = status_code
+        return result
 
-        logger.info(
-            "Contact form forwarded to n8n successfully",
-            extra={"request_id": request_id, "webhook_response": webhook_response},
-        )
+    except HTTPException:
+        raise
 
-        return ContactResponse(
-            success=True,
-            message="Thank you for your message! I'll get back to you soon.",
-            request_id=request_id,
-        )
+    except IdempotencyConflictError as e:
+        logger.warning("Idempotency key conflict", extra={"request_id": request_id})
+        raise HTTPException(status_code=422, detail=str(e))
 
     except WebhookError as e:
         logger.error("Webhook error", extra={"request_id": request_id, "error": str(e)})
         raise
 
+    except DeadlineExceededError:
+        logger.warning("Request deadline exceeded", extra={"request_id": request_id})
+        raise
+
+    except ValidationBusyError:
+        logger.warning("Validation queue saturated", extra={"request_id": request_id})
+        raise
+
     except ValueError as e:
         logger.warning("Validation error", extra={"request_id": request_id, "error": str(e)})
         raise HTTPException(status_code=400, detail=str(e))
@@ -127,7 +183,130 @@ async def submit_contact_form(
             status_code=500, detail="An unexpected error occurred. Please try again later."
         )
 
+    finally:
+        reset_client(client_token)
 
-# Apply rate limiting to the endpoint
-limiter = Limiter(key_func=get_remote_address)
-submit_contact_form = limiter.limit(f"{settings.rate_limit_per_hour}/hour")(submit_contact_form)
+
+async def _process_submission(
+    contact: ContactRequest,
+    request_id: str,
+    dispatcher: WebhookDispatcher,
+    delivery_queue: Optional[DeliveryQueue],
+    validator: ValidationExecutor,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    spam_scorer: Optional[SpamScorer] = None,
+) -> Tuple[int, ContactResponse]:
+    """
+    Sanitize a submission and deliver (or enqueue) it.
+
+    Args:
+        contact: Validated contact form data
+        request_id: Unique request identifier
+        dispatcher: Fans submissions out to the configured webhook destinations
+        delivery_queue: Durable delivery queue (None unless queued mode is enabled)
+        validator: Runs sanitization inline or on a bounded pool
+        near_duplicates: Index of recent messages (None if detection is off)
+        spam_scorer: Spam model (None if no model is configured)
+
+    Returns:
+        (status_code, ContactResponse) tuple
+
+    Raises:
+        DeadlineExceededError: If the deadline is used up by validation or before delivery
+    """
+    # Additional sanitization (defense in depth), off the event loop for large inputs
+    sanitized_data = await validator.run(
+        InputValidator.sanitize_model,
+        contact,
+        size=len(contact.name) + len(contact.email) + len(contact.subject) + len(contact.message),
+    )
+    deadline.check_deadline()
+
+    # Validate email domain (block disposable emails)
+    if not InputValidator.validate_email_domain(contact.email):
+        logger.warning(
+            "Disposable email rejected",
+            extra={"request_id": request_id, "email": contact.email},
+        )
+        raise HTTPException(status_code=400, detail="Please use a permanent email address")
+
+    text = f"{sanitized_data['subject']}\n{sanitized_data['message']}"
+    metadata: Dict[str, Any] = {}
+
+    # Same message with small edits as a recent submission (spam campaigns)
+    fingerprint: Optional[bytes] = None
+    if near_duplicates is not None:
+        fingerprint, match = near_duplicates.check(text)
+        if match is not None:
+            logger.warning(
+                "Near-duplicate submission detected",
+                extra={
+                    "request_id": request_id,
+                    "duplicate_of": match.request_id,
+                    "similarity": match.similarity,
+                    "action": settings.near_duplicate_action,
+                },
+            )
+            if settings.near_duplicate_action == "reject":
+                raise HTTPException(
+                    status_code=400, detail="This message is too similar to a recent submission"
+                )
+            metadata["near_duplicate"] = {"of": match.request_id, "similarity": match.similarity}
+
+    result = ContactResponse(
+        success=True,
+        message="Thank you for your message! I'll get back to you soon.",
+        request_id=request_id,
+    )
+
+    # Obvious spam is answered like any submission but never reaches n8n
+    if spam_scorer is not None:
+        metadata["spam_score"] = round(await spam_scorer.score(text), 4)
+        if metadata["spam_score"] >= settings.spam_threshold:
+            logger.warning(
+                "Spam submission dropped",
+                extra={"request_id": request_id, "spam_score": metadata["spam_score"]},
+            )
+            _remember(near_duplicates, fingerprint, request_id)
+            return 200, result
+
+    if metadata:
+        sanitized_data["metadata"] = metadata
+
+    # Nothing is stored or sent for a request already answered with a 504
+    deadline.check_deadline()
+
+    # Queued mode: persist and let background workers forward it
+    if delivery_queue is not None:
+        await delivery_queue.enqueue(data=sanitized_data, request_id=request_id)
+
+        logger.info("Contact form queued for delivery", extra={"request_id": request_id})
+        _remember(near_duplicates, fingerprint, request_id)
+        return 202, result
+
+    # Forward to n8n webhook. A failure goes back to the client as a 503 and is
+    # retried by them, so it is not dead-lettered (a replay would deliver it twice);
+    # destinations failing after quorum was reached still are
+    webhook_response: Dict[str, Any] = await dispatcher.send_contact_form(
+        data=sanitized_data, request_id=request_id, dead_letter=False
+    )
+
+    logger.info(
+        "Contact form forwarded to n8n successfully",
+        extra={"request_id": request_id, "webhook_response": webhook_response},
+    )
+    _remember(near_duplicates, fingerprint, request_id)
+    return 200, result
+
+
+def _remember(
+    near_duplicates: Optional[NearDuplicateIndex], fingerprint: Optional[bytes], request_id: str
+) -> None:
+    """
+    Index an accepted submission for later near-duplicate checks.
+
+    Only accepted submissions are indexed, so a client retrying after a 503
+    does not match its own earlier attempt.
+    """
+    if near_duplicates is not None and fingerprint is not None:
+        near_duplicates.add(fingerprint, request_id)
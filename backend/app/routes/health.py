@@ -3,9 +3,13 @@ Health check endpoint for monitoring and load balancers.
 """
 
 import logging
-from fastapi import APIRouter
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
 from app.models import HealthResponse
 from app.config import settings
+from app.services.admission import get_admission_controller
+from app.services.rate_limiter import get_rate_limiter
+from app.services.validation_executor import ValidationExecutor, get_validation_executor
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -31,3 +35,96 @@ async def health_check() -> HealthResponse:
         environment=settings.environment,
         n8n_configured=bool(settings.n8n_webhook_url),
     )
+
+
+@router.get(
+    "/health/validation",
+    response_model=Dict[str, Any],
+    summary="Validation Executor Stats",
+    description="Load and timing percentiles of the input validation executor",
+)
+async def validation_stats(
+    executor: ValidationExecutor = Depends(get_validation_executor),
+) -> Dict[str, Any]:
+    """
+    Validation executor statistics.
+
+    Returns:
+        Dict with strategy, pending/rejected counts and per-strategy timings
+
+    Example Response:
+        {
+            "strategy": "thread",
+            "workers": 2,
+            "max_pending": 64,
+            "offload_min_chars": 512,
+            "pending": 3,
+            "rejected": 0,
+            "window_seconds": 300.0,
+            "timings": {
+                "inline": {"count": 912, "p50_ms": 0.031, "p90_ms": 0.062, "p99_ms": 0.5,
+                           "max_ms": 1.2, "failed": 0},
+                "thread": {"count": 57, "p50_ms": 0.9, "p90_ms": 2.1, "p99_ms": 7.8,
+                           "max_ms": 9.4, "failed": 0}
+            }
+        }
+    """
+    return executor.snapshot()
+
+
+@router.get(
+    "/health/rate-limit",
+    response_model=Dict[str, Any],
+    summary="Rate Limiter Stats",
+    description="Table usage, memory and decision counts of the contact form rate limiter",
+)
+async def rate_limit_stats() -> Dict[str, Any]:
+    """
+    Rate limiter statistics.
+
+    Returns:
+        Dict with limit, slot table usage and allowed/rejected counts
+
+    Example Response:
+        {
+            "limit": 5,
+            "period_seconds": 3600.0,
+            "capacity": 65536,
+            "occupied": 1240,
+            "evictions": 0,
+            "memory_bytes": 1048576,
+            "allowed": 1873,
+            "rejected": 52
+        }
+    """
+    return get_rate_limiter().snapshot()
+
+
+@router.get(
+    "/health/admission",
+    response_model=Dict[str, Any],
+    summary="Admission Control Stats",
+    description="Adaptive concurrency limits, in-flight requests and shed counts per route",
+)
+async def admission_stats() -> Dict[str, Any]:
+    """
+    Admission controller statistics.
+
+    Returns:
+        Dict with event-loop lag and each route's current limit and counts
+
+    Example Response:
+        {
+            "enabled": true,
+            "loop_lag_ms": 0.41,
+            "max_loop_lag_ms": 50.0,
+            "lag_events": 3,
+            "latency_target_seconds": 5.0,
+            "routes": {
+                "/api/contact": {"limit": 27, "in_flight": 4, "admitted": 5120,
+                                 "shed": 88, "decreases": 2},
+                "*": {"limit": 32, "in_flight": 0, "admitted": 310, "shed": 0, "decreases": 0}
+            }
+        }
+    """
+    return get_admission_controller().snapshot()
@@ -3,28 +3,29 @@ Webhook health check endpoint for monitoring n8n connectivity.
 """
 
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import Dict, Any
-import httpx
-from datetime import datetime, timezone
 
 from app.config import settings
-from app.utils.security import generate_webhook_signature, generate_request_id
+from app.services.dispatcher import get_webhook_dispatcher
+from app.services.health_probe import WebhookHealthProber, get_health_prober
+from app.services.latency import get_latency_recorder
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
 @router.get("/webhook/health", response_model=Dict[str, Any])
-async def check_webhook_health():
+async def check_webhook_health(prober: WebhookHealthProber = Depends(get_health_prober)):
     """
     Check n8n webhook connectivity and health.
 
-    This endpoint sends a test ping to the configured n8n webhook
-    to verify it's accessible and responding correctly.
+    Serves the latest result of the background prober, which pings the
+    configured n8n webhook on a fixed interval. A live probe is only sent
+    when those results are missing or stale, and concurrent callers share it.
 
     Returns:
-        Dict with health status, response time, and details
+        Dict with health status, response time, rolling probe statistics and details
 
     Example Response:
         {
@@ -33,91 +34,31 @@ async def check_webhook_health():
             "response_time_ms": 234,
             "status_code": 200,
             "timestamp": "2026-02-06T12:00:00Z",
+            "probe": {
+                "ewma_latency_ms": 210.5,
+                "success_ratio": 1.0,
+                "samples": 20,
+                "window": 20,
+                "interval_seconds": 30.0,
+                "last_error": null,
+                "age_seconds": 12.4
+            },
             "details": {
                 "signature_enabled": true,
-                "retry_attempts": 3
+                "timeout_seconds": 10,
+                "environment": "production"
             }
         }
     """
-    start_time = datetime.now(timezone.utc)
-
-    # Create test payload
-    test_payload = {
-        "request_id": generate_request_id(),
-        "timestamp": start_time.isoformat(),
-        "test": True,
-        "message": "Health check ping from portfolio backend",
-    }
-
-    # Add signature if configured
-    headers = {"Content-Type": "application/json"}
-    if settings.n8n_webhook_secret:
-        signature = generate_webhook_signature(test_payload, settings.n8n_webhook_secret)
-        headers["X-Webhook-Signature"] = signature
-
     try:
-        async with httpx.AsyncClient(timeout=settings.n8n_timeout) as client:
-            response = await client.post(
-                str(settings.n8n_webhook_url), json=test_payload, headers=headers
-            )
-
-            end_time = datetime.now(timezone.utc)
-            response_time_ms = int((end_time - start_time).total_seconds() * 1000)
-
-            # Check if response is successful
-            is_healthy = 200 <= response.status_code < 300
-
-            return {
-                "healthy": is_healthy,
-                "webhook_url": str(settings.n8n_webhook_url).replace(
-                    settings.n8n_webhook_url.path or "", "/webhook/***"  # Mask path for security
-                ),
-                "response_time_ms": response_time_ms,
-                "status_code": response.status_code,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "details": {
-                    "signature_enabled": bool(settings.n8n_webhook_secret),
-                    "timeout_seconds": settings.n8n_timeout,
-                    "environment": settings.environment,
-                },
-            }
-
-    except httpx.TimeoutException as e:
-        logger.error(f"Webhook health check timeout: {e}")
-        return {
-            "healthy": False,
-            "webhook_url": "***",
-            "response_time_ms": settings.n8n_timeout * 1000,
-            "status_code": 0,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "error": "Timeout connecting to webhook",
-            "details": {
-                "signature_enabled": bool(settings.n8n_webhook_secret),
-                "timeout_seconds": settings.n8n_timeout,
-                "environment": settings.environment,
-            },
-        }
-
-    except httpx.RequestError as e:
-        logger.error(f"Webhook health check failed: {e}")
-        return {
-            "healthy": False,
-            "webhook_url": "***",
-            "response_time_ms": 0,
-            "status_code": 0,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "error": f"Connection failed: {str(e)}",
-            "details": {
-                "signature_enabled": bool(settings.n8n_webhook_secret),
-                "timeout_seconds": settings.n8n_timeout,
-                "environment": settings.environment,
-            },
-        }
-
+        if prober.is_stale():
+            await prober.refresh()
     except Exception as e:
         logger.exception("Unexpected error in webhook health check")
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
+    return prober.snapshot()
+
 
 @router.get("/webhook/config", response_model=Dict[str, Any])
 async def get_webhook_config():
@@ -134,9 +75,12 @@ async def get_webhook_config():
             "webhook_configured": true,
             "signature_enabled": true,
             "timeout_seconds": 10,
-            "environment": "production"
+            "environment": "production",
+            "circuit_breaker": {"state": "closed", "failure_rate": 0.0, ...},
+            "fanout": {"quorum": "any", "destinations": [...]}
         }
     """
+    dispatcher = get_webhook_dispatcher()
     return {
         "webhook_configured": bool(settings.n8n_webhook_url),
         "signature_enabled": bool(settings.n8n_webhook_secret),
@@ -144,4 +88,68 @@ async def get_webhook_config():
         "rate_limit_per_hour": settings.rate_limit_per_hour,
         "environment": settings.environment,
         "api_version": settings.api_version,
+        "circuit_breaker": dispatcher.clients[0].breaker.snapshot(),
+        "fanout": dispatcher.snapshot(),
     }
+
+
+@router.get("/webhook/latency", response_model=Dict[str, Any])
+async def get_webhook_latency():
+    """
+    Get outbound webhook latency percentiles over the rolling window.
+
+    Returns:
+        Dict with the window length and one entry per destination/outcome/attempt
+
+    Example Response:
+        {
+            "window_seconds": 300.0,
+            "series": [
+                {
+                    "destination": "primary",
+                    "outcome": "success",
+                    "attempt": 1,
+                    "count": 1284,
+                    "p50_ms": 212.0,
+                    "p90_ms": 401.5,
+                    "p99_ms": 934.0,
+                    "max_ms": 1210.7
+                }
+            ]
+        }
+    """
+    recorder = get_latency_recorder()
+    return {"window_seconds": recorder.window_seconds, "series": recorder.snapshot()}
+
+
+@router.get("/webhook/queue", response_model=Dict[str, Any])
+async def get_webhook_queue():
+    """
+    Get outbound concurrency and queue metrics per destination.
+
+    Returns:
+        Dict with one entry per destination: slots in use, queue depth,
+        counts and wait time percentiles over the rolling window
+
+    Example Response:
+        {
+            "destinations": [
+                {
+                    "name": "primary",
+                    "max_in_flight": 10,
+                    "max_wait_seconds": 5.0,
+                    "in_flight": 10,
+                    "queue_depth": 7,
+                    "max_queue_depth": 31,
+                    "queued_clients": 3,
+                    "granted": 5210,
+                    "queued": 412,
+                    "timeouts": 2,
+                    "wait": {"count": 5212, "p50_ms": 0.001, "p90_ms": 0.001,
+                             "p99_ms": 820.0, "max_ms": 5001.2}
+                }
+            ]
+        }
+    """
+    dispatcher = get_webhook_dispatcher()
+    return {"destinations": [client.gate.snapshot() for client in dispatcher.clients]}
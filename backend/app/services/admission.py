@@ -0,0 +1,263 @@
+"""
+Adaptive admission control: shed excess load before a worker is overwhelmed.
+
+Every controlled route has a concurrency limit, adjusted with AIMD
+(additive increase, multiplicative decrease) like a TCP congestion
+window. Each request that completes in time raises the limit by
+1/limit, so by about one per limit's worth of completions, up to a
+maximum. A congestion signal multiplies it by a backoff ratio:
+
+- event-loop lag above a threshold while the route has requests in
+  flight (the worker is CPU-bound: every coroutine on it runs late);
+- a request slower than the latency target (e.g. n8n is slow and
+  requests pile up awaiting it, which does not show as loop lag);
+- a request answered because the worker is overloaded (validation
+  queue full, deadline hit). Other 503s, such as a fast WEBHOOK_ERROR
+  while n8n is down, are not a signal: the worker is idle.
+
+The limit is cut at most once per window: signals about requests
+admitted before the previous cut were already acted upon. Requests over
+the limit are not queued but rejected at once with 503, which costs
+next to nothing, so admitted requests keep a bounded latency.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+OTHER_ROUTES = "*"  # shared limit of every path without its own
+
+
+class RouteLimit:
+    """Concurrency limit and counters of one route."""
+
+    __slots__ = ("path", "limit", "in_flight", "admitted", "shed", "decreases", "cut_at")
+
+    def __init__(self, path: str, limit: float):
+        self.path = path
+        self.limit = limit
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self.decreases = 0
+        self.cut_at = -float("inf")  # monotonic time of the last decrease
+
+
+class AdmissionController:
+    """AIMD concurrency limits per route, fed by request outcomes and event-loop lag."""
+
+    def __init__(
+        self,
+        routes: Iterable[str] = ("/api/contact",),
+        initial_limit: int = 32,
+        min_limit: int = 4,
+        max_limit: int = 256,
+        backoff_ratio: float = 0.9,
+        latency_target: float = 5.0,
+        max_loop_lag: float = 0.05,
+        lag_interval: float = 0.1,
+        enabled: bool = True,
+    ):
+        """
+        Initialize controller.
+
+        Args:
+            routes: Paths with a limit of their own (all others share one)
+            initial_limit: Concurrent requests per route allowed at startup
+            min_limit: The limit never drops below this
+            max_limit: The limit never grows above this
+            backoff_ratio: Factor applied to the limit on congestion
+            latency_target: Slower requests (seconds) signal congestion
+            max_loop_lag: Event-loop lag (seconds) that signals congestion
+            lag_interval: Seconds between event-loop lag samples
+            enabled: False = measure and adapt, but never shed
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_target = latency_target
+        self.max_loop_lag = max_loop_lag
+        self.lag_interval = lag_interval
+        self.enabled = enabled
+
+        start = float(max(min_limit, min(initial_limit, max_limit)))
+        self.routes: Dict[str, RouteLimit] = {
+            path: RouteLimit(path, start) for path in [*routes, OTHER_ROUTES]
+        }
+
+        self.loop_lag = 0.0  # latest sample, seconds
+        self.lag_events = 0  # samples above max_loop_lag
+        self._task: Optional[asyncio.Task] = None
+
+    def route(self, path: str) -> RouteLimit:
+        """Limit governing a request path."""
+        return self.routes.get(path) or self.routes[OTHER_ROUTES]
+
+    def try_acquire(self, route: RouteLimit) -> Optional[float]:
+        """
+        Admit a request if the route is under its limit.
+
+        Args:
+            route: Limit from route()
+
+        Returns:
+            Admission time (time.monotonic()) to pass to release(), or None
+            if the request must be shed
+        """
+        if self.enabled and route.in_flight >= int(route.limit):
+            route.shed += 1
+            return None
+        route.in_flight += 1
+        route.admitted += 1
+        return time.monotonic()
+
+    def release(self, route: RouteLimit, admitted_at: float, overloaded: bool = False) -> None:
+        """
+        Record a finished request and adapt the route's limit.
+
+        Args:
+            route: Limit the request was admitted under
+            admitted_at: Value returned by try_acquire()
+            overloaded: The request was answered because the worker is overloaded
+        """
+        route.in_flight -= 1
+        now = time.monotonic()
+        if overloaded or now - admitted_at > self.latency_target:
+            self._decrease(route, admitted_at, now)
+        elif route.limit < self.max_limit:
+            route.limit = min(self.max_limit, route.limit + 1 / route.limit)
+
+    def record_loop_lag(self, lag: float, sampled_from: float) -> None:
+        """
+        Record an event-loop lag sample, cutting busy routes' limits if it is too high.
+
+        Args:
+            lag: Seconds the loop was late
+            sampled_from: Monotonic time the measured interval started
+        """
+        self.loop_lag = lag
+        if lag > self.max_loop_lag:
+            self.lag_events += 1
+            now = time.monotonic()
+            for route in self.routes.values():
+                if route.in_flight:
+                    self._decrease(route, sampled_from, now)
+
+    def _decrease(self, route: RouteLimit, since: float, now: float) -> None:
+        """Multiplicative decrease, unless the evidence predates the last one."""
+        if since < route.cut_at:
+            return
+        route.cut_at = now
+        if route.limit > self.min_limit:
+            route.limit = max(self.min_limit, route.limit * self.backoff_ratio)
+            route.decreases += 1
+            logger.info(
+                "Admission limit decreased",
+                extra={
+                    "path": route.path,
+                    "limit": int(route.limit),
+                    "in_flight": route.in_flight,
+                    "loop_lag_ms": round(self.loop_lag * 1000, 3),
+                },
+            )
+
+    async def start(self) -> None:
+        """Start sampling event-loop lag."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._sample_loop_lag(), name="loop-lag-monitor")
+
+    async def stop(self) -> None:
+        """Stop sampling event-loop lag."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sample_loop_lag(self) -> None:
+        """Measure how late a timer fires: time the loop spent on other work."""
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.lag_interval)
+            self.record_loop_lag(max(0.0, time.monotonic() - started - self.lag_interval), started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe the controller for monitoring endpoints.
+
+        Returns:
+            Dict with settings, loop lag and per-route limits and counts
+        """
+        return {
+            "enabled": self.enabled,
+            "loop_lag_ms": round(self.loop_lag * 1000, 3),
+            "max_loop_lag_ms": self.max_loop_lag * 1000,
+            "lag_events": self.lag_events,
+            "latency_target_seconds": self.latency_target,
+            "routes": {
+                path: {
+                    "limit": int(route.limit),
+                    "in_flight": route.in_flight,
+                    "admitted": route.admitted,
+                    "shed": route.shed,
+                    "decreases": route.decreases,
+                }
+                for path, route in self.routes.items()
+            },
+        }
+
+
+# Singleton instance (one per worker process)
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    Get or create the admission controller singleton.
+
+    Returns:
+        AdmissionController instance
+    """
+    global _admission_controller
+
+    if _admission_controller is None:
+        _admission_controller = AdmissionController(
+            routes=settings.admission_routes,
+            initial_limit=settings.admission_initial_limit,
+            min_limit=settings.admission_min_limit,
+            max_limit=settings.admission_max_limit,
+            backoff_ratio=settings.admission_backoff_ratio,
+            latency_target=settings.admission_latency_target_seconds,
+            max_loop_lag=settings.admission_max_loop_lag_ms / 1000,
+            enabled=settings.admission_enabled,
+        )
+
+    return _admission_controller
+
+
+async def start_admission_controller() -> AdmissionController:
+    """
+    Create the admission controller singleton and start its lag monitor.
+
+    Returns:
+        Running AdmissionController instance
+    """
+    controller = get_admission_controller()
+    await controller.start()
+    return controller
+
+
+async def stop_admission_controller() -> None:
+    """Stop the admission controller singleton's lag monitor."""
+    global _admission_controller
+
+    if _admission_controller is not None:
+        await _admission_controller.stop()
+        _admission_controller = None
@@ -0,0 +1,165 @@
+"""
+Micro-batching stage for outbound webhook deliveries.
+
+Concurrent submissions are grouped into a single array payload so one
+HTTP request (and one n8n workflow execution) carries many of them. A
+batch is flushed as soon as it is full or its oldest item has lingered
+for ``max_linger_ms``, whichever comes first.
+
+Each batch is one outbound call, so it queues for an outbound slot under
+one client identifier: the client with the most items in it (the oldest
+on a tie). A client flooding the form therefore fills, and is charged
+for, most batches, while other clients' items ride along.
+"""
+
+import asyncio
+import contextvars
+import copy
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.utils.client import current_client, set_client
+from app.utils.exceptions import WebhookError
+
+logger = logging.getLogger(__name__)
+
+
+SendBatch = Callable[[List[Dict[str, Any]]], Awaitable[Dict[str, Dict[str, Any]]]]
+
+
+class WebhookBatcher:
+    """Groups pending submissions and maps per-item results back to callers."""
+
+    def __init__(self, send_batch: SendBatch, max_batch_size: int = 20, max_linger_ms: float = 25):
+        """
+        Initialize batcher.
+
+        Args:
+            send_batch: Coroutine delivering a list of envelopes, returning results by request_id
+            max_batch_size: Flush once this many submissions are pending
+            max_linger_ms: Flush once the oldest pending submission waited this long
+        """
+        self.send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_linger = max_linger_ms / 1000
+
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future, str]] = []
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def submit(self, request_id: str, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add a signed submission to the next batch and wait for its result.
+
+        Args:
+            request_id: Unique request identifier
+            envelope: {"payload": ..., "signature": ...} item
+
+        Returns:
+            Result reported for this item
+
+        Raises:
+            WebhookError: If the batch or this item failed
+        """
+        if self._runner is None or self._runner.done():
+            # Fresh context: the batch must not inherit the first caller's request deadline
+            self._runner = asyncio.create_task(
+                self._run(), name="webhook-batcher", context=contextvars.Context()
+            )
+
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._pending.append((request_id, envelope, future, current_client()))
+        self._wakeup.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+
+        return await future
+
+    async def stop(self) -> None:
+        """Flush anything still pending and stop the batching task."""
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        while self._pending:
+            self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """Collect submissions into batches until cancelled."""
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            if len(self._pending) < self.max_batch_size:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.max_linger)
+                except asyncio.TimeoutError:
+                    pass
+
+            self._start_flush()
+
+    def _start_flush(self) -> None:
+        """Detach the next batch and deliver it without blocking collection."""
+        batch = self._pending[: self.max_batch_size]
+        del self._pending[: self.max_batch_size]
+        if not batch:
+            return
+
+        # Fresh context (no request deadline) carrying the client the batch is charged to
+        context = contextvars.Context()
+        context.run(set_client, Counter(item[3] for item in batch).most_common(1)[0][0])
+        task = asyncio.create_task(self._flush(batch), context=context)
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future, str]]) -> None:
+        """Deliver one batch and resolve every waiting caller."""
+        try:
+            results = await self.send_batch([envelope for _, envelope, _, _ in batch])
+        except Exception as e:
+            for _, envelope, future, _ in batch:
+                if not future.done():
+                    future.set_exception(_item_error(e, envelope["payload"]))
+            return
+
+        failed = 0
+        for request_id, envelope, future, _ in batch:
+            if future.done():
+                continue
+            result = results.get(request_id, {"success": True})
+            if result.get("success", True) is False:
+                failed += 1
+                error = WebhookError(f"n8n rejected batched item {request_id}")
+                error.payload = envelope["payload"]
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        logger.info(
+            "Webhook batch delivered",
+            extra={"batch_size": len(batch), "failed_items": failed},
+        )
+
+
+def _item_error(error: Exception, payload: Dict[str, Any]) -> WebhookError:
+    """
+    Build one caller's error for a failed batch.
+
+    Every caller gets its own exception carrying its own payload, so a
+    dead letter written for one request never picks up another's body.
+    Copies keep the error type and attributes (e.g. a breaker's retry_after).
+    """
+    if isinstance(error, WebhookError):
+        item = copy.copy(error)
+    else:
+        item = WebhookError("Batch delivery failed")
+    item.__cause__ = error
+    item.payload = payload
+    return item
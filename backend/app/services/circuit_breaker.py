@@ -0,0 +1,234 @@
+"""
+Circuit breaker for outbound n8n webhook calls.
+
+Tracks failure rate and latency over a rolling time window. When n8n is
+failing or too slow the breaker opens and calls fail fast instead of
+waiting through full timeouts; after a cool-down a limited number of
+half-open probes decide whether to close it again.
+"""
+
+import logging
+import math
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.config import settings
+from app.utils.exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker with half-open probing."""
+
+    def __init__(
+        self,
+        name: str = "n8n",
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        slow_call_rate_threshold: float = 0.8,
+        minimum_calls: int = 10,
+        window_seconds: int = 30,
+        open_seconds: float = 15.0,
+        half_open_max_calls: int = 2,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Name used in logs and snapshots
+            failure_rate_threshold: Failure ratio in the window that opens the breaker
+            slow_call_seconds: Calls slower than this count as slow
+            slow_call_rate_threshold: Slow-call ratio in the window that opens the breaker
+            minimum_calls: Calls required in the window before rates are evaluated
+            window_seconds: Length of the rolling window (one bucket per second)
+            open_seconds: Time spent open before half-open probing starts
+            half_open_max_calls: Concurrent probes allowed while half-open
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_inflight = 0
+        self._half_open_successes = 0
+        # Per-second buckets: [second, calls, failures, slow_calls, latency_sum]
+        self._buckets: List[List[float]] = [[-1, 0, 0, 0, 0.0] for _ in range(window_seconds)]
+
+    def check(self) -> None:
+        """
+        Reject a call that before_call() would reject right now, without admitting it.
+
+        Raises:
+            CircuitOpenError: If the breaker is open or half-open probes are exhausted
+        """
+        if self.state == OPEN:
+            remaining = self._opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(f"Circuit '{self.name}' is open", retry_after=remaining)
+        elif self.state == HALF_OPEN and self._half_open_inflight >= self.half_open_max_calls:
+            raise CircuitOpenError(
+                f"Circuit '{self.name}' is half-open and probing", retry_after=1.0
+            )
+
+    def before_call(self) -> None:
+        """
+        Admit or reject a call.
+
+        Raises:
+            CircuitOpenError: If the breaker is open or half-open probes are exhausted
+        """
+        if self.state == CLOSED:
+            return
+
+        if self.state == OPEN:
+            remaining = self._opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(f"Circuit '{self.name}' is open", retry_after=remaining)
+            self._transition(HALF_OPEN)
+
+        if self._half_open_inflight >= self.half_open_max_calls:
+            raise CircuitOpenError(
+                f"Circuit '{self.name}' is half-open and probing", retry_after=1.0
+            )
+        self._half_open_inflight += 1
+
+    def record_success(self, latency: float) -> None:
+        """Record a call that reached n8n and got a healthy answer."""
+        slow = latency >= self.slow_call_seconds
+        self._record(latency, failed=False, slow=slow)
+
+        if self.state == HALF_OPEN:
+            self._half_open_inflight = max(0, self._half_open_inflight - 1)
+            if slow:
+                self._trip("slow_probe")
+                return
+            self._half_open_successes += 1
+            if self._half_open_successes >= self.half_open_max_calls:
+                self._transition(CLOSED)
+        elif self.state == CLOSED:
+            self._evaluate()
+
+    def record_failure(self, latency: float) -> None:
+        """Record a call that failed because of n8n or the network."""
+        self._record(latency, failed=True, slow=latency >= self.slow_call_seconds)
+
+        if self.state == HALF_OPEN:
+            self._half_open_inflight = max(0, self._half_open_inflight - 1)
+            self._trip("failed_probe")
+        elif self.state == CLOSED:
+            self._evaluate()
+
+    def release(self) -> None:
+        """Give back a half-open probe slot for a call that was cancelled."""
+        if self.state == HALF_OPEN:
+            self._half_open_inflight = max(0, self._half_open_inflight - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe the breaker state for monitoring endpoints.
+
+        Returns:
+            Dict with state, window counters and thresholds
+        """
+        calls, failures, slow, latency_sum = self._window_totals()
+        retry_after = 0.0
+        if self.state == OPEN:
+            retry_after = max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+        return {
+            "name": self.name,
+            "state": self.state,
+            "window_seconds": self.window_seconds,
+            "calls": calls,
+            "failure_rate": round(failures / calls, 3) if calls else 0.0,
+            "slow_call_rate": round(slow / calls, 3) if calls else 0.0,
+            "avg_latency_ms": round(latency_sum / calls * 1000, 1) if calls else 0.0,
+            "retry_after_seconds": math.ceil(retry_after),
+            "failure_rate_threshold": self.failure_rate_threshold,
+            "slow_call_seconds": self.slow_call_seconds,
+        }
+
+    def _record(self, latency: float, failed: bool, slow: bool) -> None:
+        second = int(time.monotonic())
+        bucket = self._buckets[second % self.window_seconds]
+        if bucket[0] != second:
+            bucket[:] = [second, 0, 0, 0, 0.0]
+        bucket[1] += 1
+        bucket[2] += failed
+        bucket[3] += slow
+        bucket[4] += latency
+
+    def _window_totals(self) -> Tuple[int, int, int, float]:
+        oldest = int(time.monotonic()) - self.window_seconds
+        # Buckets hold floats (see __init__): sum as floats, return counts as ints
+        calls: float = 0
+        failures: float = 0
+        slow: float = 0
+        latency_sum = 0.0
+        for second, bucket_calls, bucket_failures, bucket_slow, bucket_latency in self._buckets:
+            if second > oldest:
+                calls += bucket_calls
+                failures += bucket_failures
+                slow += bucket_slow
+                latency_sum += bucket_latency
+        return int(calls), int(failures), int(slow), latency_sum
+
+    def _evaluate(self) -> None:
+        calls, failures, slow, _ = self._window_totals()
+        if calls < self.minimum_calls:
+            return
+        if failures / calls >= self.failure_rate_threshold:
+            self._trip("failure_rate")
+        elif slow / calls >= self.slow_call_rate_threshold:
+            self._trip("slow_call_rate")
+
+    def _trip(self, reason: str) -> None:
+        self._opened_at = time.monotonic()
+        self._transition(OPEN, reason)
+
+    def _transition(self, state: str, reason: str = "") -> None:
+        previous, self.state = self.state, state
+        self._half_open_inflight = 0
+        self._half_open_successes = 0
+        if state == CLOSED:
+            self._buckets = [[-1, 0, 0, 0, 0.0] for _ in range(self.window_seconds)]
+
+        log = logger.warning if state == OPEN else logger.info
+        log(
+            "Circuit breaker state change",
+            extra={"circuit": self.name, "from": previous, "to": state, "reason": reason},
+        )
+
+
+def create_circuit_breaker(name: str = "n8n") -> CircuitBreaker:
+    """
+    Build a circuit breaker from application settings.
+
+    Args:
+        name: Name used in logs and snapshots
+
+    Returns:
+        CircuitBreaker instance
+    """
+    return CircuitBreaker(
+        name=name,
+        failure_rate_threshold=settings.n8n_breaker_failure_rate,
+        slow_call_seconds=settings.n8n_breaker_slow_call_seconds,
+        slow_call_rate_threshold=settings.n8n_breaker_slow_call_rate,
+        minimum_calls=settings.n8n_breaker_minimum_calls,
+        window_seconds=settings.n8n_breaker_window_seconds,
+        open_seconds=settings.n8n_breaker_open_seconds,
+        half_open_max_calls=settings.n8n_breaker_half_open_probes,
+    )
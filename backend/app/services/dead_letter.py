@@ -0,0 +1,198 @@
+"""
+Dead-letter store for submissions that could not be delivered.
+
+When a destination gives up on a submission, the exact payload that was
+(or would have been) signed is kept in a local SQLite database so it can
+be re-driven later with ``python -m app.tools.replay``.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dead_letters (
+    request_id TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    error TEXT,
+    failed_at REAL NOT NULL,
+    replay_attempts INTEGER NOT NULL DEFAULT 0,
+    replayed_at REAL,
+    PRIMARY KEY (request_id, destination)
+);
+CREATE INDEX IF NOT EXISTS idx_dead_letters_pending
+    ON dead_letters (replayed_at, failed_at);
+"""
+
+
+@dataclass
+class DeadLetter:
+    """A submission that a destination failed to accept."""
+
+    request_id: str
+    destination: str
+    payload: Dict[str, Any]
+    error: Optional[str]
+    failed_at: float
+    replay_attempts: int
+
+
+class DeadLetterStore:
+    """SQLite-backed dead-letter store keyed by (request_id, destination)."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the dead-letter database.
+
+        Args:
+            path: Filesystem path of the SQLite database
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    def record(
+        self, request_id: str, destination: str, payload: Dict[str, Any], error: str
+    ) -> None:
+        """
+        Store (or refresh) a failed delivery.
+
+        Recording the same request for the same destination twice keeps a
+        single entry, so re-failing replays never duplicate messages.
+
+        Args:
+            request_id: Unique request identifier
+            destination: Name of the destination that failed
+            payload: Payload as signed and sent to the destination
+            error: Last delivery error
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO dead_letters (request_id, destination, payload, error, failed_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (request_id, destination) DO UPDATE SET "
+                "error = excluded.error, failed_at = excluded.failed_at, replayed_at = NULL",
+                (request_id, destination, json.dumps(payload), error, time.time()),
+            )
+
+    async def record_async(
+        self, request_id: str, destination: str, payload: Dict[str, Any], error: str
+    ) -> None:
+        """Store a failed delivery without blocking the event loop."""
+        await asyncio.to_thread(self.record, request_id, destination, payload, error)
+
+    def pending(
+        self, after: tuple = (0.0, ""), limit: int = 500, destination: Optional[str] = None
+    ) -> List[DeadLetter]:
+        """
+        Page through entries that have not been replayed yet, oldest first.
+
+        Args:
+            after: (failed_at, request_id) of the last entry of the previous page
+            limit: Page size
+            destination: Only return entries for this destination
+
+        Returns:
+            List of DeadLetter entries
+        """
+        query = (
+            "SELECT request_id, destination, payload, error, failed_at, replay_attempts "
+            "FROM dead_letters WHERE replayed_at IS NULL AND (failed_at, request_id) > (?, ?)"
+        )
+        params: List[Any] = [after[0], after[1]]
+        if destination:
+            query += " AND destination = ?"
+            params.append(destination)
+        query += " ORDER BY failed_at, request_id LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            DeadLetter(
+                request_id=row[0],
+                destination=row[1],
+                payload=json.loads(row[2]),
+                error=row[3],
+                failed_at=row[4],
+                replay_attempts=row[5],
+            )
+            for row in rows
+        ]
+
+    def count_pending(self, destination: Optional[str] = None) -> int:
+        """Number of entries still waiting to be replayed."""
+        query = "SELECT COUNT(*) FROM dead_letters WHERE replayed_at IS NULL"
+        params: List[Any] = []
+        if destination:
+            query += " AND destination = ?"
+            params.append(destination)
+        with self._lock:
+            return int(self._conn.execute(query, params).fetchone()[0])
+
+    def mark_replayed(self, request_id: str, destination: str) -> None:
+        """Mark an entry as successfully re-delivered."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE dead_letters SET replayed_at = ?, replay_attempts = replay_attempts + 1 "
+                "WHERE request_id = ? AND destination = ?",
+                (time.time(), request_id, destination),
+            )
+
+    def mark_failed(self, request_id: str, destination: str, error: str) -> None:
+        """Record a failed replay attempt; the entry stays pending."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE dead_letters SET error = ?, replay_attempts = replay_attempts + 1 "
+                "WHERE request_id = ? AND destination = ?",
+                (error, request_id, destination),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance (None when DEAD_LETTER_PATH is empty)
+_dead_letter_store: Optional[DeadLetterStore] = None
+
+
+def get_dead_letter_store() -> Optional[DeadLetterStore]:
+    """
+    Get or create the dead-letter store singleton.
+
+    Returns:
+        DeadLetterStore instance, or None if dead-lettering is disabled
+    """
+    global _dead_letter_store
+
+    if _dead_letter_store is None and settings.dead_letter_path:
+        _dead_letter_store = DeadLetterStore(settings.dead_letter_path)
+
+    return _dead_letter_store
+
+
+def close_dead_letter_store() -> None:
+    """Close the dead-letter store singleton."""
+    global _dead_letter_store
+
+    if _dead_letter_store is not None:
+        _dead_letter_store.close()
+        _dead_letter_store = None
@@ -0,0 +1,397 @@
+"""
+Durable asynchronous delivery queue for contact form submissions.
+
+Submissions are appended to a local SQLite spool (WAL mode) and drained
+by a pool of background workers that forward them to n8n. The API can
+answer with 202 Accepted as soon as the submission is on disk.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.dispatcher import WebhookDispatcher
+from app.utils.exceptions import CircuitOpenError, WebhookError
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contact_spool (
+    request_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_contact_spool_available
+    ON contact_spool (status, available_at);
+"""
+
+
+@dataclass
+class SpoolEntry:
+    """A submission claimed from the spool."""
+
+    request_id: str
+    data: Dict[str, Any]
+    attempts: int
+    enqueued_at: float
+
+
+class ContactSpool:
+    """SQLite-backed durable store for pending submissions."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the spool database.
+
+        Args:
+            path: Filesystem path of the SQLite database
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # FULL fsyncs the WAL on every commit; batching commits amortizes the cost
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    def append_many(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Durably append submissions in a single transaction (one fsync).
+
+        Args:
+            items: (request_id, sanitized form data) pairs
+        """
+        now = time.time()
+        rows = [(request_id, json.dumps(data), now, now) for request_id, data in items]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO contact_spool "
+                    "(request_id, payload, enqueued_at, available_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def claim(self, lease_seconds: float) -> Optional[SpoolEntry]:
+        """
+        Lease the oldest available submission.
+
+        A leased entry becomes available again if it is not acknowledged
+        before the lease expires (e.g. the worker process died).
+
+        Args:
+            lease_seconds: How long the entry stays reserved
+
+        Returns:
+            SpoolEntry, or None if nothing is due
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT request_id, payload, attempts, enqueued_at FROM contact_spool "
+                    "WHERE status = 'pending' AND available_at <= ? "
+                    "ORDER BY available_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE contact_spool SET available_at = ? WHERE request_id = ?",
+                        (now + lease_seconds, row[0]),
+                    )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+        if row is None:
+            return None
+        return SpoolEntry(
+            request_id=row[0], data=json.loads(row[1]), attempts=row[2], enqueued_at=row[3]
+        )
+
+    def ack(self, request_id: str) -> None:
+        """Remove a delivered submission."""
+        with self._lock:
+            self._conn.execute("DELETE FROM contact_spool WHERE request_id = ?", (request_id,))
+
+    def retry_later(self, request_id: str, delay: float, error: str) -> int:
+        """
+        Record a failed attempt and reschedule the submission.
+
+        Returns:
+            Number of attempts made so far
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE contact_spool SET attempts = attempts + 1, available_at = ?, "
+                "last_error = ? WHERE request_id = ?",
+                (time.time() + delay, error, request_id),
+            )
+            row = self._conn.execute(
+                "SELECT attempts FROM contact_spool WHERE request_id = ?", (request_id,)
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def release(self, request_id: str, delay: float = 0.0) -> None:
+        """Make a leased submission available again without counting an attempt."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE contact_spool SET available_at = ? WHERE request_id = ?",
+                (time.time() + delay, request_id),
+            )
+
+    def mark_dead(self, request_id: str, error: str) -> None:
+        """Park a submission that exhausted its delivery attempts."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE contact_spool SET status = 'dead', last_error = ? WHERE request_id = ?",
+                (error, request_id),
+            )
+
+    def depth(self) -> int:
+        """Number of submissions still waiting for delivery."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM contact_spool WHERE status = 'pending'"
+            ).fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class DeliveryQueue:
+    """Group-committing writer plus a worker pool draining the spool to n8n."""
+
+    def __init__(
+        self,
+        spool: ContactSpool,
+        dispatcher: WebhookDispatcher,
+        workers: int = 2,
+        batch_size: int = 64,
+        max_attempts: int = 8,
+        lease_seconds: float = 60,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Initialize delivery queue.
+
+        Args:
+            spool: Durable submission store
+            dispatcher: Dispatcher used to forward submissions
+            workers: Number of concurrent delivery workers
+            batch_size: Maximum submissions written per transaction
+            max_attempts: Delivery attempts before a submission is parked
+            lease_seconds: Reservation time for a claimed submission
+            poll_interval: Idle sleep between spool scans in seconds
+        """
+        self.spool = spool
+        self.dispatcher = dispatcher
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+        self._pending: "asyncio.Queue[Tuple[str, Dict[str, Any], asyncio.Future]]" = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start the spool writer and delivery workers."""
+        self._tasks.append(asyncio.create_task(self._writer(), name="spool-writer"))
+        for index in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"spool-worker-{index}"))
+        logger.info(
+            "Delivery queue started",
+            extra={"spool_path": self.spool.path, "workers": self.workers},
+        )
+
+    async def stop(self) -> None:
+        """Flush pending writes, stop workers and close the spool."""
+        await self._pending.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self.spool.close()
+        logger.info("Delivery queue stopped")
+
+    async def enqueue(self, data: Dict[str, Any], request_id: str) -> None:
+        """
+        Durably store a submission for background delivery.
+
+        Returns once the submission has been committed to disk.
+
+        Args:
+            data: Sanitized contact form data
+            request_id: Unique request identifier
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put((request_id, data, future))
+        await future
+
+    async def _writer(self) -> None:
+        """Commit queued submissions in batches so one fsync covers many requests."""
+        while True:
+            batch = [await self._pending.get()]
+            while len(batch) < self.batch_size and not self._pending.empty():
+                batch.append(self._pending.get_nowait())
+
+            try:
+                await asyncio.to_thread(
+                    self.spool.append_many, [(request_id, data) for request_id, data, _ in batch]
+                )
+            except Exception as e:
+                logger.exception("Spool write failed", extra={"batch_size": len(batch)})
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+                self._wakeup.set()
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    async def _worker(self) -> None:
+        """Claim and deliver spooled submissions until cancelled."""
+        while True:
+            try:
+                entry = await asyncio.to_thread(self.spool.claim, self.lease_seconds)
+                if entry is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._deliver(entry)
+            except Exception:
+                # e.g. a locked or full spool database: a claimed entry is picked up
+                # again once its lease expires, so keep draining instead of dying
+                logger.exception("Delivery worker iteration failed")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _deliver(self, entry: SpoolEntry) -> None:
+        """Forward one spooled submission and record the outcome."""
+        attempts = entry.attempts + 1
+        try:
+            # Only the final attempt dead-letters; earlier failures stay spooled
+            await self.dispatcher.send_contact_form(
+                data=entry.data,
+                request_id=entry.request_id,
+                dead_letter=attempts >= self.max_attempts,
+            )
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.spool.release, entry.request_id)
+            raise
+        except CircuitOpenError as e:
+            # n8n is known to be down: keep the submission spooled until the breaker recovers
+            await asyncio.to_thread(
+                self.spool.release, entry.request_id, max(e.retry_after, self.poll_interval)
+            )
+            return
+        except WebhookError as e:
+            if attempts >= self.max_attempts:
+                # Dispatcher dead-lettered it; keep a parked spool row only if it could not
+                if self.dispatcher.dead_letters is not None:
+                    await asyncio.to_thread(self.spool.ack, entry.request_id)
+                else:
+                    await asyncio.to_thread(self.spool.mark_dead, entry.request_id, str(e))
+                logger.error(
+                    "Spooled submission exhausted delivery attempts",
+                    extra={"request_id": entry.request_id, "attempts": attempts},
+                )
+                return
+
+            delay = min(self.poll_interval * 2**attempts, 300.0)
+            await asyncio.to_thread(self.spool.retry_later, entry.request_id, delay, str(e))
+            logger.warning(
+                "Spooled submission delivery failed, rescheduled",
+                extra={"request_id": entry.request_id, "attempts": attempts, "delay": delay},
+            )
+            return
+
+        await asyncio.to_thread(self.spool.ack, entry.request_id)
+        logger.info(
+            "Spooled submission delivered",
+            extra={
+                "request_id": entry.request_id,
+                "queued_seconds": round(time.time() - entry.enqueued_at, 3),
+            },
+        )
+
+
+# Singleton instance (only created when queued delivery is enabled)
+_delivery_queue: Optional[DeliveryQueue] = None
+
+
+async def start_delivery_queue(dispatcher: WebhookDispatcher) -> DeliveryQueue:
+    """
+    Create and start the delivery queue singleton from settings.
+
+    Args:
+        dispatcher: Dispatcher used by the delivery workers
+
+    Returns:
+        Running DeliveryQueue instance
+    """
+    global _delivery_queue
+
+    spool = await asyncio.to_thread(ContactSpool, settings.spool_path)
+    _delivery_queue = DeliveryQueue(
+        spool=spool,
+        dispatcher=dispatcher,
+        workers=settings.spool_workers,
+        batch_size=settings.spool_batch_size,
+        max_attempts=settings.spool_max_attempts,
+        lease_seconds=settings.spool_lease_seconds,
+        poll_interval=settings.spool_poll_interval,
+    )
+    await _delivery_queue.start()
+    return _delivery_queue
+
+
+def get_delivery_queue() -> Optional[DeliveryQueue]:
+    """
+    Get the running delivery queue, if queued delivery is enabled.
+
+    Returns:
+        DeliveryQueue instance or None
+    """
+    return _delivery_queue
+
+
+async def stop_delivery_queue() -> None:
+    """Stop the delivery queue singleton."""
+    global _delivery_queue
+
+    if _delivery_queue is not None:
+        await _delivery_queue.stop()
+        _delivery_queue = None
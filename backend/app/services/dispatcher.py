@@ -0,0 +1,285 @@
+"""
+Concurrent multi-destination fan-out for contact form submissions.
+
+Every submission is sent to all configured destinations (primary n8n
+plus optional backups/archives) at once. The call succeeds as soon as a
+quorum of destinations acknowledged it; the remaining deliveries keep
+running in the background.
+
+Fan-out deliveries run without the request deadline so stragglers are not
+cut off once the response is sent. The request deadline bounds the wait
+for quorum instead, and deliveries are cancelled if the request gives up
+first.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from app.config import settings
+from app.services.dead_letter import DeadLetterStore, get_dead_letter_store
+from app.services.webhook import WebhookClient, create_webhook_client, get_webhook_client
+from app.utils import deadline
+from app.utils.exceptions import CircuitOpenError, DeadlineExceededError, WebhookError
+
+logger = logging.getLogger(__name__)
+
+
+def parse_quorum(quorum: str, destinations: int) -> int:
+    """
+    Translate a quorum setting into a number of required acknowledgements.
+
+    Args:
+        quorum: "any", "all" or a positive number
+        destinations: Number of configured destinations
+
+    Returns:
+        Required acknowledgements (clamped to the number of destinations)
+    """
+    if quorum == "any":
+        return 1
+    if quorum == "all":
+        return destinations
+    return max(1, min(int(quorum), destinations))
+
+
+class WebhookDispatcher:
+    """Sends submissions to several webhook destinations with quorum semantics."""
+
+    def __init__(
+        self,
+        clients: List[WebhookClient],
+        quorum: str = "any",
+        dead_letters: Optional[DeadLetterStore] = None,
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            clients: One pooled client per destination
+            quorum: "any", "all" or the number of acknowledgements required
+            dead_letters: Store receiving deliveries a destination gave up on
+        """
+        self.clients = clients
+        self.quorum = quorum
+        self.dead_letters = dead_letters
+        self.required = parse_quorum(quorum, len(clients))
+        self._stragglers: Set[asyncio.Task] = set()
+
+    async def send_contact_form(
+        self, data: Dict[str, Any], request_id: str, dead_letter: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Deliver a submission to every destination concurrently.
+
+        Args:
+            data: Sanitized contact form data
+            request_id: Unique request identifier
+            dead_letter: Record failed destinations in the dead-letter store
+
+        Returns:
+            Responses of the destinations that acknowledged before quorum
+
+        Raises:
+            WebhookError: If quorum can no longer be reached
+            DeadlineExceededError: If the request deadline ran out before quorum
+        """
+        # Shared with the delivery tasks so stragglers see the final decision
+        policy = {"dead_letter": dead_letter}
+
+        if len(self.clients) == 1:
+            return await self._deliver(self.clients[0], data, request_id, policy)
+
+        clients_by_name = {client.name: client for client in self.clients}
+        pending: Dict[asyncio.Task, WebhookClient] = {
+            asyncio.create_task(
+                self._deliver(client, data, request_id, policy),
+                context=deadline.context_without_deadline(),
+            ): client
+            for client in self.clients
+        }
+        acknowledged: Dict[str, Any] = {}
+        failed: Dict[str, BaseException] = {}
+
+        try:
+            while len(acknowledged) < self.required:
+                if len(self.clients) - len(failed) < self.required:
+                    raise WebhookError(
+                        f"Webhook quorum not reached ({len(acknowledged)}/{self.required})"
+                    )
+
+                time_left = deadline.remaining()
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=None if time_left is None else max(0.0, time_left),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    raise DeadlineExceededError("Request deadline exceeded waiting for quorum")
+                for task in done:
+                    client = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        acknowledged[client.name] = task.result()
+                    else:
+                        failed[client.name] = error
+                        logger.warning(
+                            "Webhook destination failed",
+                            extra={
+                                "request_id": request_id,
+                                "destination": client.name,
+                                "error": str(error),
+                            },
+                        )
+
+            # The submission counts as delivered and will not be retried as a
+            # whole: destinations that failed or fail later must be dead-lettered
+            if not policy["dead_letter"]:
+                policy["dead_letter"] = True
+                for name, error in failed.items():
+                    await self._dead_letter(clients_by_name[name], data, request_id, error)
+        except (DeadlineExceededError, asyncio.CancelledError):
+            # The client gets a 504 and retries: finishing these would deliver it twice
+            for task in pending:
+                task.cancel()
+            pending.clear()
+            raise
+        finally:
+            # Deliveries still in flight finish in the background
+            for task, client in pending.items():
+                self._track_straggler(task, client, request_id)
+
+        logger.info(
+            "Webhook quorum reached",
+            extra={
+                "request_id": request_id,
+                "acknowledged": list(acknowledged),
+                "required": self.required,
+                "stragglers": len(pending),
+            },
+        )
+        return {"success": True, "destinations": acknowledged}
+
+    async def _deliver(
+        self,
+        client: WebhookClient,
+        data: Dict[str, Any],
+        request_id: str,
+        policy: Dict[str, bool],
+    ) -> Dict[str, Any]:
+        """Send to one destination, dead-lettering the payload if it gives up."""
+        try:
+            return await client.send_contact_form(data=data, request_id=request_id)
+        except Exception as e:
+            # A lone destination's breaker rejection reaches the caller unchanged and is
+            # retried there (the spool keeps the entry): a dead letter would deliver it a
+            # second time on replay
+            retried = isinstance(e, CircuitOpenError) and len(self.clients) == 1
+            if policy["dead_letter"] and not retried:
+                await self._dead_letter(client, data, request_id, e)
+            raise
+
+    async def _dead_letter(
+        self, client: WebhookClient, data: Dict[str, Any], request_id: str, error: BaseException
+    ) -> None:
+        """Store the signature inputs of a failed delivery for later replay."""
+        if self.dead_letters is None:
+            return
+
+        payload = getattr(error, "payload", None) or client.build_payload(data, request_id)
+        try:
+            await self.dead_letters.record_async(
+                request_id, client.name, payload, str(error) or type(error).__name__
+            )
+        except Exception:
+            logger.exception(
+                "Failed to write dead letter",
+                extra={"request_id": request_id, "destination": client.name},
+            )
+            return
+
+        logger.warning(
+            "Submission dead-lettered",
+            extra={"request_id": request_id, "destination": client.name},
+        )
+
+    def _track_straggler(self, task: asyncio.Task, client: WebhookClient, request_id: str) -> None:
+        """Keep a reference to a background delivery and log its outcome."""
+        self._stragglers.add(task)
+
+        def _done(finished: asyncio.Task) -> None:
+            self._stragglers.discard(finished)
+            if finished.cancelled():
+                return
+            error = finished.exception()
+            logger.log(
+                logging.WARNING if error else logging.INFO,
+                "Background webhook delivery finished",
+                extra={
+                    "request_id": request_id,
+                    "destination": client.name,
+                    "success": error is None,
+                    "error": str(error) if error else None,
+                },
+            )
+
+        task.add_done_callback(_done)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe destinations and quorum for monitoring endpoints.
+
+        Returns:
+            Dict with quorum settings and per-destination breaker state
+        """
+        return {
+            "quorum": self.quorum,
+            "required_acks": self.required,
+            "background_deliveries": len(self._stragglers),
+            "destinations": [
+                {"name": client.name, "circuit_breaker": client.breaker.snapshot()}
+                for client in self.clients
+            ],
+        }
+
+    async def close(self) -> None:
+        """Wait for background deliveries and close the extra destination clients."""
+        if self._stragglers:
+            await asyncio.gather(*self._stragglers, return_exceptions=True)
+        # The primary client is owned by app.services.webhook
+        for client in self.clients[1:]:
+            await client.close()
+
+
+# Singleton instance (one per worker process, owned by the app lifespan)
+_webhook_dispatcher: Optional[WebhookDispatcher] = None
+
+
+def get_webhook_dispatcher() -> WebhookDispatcher:
+    """
+    Get or create the dispatcher singleton.
+
+    The primary n8n client comes first, followed by N8N_DESTINATIONS.
+
+    Returns:
+        WebhookDispatcher instance
+    """
+    global _webhook_dispatcher
+
+    if _webhook_dispatcher is None:
+        clients = [get_webhook_client()]
+        clients.extend(create_webhook_client(dest) for dest in settings.n8n_destinations)
+        _webhook_dispatcher = WebhookDispatcher(
+            clients, quorum=settings.n8n_quorum, dead_letters=get_dead_letter_store()
+        )
+
+    return _webhook_dispatcher
+
+
+async def close_webhook_dispatcher() -> None:
+    """Close the dispatcher singleton."""
+    global _webhook_dispatcher
+
+    if _webhook_dispatcher is not None:
+        await _webhook_dispatcher.close()
+        _webhook_dispatcher = None
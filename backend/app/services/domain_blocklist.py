@@ -0,0 +1,298 @@
+"""
+Disposable email domain blocklist.
+
+Domains are loaded from a plain-text file (one per line) into frozen hash
+sets, so a lookup costs one set probe per label of the address domain:
+``a.b.tempmail.com`` checks ``a.b.tempmail.com``, ``b.tempmail.com``,
+``tempmail.com`` and ``com``. The most specific match wins, which lets the
+allow-list carve exceptions out of a blocked parent domain.
+
+The file is re-read in a worker thread when its mtime changes (polled on
+an interval) or when the process receives SIGHUP. The new index replaces
+the old one in a single reference swap, so lookups never see a
+half-loaded list and a broken file keeps the previous index in place.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shipped with the application; DISPOSABLE_DOMAINS_PATH replaces it
+DEFAULT_BLOCKLIST_PATH = Path(__file__).resolve().parent.parent / "data" / "disposable_domains.txt"
+
+
+class _Index(NamedTuple):
+    """Immutable lookup tables, swapped as a whole on reload."""
+
+    blocked: frozenset
+    allowed: frozenset
+
+
+def normalize_domain(domain: str) -> str:
+    """
+    Canonical form used for both list entries and lookups.
+
+    Args:
+        domain: Domain name (or full email address)
+
+    Returns:
+        Lower-case domain without surrounding whitespace or trailing dot
+    """
+    return domain.rpartition("@")[2].strip().rstrip(".").lower()
+
+
+def parse_domains(lines: Iterable[str]) -> frozenset:
+    """
+    Parse blocklist lines, skipping blanks and ``#`` comments.
+
+    Args:
+        lines: Lines of a blocklist file
+
+    Returns:
+        Frozen set of normalized domains
+    """
+    domains = set()
+    for line in lines:
+        if "#" in line:
+            line = line.split("#", 1)[0]
+        entry = line.strip().rstrip(".").lower()
+        if entry:
+            domains.add(entry)
+    return frozenset(domains)
+
+
+class DomainBlocklist:
+    """Suffix-matching domain blocklist with allow-list overrides and hot reload."""
+
+    def __init__(
+        self,
+        domains: Iterable[str] = (),
+        allowed: Iterable[str] = (),
+        path: Optional[str] = None,
+    ):
+        """
+        Initialize blocklist.
+
+        Args:
+            domains: Blocked domains (ignored when ``path`` is given)
+            allowed: Domains that are never blocked, even under a blocked parent
+            path: Blocklist file to load now and reload on change
+        """
+        self.path = path
+        self._allowed = frozenset(normalize_domain(d) for d in allowed)
+        self._index = _Index(frozenset(normalize_domain(d) for d in domains), self._allowed)
+        self._mtime: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._sighup_task: Optional[asyncio.Task] = None
+        self._reload_lock = asyncio.Lock()
+        self.loaded_at: Optional[float] = None
+
+        if path is not None:
+            self.reload()
+
+    def __len__(self) -> int:
+        return len(self._index.blocked)
+
+    def is_blocked(self, domain: str) -> bool:
+        """
+        Check a domain (or email address) and all its parent domains.
+
+        Args:
+            domain: Domain name or email address
+
+        Returns:
+            True if the most specific listed suffix is blocked
+        """
+        blocked, allowed = self._index
+        name = normalize_domain(domain)
+        while name:
+            if name in allowed:
+                return False
+            if name in blocked:
+                return True
+            name = name.partition(".")[2]
+        return False
+
+    def reload(self) -> bool:
+        """
+        Re-read the blocklist file and swap in the new index.
+
+        Blocking (file I/O); use ``reload_async`` from the event loop.
+
+        Returns:
+            True if a new index was installed
+        """
+        if self.path is None:
+            return False
+
+        started = time.perf_counter()
+        try:
+            mtime = os.stat(self.path).st_mtime
+            with open(self.path, encoding="utf-8") as handle:
+                blocked = parse_domains(handle)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(
+                "Failed to load disposable domain blocklist, keeping previous list",
+                extra={"path": self.path, "error": str(e), "domains": len(self)},
+            )
+            return False
+
+        self._index = _Index(blocked, self._allowed)
+        self._mtime = mtime
+        self.loaded_at = time.time()
+        logger.info(
+            "Disposable domain blocklist loaded",
+            extra={
+                "path": self.path,
+                "domains": len(blocked),
+                "load_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload only if the file's mtime differs from the loaded version.
+
+        Returns:
+            True if a new index was installed
+        """
+        if self.path is None:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        return self.reload()
+
+    async def reload_async(self, force: bool = True) -> bool:
+        """
+        Reload in a worker thread without blocking the event loop.
+
+        Args:
+            force: Reload even if the mtime did not change
+
+        Returns:
+            True if a new index was installed
+        """
+        # Overlapping triggers (SIGHUP during a poll) would only parse the file twice
+        async with self._reload_lock:
+            return await asyncio.to_thread(self.reload if force else self.reload_if_changed)
+
+    def schedule_reload(self) -> None:
+        """Start a forced background reload (SIGHUP handler)."""
+        logger.info("Disposable domain blocklist reload requested", extra={"path": self.path})
+        self._sighup_task = asyncio.get_running_loop().create_task(self.reload_async())
+
+    async def start(self, interval: float) -> None:
+        """
+        Start watching the blocklist file.
+
+        Args:
+            interval: Seconds between mtime checks (0 = SIGHUP only)
+        """
+        if self.path is None:
+            return
+        if interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._watch(interval), name="domain-blocklist")
+        _install_sighup_handler(self)
+
+    async def stop(self) -> None:
+        """Stop watching the blocklist file."""
+        _remove_sighup_handler()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self, interval: float) -> None:
+        """Poll the file's mtime until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload_async(force=False)
+            except Exception:
+                logger.exception("Disposable domain blocklist reload crashed")
+
+
+def _install_sighup_handler(blocklist: DomainBlocklist) -> None:
+    """Reload the blocklist on SIGHUP (Unix event loops only)."""
+    if not hasattr(signal, "SIGHUP"):
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGHUP, blocklist.schedule_reload)
+    except (NotImplementedError, RuntimeError, ValueError):
+        # Not the main thread, or a loop without signal support
+        logger.debug("SIGHUP reload of the domain blocklist is unavailable")
+
+
+def _remove_sighup_handler() -> None:
+    if not hasattr(signal, "SIGHUP"):
+        return
+    try:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    except (NotImplementedError, RuntimeError, ValueError):
+        pass
+
+
+def _configured_path() -> str:
+    return settings.disposable_domains_path or str(DEFAULT_BLOCKLIST_PATH)
+
+
+# Singleton instance (one per worker process, owned by the app lifespan)
+_domain_blocklist: Optional[DomainBlocklist] = None
+
+
+def get_domain_blocklist() -> DomainBlocklist:
+    """
+    Get or create the blocklist singleton.
+
+    Without the lifespan (scripts, tests) the list is loaded once and
+    never reloaded.
+
+    Returns:
+        DomainBlocklist instance
+    """
+    global _domain_blocklist
+
+    if _domain_blocklist is None:
+        _domain_blocklist = DomainBlocklist(
+            allowed=settings.disposable_domains_allowlist, path=_configured_path()
+        )
+
+    return _domain_blocklist
+
+
+async def start_domain_blocklist() -> DomainBlocklist:
+    """
+    Load the blocklist off the event loop and start watching for changes.
+
+    Returns:
+        Running DomainBlocklist instance
+    """
+    blocklist = await asyncio.to_thread(get_domain_blocklist)
+    await blocklist.start(settings.disposable_domains_reload_interval)
+    return blocklist
+
+
+async def stop_domain_blocklist() -> None:
+    """Stop watching the blocklist file."""
+    global _domain_blocklist
+
+    if _domain_blocklist is not None:
+        await _domain_blocklist.stop()
+        _domain_blocklist = None
@@ -0,0 +1,276 @@
+"""
+Background n8n health prober.
+
+A single task per worker pings the n8n webhook on a fixed interval and
+keeps a rolling window of results. The health endpoint serves the
+precomputed snapshot, so polling it never turns into traffic against
+n8n; it only probes on demand when the background results are stale,
+and concurrent callers share that one probe.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, NamedTuple, Optional
+
+import httpx
+
+from app.config import settings
+from app.services.webhook import WebhookClient, get_webhook_client
+from app.utils.security import canonical_json, generate_request_id, sign_body
+
+logger = logging.getLogger(__name__)
+
+
+class ProbeResult(NamedTuple):
+    """Outcome of one health probe."""
+
+    healthy: bool
+    status_code: int
+    latency_ms: float
+    error: Optional[str]
+    timestamp: datetime
+    monotonic: float
+
+
+class WebhookHealthProber:
+    """Probes the webhook in the background and keeps rolling health statistics."""
+
+    def __init__(
+        self,
+        client: WebhookClient,
+        interval: float = 30.0,
+        window: int = 20,
+        ewma_alpha: float = 0.3,
+        timeout: float = 10.0,
+    ):
+        """
+        Initialize prober.
+
+        Args:
+            client: Pooled webhook client whose connection pool and secret are reused
+            interval: Seconds between background probes (0 = on-demand only)
+            window: Number of recent probes kept for the success ratio
+            ewma_alpha: Weight of the newest latency in the moving average
+            timeout: Per-probe timeout in seconds
+        """
+        self.client = client
+        self.interval = interval
+        self.ewma_alpha = ewma_alpha
+        self.timeout = timeout
+        self.results: Deque[ProbeResult] = deque(maxlen=window)
+        self.successes = 0
+        self.ewma_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the background probe loop."""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="webhook-health-prober")
+
+    async def stop(self) -> None:
+        """Stop the probe loop and any probe in flight."""
+        for task in (self._task, self._refresh_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._task = None
+        self._refresh_task = None
+
+    def is_stale(self) -> bool:
+        """Check whether the latest result is missing or older than two intervals."""
+        if not self.results:
+            return True
+        max_age = 2 * self.interval if self.interval > 0 else self.timeout
+        return time.monotonic() - self.results[-1].monotonic > max_age
+
+    async def refresh(self) -> ProbeResult:
+        """
+        Probe now, sharing one probe between concurrent callers.
+
+        Returns:
+            Result of the (shared) probe
+        """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._probe())
+            self._refresh_task.add_done_callback(self._clear_refresh)
+        return await asyncio.shield(self._refresh_task)
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Latest health report (precomputed after each probe).
+
+        Returns:
+            Health dict, or None before the first probe
+        """
+        if self._snapshot is None:
+            return None
+        return {
+            **self._snapshot,
+            "probe": {
+                **self._snapshot["probe"],
+                "age_seconds": round(time.monotonic() - self.results[-1].monotonic, 3),
+            },
+        }
+
+    async def _run(self) -> None:
+        """Probe on a fixed interval until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Webhook health probe crashed")
+            await asyncio.sleep(self.interval)
+
+    def _clear_refresh(self, task: asyncio.Task) -> None:
+        self._refresh_task = None
+        if not task.cancelled():
+            task.exception()
+
+    async def _probe(self) -> ProbeResult:
+        """Send one signed test ping and record the outcome."""
+        started_at = datetime.now(timezone.utc)
+        body = canonical_json(
+            {
+                "request_id": generate_request_id(),
+                "timestamp": started_at.isoformat(),
+                "test": True,
+                "message": "Health check ping from portfolio backend",
+            }
+        )
+        headers = {}
+        if self.client.secret:
+            headers["X-Webhook-Signature"] = sign_body(body, self.client.secret)
+
+        started = time.monotonic()
+        status_code = 0
+        error: Optional[str] = None
+        try:
+            response = await self.client.client.post(
+                self.client.webhook_url, content=body, headers=headers, timeout=self.timeout
+            )
+            status_code = response.status_code
+            if not 200 <= status_code < 300:
+                error = f"HTTP {status_code}"
+        except httpx.TimeoutException as e:
+            logger.error(f"Webhook health check timeout: {e}")
+            error = "Timeout connecting to webhook"
+        except httpx.RequestError as e:
+            logger.error(f"Webhook health check failed: {e}")
+            error = f"Connection failed: {str(e)}"
+
+        finished = time.monotonic()
+        result = ProbeResult(
+            healthy=error is None,
+            status_code=status_code,
+            latency_ms=(finished - started) * 1000,
+            error=error,
+            timestamp=started_at,
+            monotonic=finished,
+        )
+        self._record(result)
+        return result
+
+    def _record(self, result: ProbeResult) -> None:
+        """Fold a probe result into the rolling statistics and rebuild the snapshot."""
+        if len(self.results) == self.results.maxlen and self.results[0].healthy:
+            self.successes -= 1
+        self.results.append(result)
+        if result.healthy:
+            self.successes += 1
+        else:
+            self.last_error = result.error
+
+        if self.ewma_latency_ms is None:
+            self.ewma_latency_ms = result.latency_ms
+        else:
+            self.ewma_latency_ms += self.ewma_alpha * (result.latency_ms - self.ewma_latency_ms)
+
+        self._snapshot = {
+            "healthy": result.healthy,
+            "webhook_url": _masked_webhook_url(),
+            "response_time_ms": int(result.latency_ms),
+            "status_code": result.status_code,
+            "timestamp": result.timestamp.isoformat(),
+            "probe": {
+                "ewma_latency_ms": round(self.ewma_latency_ms, 1),
+                "success_ratio": round(self.successes / len(self.results), 3),
+                "samples": len(self.results),
+                "window": self.results.maxlen,
+                "interval_seconds": self.interval,
+                "last_error": self.last_error,
+            },
+            "details": {
+                "signature_enabled": bool(self.client.secret),
+                "timeout_seconds": self.timeout,
+                "environment": settings.environment,
+            },
+        }
+        if result.error:
+            self._snapshot["error"] = result.error
+
+
+def _masked_webhook_url() -> str:
+    """Webhook URL with its secret path hidden."""
+    return str(settings.n8n_webhook_url).replace(
+        settings.n8n_webhook_url.path or "", "/webhook/***"
+    )
+
+
+# Singleton instance (one per worker process, owned by the app lifespan)
+_health_prober: Optional[WebhookHealthProber] = None
+
+
+def get_health_prober() -> WebhookHealthProber:
+    """
+    Get or create the health prober singleton.
+
+    Also used as a FastAPI dependency. Without the lifespan (scripts,
+    tests) the prober is not started and probes on demand only.
+
+    Returns:
+        WebhookHealthProber instance
+    """
+    global _health_prober
+
+    if _health_prober is None:
+        _health_prober = WebhookHealthProber(
+            get_webhook_client(),
+            interval=settings.webhook_health_interval,
+            window=settings.webhook_health_window,
+            ewma_alpha=settings.webhook_health_ewma_alpha,
+            timeout=settings.n8n_timeout,
+        )
+
+    return _health_prober
+
+
+async def start_health_prober() -> WebhookHealthProber:
+    """
+    Create and start the health prober singleton.
+
+    Returns:
+        Running WebhookHealthProber instance
+    """
+    prober = get_health_prober()
+    await prober.start()
+    return prober
+
+
+async def stop_health_prober() -> None:
+    """Stop the health prober singleton."""
+    global _health_prober
+
+    if _health_prober is not None:
+        await _health_prober.stop()
+        _health_prober = None
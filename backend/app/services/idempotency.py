@@ -0,0 +1,187 @@
+"""
+Idempotency keys and duplicate-submission suppression.
+
+Double-clicks, browser retries and bots replaying a form would otherwise
+each pay for validation and a webhook round trip. Submissions are keyed
+by the client's ``Idempotency-Key`` header, or by a hash of the
+normalized form when the header is missing. Repeats within the TTL get
+the original response, and concurrent duplicates share a single
+in-flight delivery.
+
+The cache lives in each worker process; duplicates that land on
+different workers are still delivered once per worker.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.models import ContactRequest
+from app.utils.exceptions import IdempotencyConflictError
+from app.utils.security import canonical_json
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class _Entry(NamedTuple):
+    fingerprint: str
+    value: Any
+    expires_at: float
+
+
+def contact_fingerprint(contact: ContactRequest) -> str:
+    """
+    Hash the normalized content of a submission.
+
+    Args:
+        contact: Validated contact form data
+
+    Returns:
+        Hex-encoded SHA-256 of the canonical form
+    """
+    data = contact.model_dump(mode="json")
+    data["email"] = data["email"].lower()
+    return hashlib.sha256(canonical_json(data)).hexdigest()
+
+
+def idempotency_key(contact: ContactRequest, header: Optional[str]) -> Tuple[str, str]:
+    """
+    Derive the cache key and content fingerprint of a submission.
+
+    Args:
+        contact: Validated contact form data
+        header: Value of the Idempotency-Key header, if sent
+
+    Returns:
+        (key, fingerprint) tuple
+
+    Raises:
+        ValueError: If the header is empty or too long
+    """
+    fingerprint = contact_fingerprint(contact)
+    if header is None:
+        return f"content:{fingerprint}", fingerprint
+
+    header = header.strip()
+    if not header or len(header) > MAX_KEY_LENGTH:
+        raise ValueError(f"{IDEMPOTENCY_KEY_HEADER} must be 1-{MAX_KEY_LENGTH} characters")
+    return f"key:{header}", fingerprint
+
+
+class IdempotencyCache:
+    """Bounded TTL cache of completed results plus single-flight execution."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: How long a completed result is replayed
+            max_entries: Maximum cached results (least recently used are evicted)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, Tuple[str, asyncio.Task]] = {}
+
+    async def run(
+        self, key: str, fingerprint: str, operation: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run an operation at most once per key within the TTL.
+
+        Failed operations are not cached, so the client can retry them.
+
+        Args:
+            key: Idempotency key
+            fingerprint: Content hash the key must keep matching
+            operation: Coroutine factory producing the result
+
+        Returns:
+            (result, replayed) where replayed is True for duplicates
+
+        Raises:
+            IdempotencyConflictError: If the key was used for different content
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            self._check(entry.fingerprint, fingerprint)
+            return entry.value, True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._check(inflight[0], fingerprint)
+            return await asyncio.shield(inflight[1]), True
+
+        # The shared task outlives any single caller disconnecting
+        task = asyncio.create_task(self._execute(key, fingerprint, operation))
+        task.add_done_callback(_consume_exception)
+        self._inflight[key] = (fingerprint, task)
+        return await asyncio.shield(task), False
+
+    async def _execute(
+        self, key: str, fingerprint: str, operation: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run the operation and cache its result."""
+        try:
+            value = await operation()
+        finally:
+            self._inflight.pop(key, None)
+
+        self._entries[key] = _Entry(fingerprint, value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        """Return a live cache entry, dropping it if expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def _check(expected: str, fingerprint: str) -> None:
+        if expected != fingerprint:
+            raise IdempotencyConflictError(
+                f"{IDEMPOTENCY_KEY_HEADER} was already used for a different submission"
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Mark a shared task's exception as retrieved even if every caller went away."""
+    if not task.cancelled():
+        task.exception()
+
+
+# Singleton instance (None when IDEMPOTENCY_TTL_SECONDS is 0)
+_idempotency_cache: Optional[IdempotencyCache] = None
+
+
+def get_idempotency_cache() -> Optional[IdempotencyCache]:
+    """
+    Get or create the idempotency cache singleton.
+
+    Returns:
+        IdempotencyCache instance, or None if duplicate suppression is disabled
+    """
+    global _idempotency_cache
+
+    if _idempotency_cache is None and settings.idempotency_ttl_seconds > 0:
+        _idempotency_cache = IdempotencyCache(
+            settings.idempotency_ttl_seconds, settings.idempotency_max_entries
+        )
+
+    return _idempotency_cache
@@ -0,0 +1,262 @@
+"""
+Rolling, log-bucketed latency histograms for outbound webhook calls.
+
+Every attempt is recorded per (destination, outcome, attempt number)
+into a fixed-size histogram: bucket boundaries grow geometrically
+(8 sub-buckets per power of two, so reported percentiles overstate the
+true value by at most 12.5%) from 1 microsecond to about 4 minutes. Each
+series keeps a ring of time slots that are recycled as time passes, so
+memory stays constant and percentiles cover the most recent window.
+Recording is a frexp, a couple of list lookups and an increment.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from math import frexp
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SUB_BUCKETS = 8
+MIN_EXPONENT = -19  # values below 2**-20 s (~1 us) share the first bucket
+MAX_EXPONENT = 8  # values above 2**8 s share the last bucket
+BUCKETS = (MAX_EXPONENT - MIN_EXPONENT + 1) * SUB_BUCKETS
+PERCENTILES = (50, 90, 99)
+
+# bucket_index() as one expression: exponent * SUB_BUCKETS + int(mantissa * _SCALE) - _OFFSET
+_SCALE = 2 * SUB_BUCKETS
+_OFFSET = MIN_EXPONENT * SUB_BUCKETS + SUB_BUCKETS
+
+
+def bucket_index(seconds: float) -> int:
+    """
+    Map a latency to its histogram bucket.
+
+    Args:
+        seconds: Latency in seconds
+
+    Returns:
+        Bucket index in [0, BUCKETS)
+    """
+    mantissa, exponent = math.frexp(seconds)  # seconds = mantissa * 2**exponent, 0.5 <= m < 1
+    if exponent < MIN_EXPONENT or seconds <= 0:
+        return 0
+    if exponent > MAX_EXPONENT:
+        return BUCKETS - 1
+    return (exponent - MIN_EXPONENT) * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+
+def bucket_upper_bound(index: int) -> float:
+    """Largest latency (seconds) that falls into a bucket."""
+    exponent, sub_bucket = divmod(index, SUB_BUCKETS)
+    return math.ldexp(0.5 + (sub_bucket + 1) / (2 * SUB_BUCKETS), exponent + MIN_EXPONENT)
+
+
+class RollingHistogram:
+    """Latency histogram over a sliding window made of recycled time slots."""
+
+    __slots__ = (
+        "slot_seconds",
+        "slots",
+        "_counts",
+        "_slot_ids",
+        "_maxes",
+        "_current_index",
+        "_current",
+        "_current_max",
+        "_current_end",
+    )
+
+    def __init__(self, window_seconds: float = 300.0, slots: int = 5):
+        """
+        Initialize histogram.
+
+        Args:
+            window_seconds: Time span covered by percentiles
+            slots: Number of slots the window is split into (rotation granularity)
+        """
+        self.slot_seconds = window_seconds / slots
+        self.slots = slots
+        self._counts = [[0] * BUCKETS for _ in range(slots)]
+        self._slot_ids = [-1] * slots
+        self._maxes = [0.0] * slots
+        self._current_index = 0
+        self._current = self._counts[0]
+        self._current_max = 0.0
+        self._current_end = -math.inf
+
+    def record(self, seconds: float, now: float) -> None:
+        """
+        Record one latency.
+
+        Args:
+            seconds: Latency in seconds
+            now: Current time.monotonic() (callers usually have it already)
+        """
+        if now >= self._current_end:
+            self._rotate(now)
+
+        # Inlined bucket_index(): this is the hot path
+        mantissa, exponent = frexp(seconds)
+        if MIN_EXPONENT <= exponent <= MAX_EXPONENT:
+            self._current[exponent * SUB_BUCKETS + int(mantissa * _SCALE) - _OFFSET] += 1
+        else:
+            self._current[bucket_index(seconds)] += 1
+        if seconds > self._current_max:
+            self._current_max = seconds
+
+    def _rotate(self, now: float) -> None:
+        """Make the slot covering ``now`` current, recycling its storage if it expired."""
+        self._maxes[self._current_index] = self._current_max
+        slot_id = int(now / self.slot_seconds)
+        index = slot_id % self.slots
+        if self._slot_ids[index] != slot_id:
+            self._counts[index] = [0] * BUCKETS
+            self._slot_ids[index] = slot_id
+            self._maxes[index] = 0.0
+        self._current_index = index
+        self._current = self._counts[index]
+        self._current_max = self._maxes[index]
+        self._current_end = (slot_id + 1) * self.slot_seconds
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Summarize the live window.
+
+        Args:
+            now: Current time.monotonic() (defaults to now)
+
+        Returns:
+            Dict with count and p50/p90/p99/max in milliseconds
+        """
+        self._maxes[self._current_index] = self._current_max
+        current = int((time.monotonic() if now is None else now) / self.slot_seconds)
+        merged = [0] * BUCKETS
+        maximum = 0.0
+        for index, slot_id in enumerate(self._slot_ids):
+            if current - self.slots < slot_id <= current:
+                merged = [a + b for a, b in zip(merged, self._counts[index])]
+                maximum = max(maximum, self._maxes[index])
+
+        count = sum(merged)
+        summary: Dict[str, Any] = {"count": count}
+        targets = [(p, math.ceil(count * p / 100)) for p in PERCENTILES]
+        seen = 0
+        for index, bucket_count in enumerate(merged):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            while targets and seen >= targets[0][1]:
+                percentile, _ = targets.pop(0)
+                value = min(bucket_upper_bound(index), maximum)
+                summary[f"p{percentile}_ms"] = round(value * 1000, 3)
+        for percentile, _ in targets:
+            summary[f"p{percentile}_ms"] = None
+        summary["max_ms"] = round(maximum * 1000, 3) if count else None
+        return summary
+
+
+class LatencyRecorder:
+    """Rolling histograms keyed by destination, outcome and attempt number."""
+
+    def __init__(self, window_seconds: float = 300.0, slots: int = 5, log_interval: float = 0.0):
+        """
+        Initialize recorder.
+
+        Args:
+            window_seconds: Time span covered by percentiles
+            slots: Rotation granularity of each histogram
+            log_interval: Seconds between structured summary logs (0 disables)
+        """
+        self.window_seconds = window_seconds
+        self.slots = slots
+        self.log_interval = log_interval
+        self._series: Dict[Tuple[str, str, int], RollingHistogram] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, destination: str, outcome: str, attempt: int, seconds: float, now: float):
+        """
+        Record one webhook attempt.
+
+        Args:
+            destination: Destination name
+            outcome: "success", "http_4xx", "http_5xx", "timeout", "network_error" or "error"
+            attempt: Attempt number (1-based)
+            seconds: Attempt latency
+            now: time.monotonic() at the end of the attempt
+        """
+        key = (destination, outcome, attempt)
+        try:
+            histogram = self._series[key]
+        except KeyError:
+            histogram = self._series[key] = RollingHistogram(self.window_seconds, self.slots)
+        histogram.record(seconds, now)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Summaries of every series with samples in the current window.
+
+        Returns:
+            List of {destination, outcome, attempt, count, p50_ms, p90_ms, p99_ms, max_ms}
+        """
+        now = time.monotonic()
+        series = []
+        for (destination, outcome, attempt), histogram in sorted(self._series.items()):
+            summary = histogram.summary(now)
+            if summary["count"]:
+                series.append(
+                    {"destination": destination, "outcome": outcome, "attempt": attempt, **summary}
+                )
+        return series
+
+    async def start(self) -> None:
+        """Start periodic summary logging."""
+        if self.log_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._report(), name="webhook-latency-reporter")
+
+    async def stop(self) -> None:
+        """Stop periodic summary logging."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.log_interval)
+            series = self.snapshot()
+            if series:
+                logger.info(
+                    "Webhook latency summary",
+                    extra={"window_seconds": self.window_seconds, "latency": series},
+                )
+
+
+# Singleton instance (one per worker process, shared by every WebhookClient)
+_latency_recorder: Optional[LatencyRecorder] = None
+
+
+def get_latency_recorder() -> LatencyRecorder:
+    """
+    Get or create the latency recorder singleton.
+
+    Returns:
+        LatencyRecorder instance
+    """
+    global _latency_recorder
+
+    if _latency_recorder is None:
+        _latency_recorder = LatencyRecorder(
+            window_seconds=settings.latency_window_seconds,
+            slots=settings.latency_window_slots,
+            log_interval=settings.latency_log_interval,
+        )
+
+    return _latency_recorder
@@ -0,0 +1,285 @@
+"""
+Near-duplicate detection for contact submissions.
+
+Spam campaigns resend one message with small edits from many IPs, which
+neither per-IP rate limiting nor exact-content idempotency catches. Each
+submission's subject and message are reduced to a MinHash signature: the
+minimum hash of its word 3-grams in each of 32 bins (one-permutation
+hashing: the hashes are sorted once and each bin's minimum is found by
+bisection; empty bins are densified from a deterministic donor bin). The
+fraction of equal bins between two signatures estimates the Jaccard
+similarity of their 3-gram sets.
+
+Recent signatures live in an LSH index: 8 bands of 4 bins, each band
+hashed into its own dict. Two messages become candidates if any band is
+identical (likely from a similarity of about 0.6 upward). Only those few
+candidates are compared bin by bin, so a lookup costs 8 dict probes plus
+a handful of comparisons, whatever the index size.
+
+The index is bounded by both age (TTL) and entry count. Entries are
+evicted oldest first, and since every bucket lists its ids in insertion
+order, evicting an entry pops the head of each bucket it occupies.
+
+Hashes use Python's per-process randomized 64-bit ``hash()``, so
+signatures are only comparable within one worker process (like the index
+itself).
+"""
+
+import logging
+import string
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union, cast
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_BINS = 32
+BANDS = 8
+BAND_BYTES = SIGNATURE_BINS // BANDS * 4  # 4 bins of 32 bits per band
+
+# hash() is a signed 64-bit int: the top 5 bits select the bin, the next 32
+# bits are the bin value (monotonic in the remaining bits, so the smallest
+# hash of a bin has the smallest value)
+_BIN_SHIFT = 64 - (SIGNATURE_BINS.bit_length() - 1)
+_VALUE_SHIFT = _BIN_SHIFT - 32
+_VALUE_MASK = 0xFFFFFFFF
+_BIN_STARTS = [(index - SIGNATURE_BINS // 2) << _BIN_SHIFT for index in range(SIGNATURE_BINS)]
+_PUNCTUATION = str.maketrans(
+    dict.fromkeys(string.punctuation + "\u2018\u2019\u201c\u201d\u2026", " ")
+)
+
+
+class Match(NamedTuple):
+    """A recent submission similar to the one being checked."""
+
+    request_id: str
+    similarity: float
+    age_seconds: float
+
+
+class _Entry(NamedTuple):
+    signature: bytes
+    added: float
+    request_id: str
+
+
+def signature(text: str, min_words: int = 1) -> Optional[bytes]:
+    """
+    Compute the MinHash signature of a text's word 3-grams.
+
+    Args:
+        text: Text to fingerprint (case and punctuation are ignored)
+        min_words: Texts with fewer words get no signature
+
+    Returns:
+        SIGNATURE_BINS 32-bit bin minimums as bytes, or None if too short
+    """
+    words = text.lower().translate(_PUNCTUATION).split()
+    if len(words) < max(min_words, 1):
+        return None
+    shingles = zip(words, words[1:], words[2:]) if len(words) >= 3 else words
+    hashes = sorted(set(map(hash, shingles)))
+
+    # The first hash at or above a bin's start is that bin's minimum (if it is in the bin)
+    count = len(hashes)
+    bins: List[Optional[int]] = []
+    for index, start in enumerate(_BIN_STARTS):
+        position = bisect_left(hashes, start)
+        if position < count and hashes[position] >> _BIN_SHIFT == index - SIGNATURE_BINS // 2:
+            bins.append((hashes[position] >> _VALUE_SHIFT) & _VALUE_MASK)
+        else:
+            bins.append(None)
+
+    if None in bins:
+        filled = list(bins)
+        for index, value in enumerate(filled):
+            if value is None:
+                # Same donor sequence for every text, so densified bins stay comparable
+                attempt = 0
+                while filled[hash((index, attempt)) % SIGNATURE_BINS] is None:
+                    attempt += 1
+                bins[index] = filled[hash((index, attempt)) % SIGNATURE_BINS]
+
+    return array("I", cast(List[int], bins)).tobytes()  # every bin is filled now
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """
+    Estimate the Jaccard similarity of two signatures.
+
+    Returns:
+        Fraction of bins with the same minimum (0.0 - 1.0)
+    """
+    same = sum(a == b for a, b in zip(memoryview(first).cast("I"), memoryview(second).cast("I")))
+    return same / SIGNATURE_BINS
+
+
+class NearDuplicateIndex:
+    """Bounded, time-decaying LSH index of recent submission signatures."""
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        ttl_seconds: float = 86400.0,
+        max_entries: int = 5_000,
+        min_words: int = 8,
+        max_candidates: int = 64,
+    ):
+        """
+        Initialize index.
+
+        Args:
+            threshold: Estimated similarity at which a submission is a near-duplicate
+            ttl_seconds: How long a submission stays comparable
+            max_entries: Maximum indexed submissions (oldest are evicted first)
+            min_words: Shorter texts are neither checked nor indexed
+            max_candidates: Candidates compared per lookup (newest first)
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.min_words = min_words
+        self.max_candidates = max_candidates
+
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._bands: List[Dict[int, Union[int, List[int]]]] = [{} for _ in range(BANDS)]
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def check(
+        self, text: str, now: Optional[float] = None
+    ) -> Tuple[Optional[bytes], Optional[Match]]:
+        """
+        Look a submission up without indexing it.
+
+        The caller indexes the returned signature with add() once the
+        submission is accepted, so a failed attempt that the client retries
+        does not match itself.
+
+        Args:
+            text: Subject and message of the submission
+            now: Current time.monotonic() (defaults to now)
+
+        Returns:
+            (signature, or None if the text is too short; most recent similar submission, or None)
+        """
+        fingerprint = signature(text, self.min_words)
+        if fingerprint is None:
+            return None, None
+
+        now = time.monotonic() if now is None else now
+        self._evict(now)
+        return fingerprint, self.query(fingerprint, now)
+
+    def query(self, fingerprint: bytes, now: float) -> Optional[Match]:
+        """
+        Find a live indexed signature at or above the similarity threshold.
+
+        Args:
+            fingerprint: Signature to look up
+            now: Current time.monotonic()
+
+        Returns:
+            First (newest) matching submission, or None
+        """
+        oldest = now - self.ttl_seconds
+        candidates = set()
+        for band, offset in zip(self._bands, range(0, len(fingerprint), BAND_BYTES)):
+            bucket = band.get(hash(fingerprint[offset : offset + BAND_BYTES]))
+            if isinstance(bucket, list):
+                candidates.update(bucket[-self.max_candidates :])
+            elif bucket is not None:
+                candidates.add(bucket)
+
+        # Ids grow with insertion time: compare the newest candidates first
+        for entry_id in sorted(candidates, reverse=True)[: self.max_candidates]:
+            entry = self._entries[entry_id]
+            if entry.added < oldest:
+                break  # older candidates have expired too
+            score = similarity(fingerprint, entry.signature)
+            if score >= self.threshold:
+                return Match(entry.request_id, score, now - entry.added)
+        return None
+
+    def add(self, fingerprint: bytes, request_id: str, now: Optional[float] = None) -> None:
+        """
+        Index a signature, evicting the oldest entries beyond max_entries.
+
+        Args:
+            fingerprint: Signature to index
+            request_id: Identifier reported to later near-duplicates
+            now: Current time.monotonic() (defaults to now)
+        """
+        now = time.monotonic() if now is None else now
+        while len(self._entries) >= self.max_entries:
+            self._pop_oldest()
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _Entry(fingerprint, now, request_id)
+        for band, offset in zip(self._bands, range(0, len(fingerprint), BAND_BYTES)):
+            key = hash(fingerprint[offset : offset + BAND_BYTES])
+            bucket = band.get(key)
+            if bucket is None:
+                band[key] = entry_id  # most buckets hold a single id
+            elif isinstance(bucket, list):
+                bucket.append(entry_id)
+            else:
+                band[key] = [bucket, entry_id]
+
+    def _evict(self, now: float) -> None:
+        """Drop entries older than the TTL."""
+        oldest = now - self.ttl_seconds
+        while self._entries and next(iter(self._entries.values())).added < oldest:
+            self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        entry_id, entry = self._entries.popitem(last=False)
+        fingerprint = entry.signature
+        for band, offset in zip(self._bands, range(0, len(fingerprint), BAND_BYTES)):
+            key = hash(fingerprint[offset : offset + BAND_BYTES])
+            bucket = band[key]
+            if not isinstance(bucket, list):
+                del band[key]
+                continue
+            # Ids are appended in insertion order, so the oldest is at the head
+            if bucket[0] == entry_id:
+                del bucket[0]
+            else:
+                bucket.remove(entry_id)
+            if len(bucket) == 1:
+                band[key] = bucket[0]
+
+
+# Singleton instance (one per worker process, None when detection is off)
+_near_duplicate_index: Optional[NearDuplicateIndex] = None
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """
+    Get or create the near-duplicate index singleton.
+
+    Also used as a FastAPI dependency.
+
+    Returns:
+        NearDuplicateIndex instance, or None if NEAR_DUPLICATE_ACTION is "off"
+    """
+    global _near_duplicate_index
+
+    if settings.near_duplicate_action == "off":
+        return None
+    if _near_duplicate_index is None:
+        _near_duplicate_index = NearDuplicateIndex(
+            threshold=settings.near_duplicate_threshold,
+            ttl_seconds=settings.near_duplicate_ttl_seconds,
+            max_entries=settings.near_duplicate_max_entries,
+            min_words=settings.near_duplicate_min_words,
+        )
+
+    return _near_duplicate_index
@@ -0,0 +1,201 @@
+"""
+Bounded, fair concurrency for outbound webhook calls.
+
+Each destination allows at most ``max_in_flight`` calls at once, so a
+burst of submissions reaches n8n as a steady stream instead of a
+thundering herd. Calls over the cap wait in a weighted fair queue keyed
+by client identifier (start-time fair queuing): every waiter is tagged
+with a virtual finish time, its client's previous tag plus 1/weight, and
+the smallest tag is served next. A client with a hundred queued
+submissions therefore gets its share of the slots, not the next hundred,
+and a newcomer waits behind at most about one call per active client.
+
+Waits are bounded by a timeout (and the request deadline). Memory is
+bounded by the waiters themselves: clients with nothing queued keep no
+state.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.latency import RollingHistogram
+from app.utils import deadline
+from app.utils.exceptions import DeadlineExceededError, WebhookBusyError
+
+logger = logging.getLogger(__name__)
+
+
+class OutboundGate:
+    """Semaphore with a weighted fair queue of waiters per client."""
+
+    def __init__(
+        self,
+        name: str = "primary",
+        max_in_flight: int = 10,
+        max_wait: float = 5.0,
+        weights: Optional[Dict[str, float]] = None,
+        window_seconds: float = 300.0,
+        slots: int = 5,
+    ):
+        """
+        Initialize gate.
+
+        Args:
+            name: Destination name used in logs and snapshots
+            max_in_flight: Concurrent calls allowed (0 = unlimited)
+            max_wait: Seconds a call may wait for a slot (0 = never wait)
+            weights: Share of the slots per client identifier (default 1)
+            window_seconds: Time span covered by wait time percentiles
+            slots: Number of slots the window is split into
+        """
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+        self.weights = weights or {}
+        self._cap = max_in_flight or math.inf
+
+        self.in_flight = 0
+        self.depth = 0  # calls currently waiting
+        self._heap: List[Tuple[float, int, float, str, asyncio.Future]] = []
+        self._clients: Dict[str, List[float]] = {}  # client -> [last finish tag, waiting]
+        self._virtual_time = 0.0
+        self._sequence = itertools.count()
+
+        self.granted = 0
+        self.queued = 0  # calls that had to wait
+        self.timeouts = 0
+        self.max_depth = 0
+        self._waits = RollingHistogram(window_seconds, slots)
+
+    async def acquire(self, client: str = "") -> None:
+        """
+        Take a slot, waiting in the client's fair share of the queue if none is free.
+
+        Args:
+            client: Client identifier the call is made for
+
+        Raises:
+            WebhookBusyError: If no slot became free within max_wait
+            DeadlineExceededError: If the request deadline ran out first
+        """
+        if self.in_flight < self._cap and not self.depth:
+            self.in_flight += 1
+            self.granted += 1
+            self._waits.record(0.0, time.monotonic())
+            return
+
+        state = self._clients.get(client)
+        if state is None:
+            state = self._clients[client] = [self._virtual_time, 0]
+        start = max(self._virtual_time, state[0])
+        state[0] = start + 1 / self.weights.get(client, 1.0)
+        state[1] += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (state[0], next(self._sequence), start, client, future))
+        self.depth += 1
+        self.queued += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+        wait = self.max_wait
+        time_left = deadline.remaining()
+        deadline_first = False
+        if time_left is not None and time_left < wait:
+            wait = max(0.0, time_left)
+            deadline_first = True
+
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(wait):
+                await future
+        except (TimeoutError, asyncio.CancelledError) as error:
+            if future.done() and not future.cancelled():
+                self.release()  # granted as we gave up: hand the slot on
+            else:
+                future.cancel()
+                self._dequeued(client)
+            if not isinstance(error, TimeoutError):
+                raise
+
+            self.timeouts += 1
+            logger.warning(
+                "Webhook call timed out waiting for a slot",
+                extra={
+                    "destination": self.name,
+                    "waited": round(time.monotonic() - started, 3),
+                    "queue_depth": self.depth,
+                },
+            )
+            if deadline_first:
+                raise DeadlineExceededError("Request deadline exceeded in webhook queue") from None
+            raise WebhookBusyError(f"No webhook slot free within {self.max_wait}s") from None
+        finally:
+            finished = time.monotonic()
+            self._waits.record(finished - started, finished)
+
+    def release(self) -> None:
+        """Free a slot, or hand it straight to the next waiter in fair order."""
+        while self._heap:
+            _, _, start, client, future = heapq.heappop(self._heap)
+            if future.cancelled():
+                continue  # gave up waiting, already accounted for
+            self._virtual_time = start
+            self._dequeued(client)
+            self.granted += 1
+            future.set_result(None)
+            return
+        self.in_flight -= 1
+
+    def _dequeued(self, client: str) -> None:
+        """Account for a waiter leaving the queue; idle clients keep no state."""
+        self.depth -= 1
+        state = self._clients[client]
+        state[1] -= 1
+        if not state[1]:
+            del self._clients[client]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe the gate for monitoring endpoints.
+
+        Returns:
+            Dict with limits, current occupancy, counts and wait time percentiles
+        """
+        return {
+            "name": self.name,
+            "max_in_flight": self.max_in_flight,
+            "max_wait_seconds": self.max_wait,
+            "in_flight": self.in_flight,
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+            "queued_clients": len(self._clients),
+            "granted": self.granted,
+            "queued": self.queued,
+            "timeouts": self.timeouts,
+            "wait": self._waits.summary(),
+        }
+
+
+def create_outbound_gate(name: str = "primary") -> OutboundGate:
+    """
+    Build an outbound gate from application settings.
+
+    Args:
+        name: Destination name used in logs and snapshots
+
+    Returns:
+        OutboundGate instance
+    """
+    return OutboundGate(
+        name=name,
+        max_in_flight=settings.n8n_max_in_flight,
+        max_wait=settings.n8n_queue_timeout,
+        weights=settings.n8n_queue_weights,
+        window_seconds=settings.latency_window_seconds,
+        slots=settings.latency_window_slots,
+    )
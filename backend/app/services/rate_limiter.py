@@ -0,0 +1,497 @@
+"""
+Memory-bounded rate limiting for the contact form.
+
+Each client key is limited with GCRA (generic cell rate algorithm): the
+only state is a "theoretical arrival time" (TAT) per key, the instant at
+which the key would be fully idle again. A request is allowed if it does
+not push the TAT more than one period ahead of now.
+
+TATs live in a fixed-capacity open-addressing table: 16 bytes per slot
+(a 64-bit key hash and a float TAT) in one preallocated buffer, probed
+over at most ``probe_limit`` neighbouring slots. A slot whose TAT has
+passed carries no information (a fresh key would get the same decision),
+so it is reused as if empty. Only when every probed slot belongs to an
+active client is one evicted, the one closest to idle, which at worst
+forgives that client part of its quota. Check-and-increment is therefore
+O(1) and memory is fixed at startup: a flood of spoofed sources cycles
+through the table instead of growing it.
+
+With gunicorn, each worker would otherwise enforce its own quota (the
+effective limit being workers x RATE_LIMIT_PER_HOUR). Given a path (e.g.
+on /dev/shm), the table is instead a memory-mapped file that every worker
+maps: with or without --preload, and a restarted worker picks up the
+existing counters. Updates take an fcntl lock on just the bytes of the
+key's probe window, so workers only contend on overlapping windows.
+
+IP addresses are keyed by network prefix rather than exactly (by default
+IPv6 by /64, the block a single subscriber is normally assigned, so
+rotating through it does not reset the quota). An optional second, wider
+level (e.g. IPv4 /24, IPv6 /48) limits a whole network; both levels are
+checked and incremented in one table update, all or nothing.
+"""
+
+import hashlib
+import logging
+import math
+import mmap
+import os
+import socket
+import struct
+import time
+from types import ModuleType
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from app.config import settings
+
+fcntl: Optional[ModuleType]
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: shared tables are unavailable
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SLOT_BYTES = 16  # uint64 key hash + float64 TAT
+HEADER_BYTES = 64  # shared table files start with a header describing the layout
+_HEADER = struct.Struct("<8sQQ")  # magic, capacity, probe_limit
+_MAGIC = b"GCRA\x00\x00\x00\x01"
+
+
+def key_hash(key: str) -> int:
+    """
+    Hash a client key to a non-zero 64-bit integer (0 marks an empty slot).
+
+    BLAKE2b rather than ``hash()``: the result must not depend on the
+    process, so a table can be shared or persisted.
+    """
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+def parse_address(identifier: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse an IP address for prefix masking.
+
+    ``inet_pton`` rather than ``ipaddress``: about ten times faster, and
+    this runs on every request. IPv4-mapped IPv6 addresses count as the
+    IPv4 address.
+
+    Args:
+        identifier: Client identifier
+
+    Returns:
+        (address bits, address as an integer), or None if not an IP address
+    """
+    try:
+        if ":" not in identifier:
+            return 32, int.from_bytes(socket.inet_pton(socket.AF_INET, identifier), "big")
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET6, identifier), "big")
+    except (OSError, ValueError):
+        return None
+    if value >> 32 == 0xFFFF:
+        return 32, value & 0xFFFFFFFF
+    return 128, value
+
+
+def prefix_key(level: int, bits: int, value: int, prefix: int) -> int:
+    """
+    Hash the network (of ``prefix`` bits) containing an address to a key.
+
+    Args:
+        level: Limit level, so levels with equal prefixes keep separate keys
+        bits: Address bits (32 or 128)
+        value: Address as an integer
+        prefix: Network prefix length
+
+    Returns:
+        Non-zero 64-bit key hash
+    """
+    network = (value >> (bits - prefix)).to_bytes(16, "little")
+    digest = hashlib.blake2b(network + bytes((level, bits, prefix)), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class RateLimitStore:
+    """Fixed-capacity hash table of GCRA arrival times, in process or in shared memory."""
+
+    def __init__(self, capacity: int = 65536, probe_limit: int = 8, path: str = ""):
+        """
+        Initialize store.
+
+        Args:
+            capacity: Tracked keys (rounded up to a power of two)
+            probe_limit: Slots inspected per lookup
+            path: File to map the table from, shared by every process that
+                opens it (empty = private to this process)
+        """
+        self.capacity = 1 << max(capacity - 1, 1).bit_length()
+        self.probe_limit = min(probe_limit, self.capacity)
+        self.path = path
+        self._mask = self.capacity - 1
+        # probe_limit - 1 overflow slots past the end, so probe windows never wrap
+        size = (self.capacity + self.probe_limit - 1) * SLOT_BYTES
+
+        self._fd: Optional[int] = None
+        self._buffer: Union[mmap.mmap, bytearray]
+        if path:
+            self._fd, self._buffer = _map_shared_table(path, self.capacity, self.probe_limit, size)
+            slots = memoryview(self._buffer)[HEADER_BYTES:]
+            # Arrival times must mean the same in every process and across restarts
+            self.clock = time.time
+        else:
+            self._buffer = bytearray(size)
+            slots = memoryview(self._buffer)
+            self.clock = time.monotonic
+
+        # Two views of the same slots: even items are key hashes, odd items TATs
+        self._keys = slots.cast("Q")
+        self._tats = slots.cast("d")
+
+        self.evictions = 0  # active keys this process dropped to make room
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the slot table."""
+        return len(self._buffer)
+
+    @property
+    def occupied(self) -> int:
+        """Slots ever used (they are reused, never emptied)."""
+        keys = self._keys[::2].tolist()
+        return len(keys) - keys.count(0)
+
+    def close(self) -> None:
+        """Unmap a shared table (the file stays for other and future processes)."""
+        if self._fd is not None and isinstance(self._buffer, mmap.mmap):
+            self._keys.release()
+            self._tats.release()
+            self._buffer.close()
+            os.close(self._fd)
+            self._fd = None
+
+    def update(
+        self, checks: Sequence[Tuple[int, float, float]], now: float
+    ) -> Tuple[int, List[float]]:
+        """
+        GCRA check-and-increment for one or more keys, all or nothing.
+
+        A shared table is updated under exclusive fcntl locks on the probe
+        windows' bytes: processes only wait for each other when their
+        windows overlap, and the kernel drops the locks if a worker dies.
+
+        Args:
+            checks: (non-zero key hash, seconds per request at the sustained
+                rate, how far the TAT may run ahead of now) per key
+            now: Current time, from self.clock
+
+        Returns:
+            (rejected_by, tats): index of the first check that failed (-1 if
+            all passed) and every key's TAT, new if all passed
+        """
+        if self._fd is None or fcntl is None:  # no fd without fcntl: private table
+            return self._update(checks, now)
+
+        # Lock in file order, so processes locking several windows cannot deadlock
+        starts = sorted({HEADER_BYTES + (key & self._mask) * SLOT_BYTES for key, _, _ in checks})
+        length = self.probe_limit * SLOT_BYTES
+        for start in starts:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+        try:
+            return self._update(checks, now)
+        finally:
+            for start in starts:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def _update(
+        self, checks: Sequence[Tuple[int, float, float]], now: float
+    ) -> Tuple[int, List[float]]:
+        if len(checks) == 1:
+            key, interval, tolerance = checks[0]
+            allowed, tat = self._update_key(key & self._mask, key, now, interval, tolerance)
+            return -1 if allowed else 0, [tat]
+
+        # Check every key before incrementing any
+        tats = [self._lookup(key & self._mask, key, now) for key, _, _ in checks]
+        for index, (_, _, tolerance) in enumerate(checks):
+            if tats[index] - now > tolerance:
+                return index, tats
+        return -1, [
+            self._update_key(key & self._mask, key, now, interval, tolerance)[1]
+            for key, interval, tolerance in checks
+        ]
+
+    def _lookup(self, base: int, key: int, now: float) -> float:
+        """TAT of a key (now if absent or idle)."""
+        keys, tats = self._keys, self._tats
+        for slot in range(base, base + self.probe_limit):
+            stored = keys[slot * 2]
+            if stored == key:
+                return max(tats[slot * 2 + 1], now)
+            if stored == 0:
+                break  # keys are never deleted, so none is stored past an empty slot
+        return now
+
+    def _update_key(
+        self, base: int, key: int, now: float, interval: float, tolerance: float
+    ) -> Tuple[bool, float]:
+        keys, tats = self._keys, self._tats
+        found = -1
+        victim, victim_tat = -1, math.inf
+
+        for slot in range(base, base + self.probe_limit):
+            stored = keys[slot * 2]
+            if stored == key:
+                found = slot
+                break
+            if stored == 0:
+                # Keys are never deleted, so none is stored past an empty slot
+                if victim_tat > now:
+                    victim, victim_tat = slot, -math.inf
+                break
+            tat = tats[slot * 2 + 1]
+            if tat < victim_tat:
+                victim, victim_tat = slot, tat
+
+        tat = max(tats[found * 2 + 1], now) if found >= 0 else now
+        if tat - now > tolerance:
+            return False, tat
+
+        if found < 0:
+            # Take an empty slot, else an idle one, else evict the key closest to idle
+            if victim_tat > now:
+                self.evictions += 1
+            keys[victim * 2] = key
+            found = victim
+        tats[found * 2 + 1] = tat + interval
+        return True, tat + interval
+
+
+def _map_shared_table(
+    path: str, capacity: int, probe_limit: int, size: int
+) -> Tuple[int, mmap.mmap]:
+    """
+    Open (or create) and map a shared slot table file.
+
+    Creation is serialized with a lock on the header. A file laid out for
+    another capacity is replaced by a fresh one (atomically, so processes
+    still mapping the old file keep a consistent, if private, table).
+
+    Returns:
+        (file descriptor, writable shared mapping of the whole file)
+    """
+    if fcntl is None:
+        raise RuntimeError("A shared rate limit table needs fcntl (POSIX systems only)")
+
+    header = _HEADER.pack(_MAGIC, capacity, probe_limit)
+    total = HEADER_BYTES + size
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(fd, fcntl.LOCK_EX, HEADER_BYTES, 0)
+        try:
+            stat = os.fstat(fd)
+            # Skip the checks if another process replaced the file while we waited
+            if stat.st_ino == os.stat(path).st_ino:
+                if stat.st_size == total and os.pread(fd, _HEADER.size, 0) == header:
+                    table = mmap.mmap(fd, total)
+                    fcntl.lockf(fd, fcntl.LOCK_UN, HEADER_BYTES, 0)
+                    return fd, table
+                _create_table_file(path, header, total)
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)  # also releases the lock; reopen whatever the path holds now
+
+
+def _create_table_file(path: str, header: bytes, total: int) -> None:
+    """Atomically put an empty table file in place."""
+    fresh = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(fresh, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.pwrite(fd, header, 0)
+        os.ftruncate(fd, total)  # sparse zeros: every slot empty
+    finally:
+        os.close(fd)
+    os.replace(fresh, path)
+    logger.info("Shared rate limit table created", extra={"path": path, "bytes": total})
+
+
+class RateLimitDecision(NamedTuple):
+    """Outcome of one rate-limited request."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until the next request is allowed (0 if allowed)
+    reset_after: float  # seconds until the key's full quota is available again
+
+
+class _Level(NamedTuple):
+    """One level of a hierarchical limit."""
+
+    limit: int
+    interval: float
+    tolerance: float
+    ipv4_prefix: int
+    ipv6_prefix: int
+
+
+class RateLimiter:
+    """GCRA rate limiter: ``limit`` requests at once, refilled evenly over ``period``."""
+
+    def __init__(
+        self,
+        limit: int,
+        period: float = 3600.0,
+        store: Optional[RateLimitStore] = None,
+        prefixes: Tuple[int, int] = (32, 64),
+        network_limit: int = 0,
+        network_prefixes: Tuple[int, int] = (24, 48),
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            limit: Requests per period (also the burst size)
+            period: Period in seconds
+            store: Slot table (a default-sized one if omitted)
+            prefixes: (IPv4, IPv6) prefix lengths grouping addresses into one client
+            network_limit: Requests per period for all clients in a wider
+                network (0 = no network level)
+            network_prefixes: (IPv4, IPv6) prefix lengths of that network
+        """
+        self.limit = limit
+        self.period = period
+        self.interval = period / limit
+        self.tolerance = period - self.interval
+        self.store = store or RateLimitStore()
+
+        self.levels = [_Level(limit, self.interval, self.tolerance, *prefixes)]
+        if network_limit:
+            interval = period / network_limit
+            self.levels.append(
+                _Level(network_limit, interval, period - interval, *network_prefixes)
+            )
+
+        self.allowed = 0
+        self.rejected = 0
+        self.network_rejected = 0
+
+    def hit(self, key: str, now: Optional[float] = None) -> RateLimitDecision:
+        """
+        Count a request against a client's quota (and its network's, if limited).
+
+        Args:
+            key: Client identifier (e.g. IP address)
+            now: Current time on the store's clock (defaults to now)
+
+        Returns:
+            RateLimitDecision for this request
+        """
+        now = self.store.clock() if now is None else now
+        address = parse_address(key)
+        if address is None:
+            # Not an address (e.g. a test client): no prefix to group by
+            checks = [(key_hash(key), self.interval, self.tolerance)]
+        else:
+            bits, value = address
+            checks = [
+                (
+                    prefix_key(index, bits, value, ipv4 if bits == 32 else ipv6),
+                    interval,
+                    tolerance,
+                )
+                for index, (_, interval, tolerance, ipv4, ipv6) in enumerate(self.levels)
+            ]
+        rejected_by, tats = self.store.update(checks, now)
+
+        if rejected_by < 0:
+            self.allowed += 1
+            remaining = min(
+                int((self.period - (tat - now)) / level.interval + 1e-9)
+                for tat, level in zip(tats, self.levels)
+            )
+            return RateLimitDecision(True, self.limit, remaining, 0.0, max(tats) - now)
+
+        self.rejected += 1
+        self.network_rejected += rejected_by > 0
+        level, tat = self.levels[rejected_by], tats[rejected_by]
+        retry_after = tat + level.interval - self.period - now
+        return RateLimitDecision(False, level.limit, 0, retry_after, tat - now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe the limiter for monitoring endpoints.
+
+        Returns:
+            Dict with configuration, table usage and decision counts
+        """
+        network = None
+        if len(self.levels) > 1:
+            network = {
+                "limit": self.levels[1].limit,
+                "ipv4_prefix": self.levels[1].ipv4_prefix,
+                "ipv6_prefix": self.levels[1].ipv6_prefix,
+                "rejected": self.network_rejected,
+            }
+        return {
+            "limit": self.limit,
+            "period_seconds": self.period,
+            "ipv4_prefix": self.levels[0].ipv4_prefix,
+            "ipv6_prefix": self.levels[0].ipv6_prefix,
+            "network": network,
+            "shared": bool(self.store.path),
+            "capacity": self.store.capacity,
+            "occupied": self.store.occupied,
+            "evictions": self.store.evictions,
+            "memory_bytes": self.store.memory_bytes,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+# Singleton instance (one per worker process)
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get or create the rate limiter singleton.
+
+    Returns:
+        RateLimiter instance
+    """
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(
+            settings.rate_limit_per_hour,
+            3600.0,
+            RateLimitStore(settings.rate_limit_capacity, path=settings.rate_limit_shared_path),
+            prefixes=(settings.rate_limit_ipv4_prefix, settings.rate_limit_ipv6_prefix),
+            network_limit=settings.rate_limit_network_per_hour,
+            network_prefixes=(
+                settings.rate_limit_network_ipv4_prefix,
+                settings.rate_limit_network_ipv6_prefix,
+            ),
+        )
+        logger.info(
+            "Rate limiter ready",
+            extra={
+                "limit_per_hour": settings.rate_limit_per_hour,
+                "network_limit_per_hour": settings.rate_limit_network_per_hour,
+                "capacity": _rate_limiter.store.capacity,
+                "shared_path": settings.rate_limit_shared_path or None,
+                "memory_bytes": _rate_limiter.store.memory_bytes,
+            },
+        )
+
+    return _rate_limiter
+
+
+def close_rate_limiter() -> None:
+    """Unmap the rate limiter's table (a shared file keeps its counters)."""
+    global _rate_limiter
+
+    if _rate_limiter is not None:
+        _rate_limiter.store.close()
+        _rate_limiter = None
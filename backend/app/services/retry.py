@@ -0,0 +1,244 @@
+"""
+Retry policies for outbound webhook calls.
+
+Only failures that are safe to repeat are retried (the request never
+reached n8n, or n8n explicitly asked us to come back later), with
+exponential backoff and full jitter. A per-process token bucket caps
+retries to a fraction of overall traffic so an n8n brownout is not
+amplified by every worker retrying at once.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, NamedTuple, Optional
+
+import httpx
+
+from app.config import settings
+
+
+# Errors raised before the request body could reach n8n
+RETRYABLE_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Statuses that mean "not processed, try again later"
+RETRYABLE_STATUS_CODES: FrozenSet[int] = frozenset({429, 502, 503, 504})
+
+
+class RetryDecision(NamedTuple):
+    """Outcome of a retry policy evaluation."""
+
+    retry: bool
+    delay: float
+    reason: str
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of request traffic.
+
+    Every first attempt deposits ``ratio`` tokens and every retry withdraws
+    one. A small time-based allowance keeps retries possible at low traffic.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 0.5, burst: float = 10.0):
+        """
+        Initialize retry budget.
+
+        Args:
+            ratio: Retries allowed per request (0.2 = at most 20% extra load)
+            min_per_second: Retries always allowed per second regardless of traffic
+            burst: Maximum number of tokens that can be accumulated
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def record_request(self) -> None:
+        """Deposit tokens for a new (first-attempt) request."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Withdraw one token for a retry.
+
+        Returns:
+            True if the retry is within budget, False otherwise
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def available(self) -> float:
+        """Currently available retry tokens."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date).
+
+    Args:
+        value: Raw header value
+
+    Returns:
+        Delay in seconds, or None if absent or invalid
+    """
+    if not value or not isinstance(value, str):
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Base retry policy: never retries."""
+
+    def record_request(self) -> None:
+        """Hook called once per logical request, before the first attempt."""
+
+    def decide(self, attempt: int, max_attempts: int, error: Exception) -> RetryDecision:
+        """
+        Decide whether a failed attempt should be retried.
+
+        Args:
+            attempt: Attempt number that just failed (1-based)
+            max_attempts: Maximum number of attempts allowed
+            error: Exception raised by the attempt
+
+        Returns:
+            RetryDecision with the delay before the next attempt
+        """
+        return RetryDecision(False, 0.0, "retries_disabled")
+
+
+class ExponentialBackoffPolicy(RetryPolicy):
+    """Retry idempotent-safe failures with full-jitter exponential backoff."""
+
+    def __init__(
+        self,
+        base_delay: float = 0.25,
+        max_delay: float = 5.0,
+        budget: Optional[RetryBudget] = None,
+        retryable_status_codes: FrozenSet[int] = RETRYABLE_STATUS_CODES,
+    ):
+        """
+        Initialize backoff policy.
+
+        Args:
+            base_delay: Backoff ceiling for the first retry in seconds
+            max_delay: Upper bound for any delay (including Retry-After)
+            budget: Shared retry budget (None disables budgeting)
+            retryable_status_codes: HTTP statuses considered safe to retry
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retryable_status_codes = retryable_status_codes
+
+    def record_request(self) -> None:
+        """Deposit retry tokens for a new request."""
+        if self.budget is not None:
+            self.budget.record_request()
+
+    def classify(self, error: Exception) -> Optional[str]:
+        """
+        Classify a failure as retryable.
+
+        Returns:
+            Reason string if the failure may be retried, None otherwise
+        """
+        if isinstance(error, RETRYABLE_EXCEPTIONS):
+            return type(error).__name__
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            if status_code in self.retryable_status_codes:
+                return f"http_{status_code}"
+        return None
+
+    def decide(self, attempt: int, max_attempts: int, error: Exception) -> RetryDecision:
+        """Decide whether to retry, honouring Retry-After and the retry budget."""
+        reason = self.classify(error)
+        if reason is None:
+            return RetryDecision(False, 0.0, "not_retryable")
+        if attempt >= max_attempts:
+            return RetryDecision(False, 0.0, "max_attempts")
+
+        # Full jitter: uniform in [0, min(max_delay, base * 2^(attempt-1))]
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+            if retry_after is not None:
+                if retry_after > self.max_delay:
+                    return RetryDecision(False, retry_after, "retry_after_too_long")
+                delay = retry_after
+
+        if self.budget is not None and not self.budget.try_spend():
+            return RetryDecision(False, 0.0, "budget_exhausted")
+
+        return RetryDecision(True, delay, reason)
+
+
+# Per-process retry budget shared by every webhook client
+_retry_budget: Optional[RetryBudget] = None
+
+
+def get_retry_budget() -> RetryBudget:
+    """
+    Get or create the per-process retry budget.
+
+    Returns:
+        RetryBudget instance
+    """
+    global _retry_budget
+
+    if _retry_budget is None:
+        _retry_budget = RetryBudget(
+            ratio=settings.n8n_retry_budget_ratio,
+            min_per_second=settings.n8n_retry_budget_min_per_second,
+            burst=settings.n8n_retry_budget_burst,
+        )
+
+    return _retry_budget
+
+
+def default_retry_policy() -> RetryPolicy:
+    """
+    Build the retry policy configured in settings.
+
+    Returns:
+        RetryPolicy instance
+    """
+    return ExponentialBackoffPolicy(
+        base_delay=settings.n8n_retry_base_delay,
+        max_delay=settings.n8n_retry_max_delay,
+        budget=get_retry_budget(),
+    )
@@ -0,0 +1,73 @@
+"""
+Tiered HTML stripping for plain-text form fields.
+
+Produces exactly what ``bleach.clean(text, tags=[], attributes={},
+strip=True)`` returns, but only pays for bleach's html5lib parse when the
+input is genuinely ambiguous:
+
+1. No markup-significant characters (``<``, ``>``, ``&`` or C0 controls
+   that html5lib rewrites): the input is returned unchanged.
+2. Only simple inline tags (``<b>``, ``</span >``, ``<br/>``...) without
+   attributes, stray ``<``/``>`` and ``&`` that cannot start a character
+   reference (``R&D``, ``&nbsp`` without ``;``): tags are removed and the
+   rest is escaped in a single pass.
+3. Anything else (attributes, comments, ``&...;`` and ``&#`` references,
+   block-level or raw-text elements, control characters): bleach.
+"""
+
+import re
+from typing import Optional
+
+import bleach
+
+# Allowed HTML tags (none for plain text forms)
+ALLOWED_TAGS: list = []
+ALLOWED_ATTRIBUTES: dict = {}
+
+# Inline elements bleach strips to nothing: no newline (block-level), no
+# raw-text/RCDATA content model, no special tree-construction handling
+INLINE_TAGS = frozenset(
+    "a abbr b bdi bdo big br cite code data dfn em font i img kbd mark q s samp small span"
+    " strike strong sub sup time tt u var wbr".split()
+)
+
+_MARKUP = re.compile(r"[<>&\x00-\x08\x0b-\x1f]")
+_SIMPLE_TAG = re.compile(r"<(/?)([A-Za-z][A-Za-z0-9]*)[ \t\n]*/?>")
+# Left after removing simple tags, these need a real HTML tokenizer
+_AMBIGUOUS = re.compile(r"[\x00-\x08\x0b-\x1f]|&(?:#|[A-Za-z0-9]*;)|<(?=[A-Za-z/!?])")
+
+
+def strip_markup(text: str) -> str:
+    """
+    Remove all HTML tags and escape what remains, exactly like bleach.
+
+    Args:
+        text: Raw input text
+
+    Returns:
+        Plain text with ``<``, ``>`` and ``&`` escaped
+    """
+    # Tier 1: nothing for an HTML parser to act on
+    if _MARKUP.search(text) is None:
+        return text
+
+    # Tier 2: simple inline tags only
+    simple = _strip_simple_tags(text)
+    if simple is not None:
+        return simple.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+    # Tier 3: full parse
+    cleaned: str = bleach.clean(text, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, strip=True)
+    return cleaned
+
+
+def _strip_simple_tags(text: str) -> Optional[str]:
+    """Remove simple inline tags, or return None if the text needs bleach."""
+    for match in _SIMPLE_TAG.finditer(text):
+        if match.group(2).lower() not in INLINE_TAGS:
+            return None
+
+    stripped = _SIMPLE_TAG.sub("", text)
+    if _AMBIGUOUS.search(stripped) is not None:
+        return None
+    return stripped
@@ -0,0 +1,284 @@
+"""
+In-process spam scoring for contact submissions.
+
+Subject and message are reduced to hashed word n-gram features (word
+CRC32s combined into unigram and bigram hashes, folded into ``dim``
+buckets) and scored by a linear model: a weight per bucket plus a bias,
+turned into a probability with the logistic function. Models are trained offline from exported
+submissions (``python -m app.tools.train_spam``) as binarized multinomial
+Naive Bayes, whose log-probability ratios are exactly such weights, and
+stored as a NumPy ``.npz`` file loaded once per worker.
+
+Scoring is batched: concurrent requests append their text to a pending
+batch that is scored on the next event-loop iteration (or after
+``linger_ms``), so one gather-and-sum over all their features replaces a
+Python loop per request. Feature vectors are sparse (a few hundred of
+``dim`` buckets), so the "matrix product" is a weight gather plus a
+bincount by row rather than a dense multiplication.
+
+NumPy is an optional dependency: without it, SPAM_MODEL_PATH cannot be set.
+"""
+
+import asyncio
+import logging
+import string
+import zlib
+from types import ModuleType
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    import numpy
+
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIM = 1 << 18
+_MULTIPLIER = 0x9E3779B97F4A7C15  # 2^64 / golden ratio, odd
+_PUNCTUATION = str.maketrans(
+    dict.fromkeys(string.punctuation + "\u2018\u2019\u201c\u201d\u2026", " ")
+)
+_NUMPY_REQUIRED = "Spam scoring requires numpy (pip install numpy)"
+
+
+def features(text: str, dim: int = DEFAULT_DIM, ngrams: int = 2) -> "numpy.ndarray":
+    """
+    Hash a text's word n-grams into feature buckets.
+
+    Each distinct word is hashed once with CRC32 (unlike ``hash()``, stable
+    across processes, so training and serving agree); n-gram hashes are
+    then combined from word hashes with vectorized multiply-xor steps.
+
+    Args:
+        text: Text to featurize (case and punctuation are ignored)
+        dim: Number of buckets (a power of two)
+        ngrams: Longest n-gram length
+
+    Returns:
+        Sorted distinct bucket indices
+    """
+    if np is None:
+        raise RuntimeError(_NUMPY_REQUIRED)
+    words = text.lower().translate(_PUNCTUATION).split()
+    table = {word: zlib.crc32(word.encode()) for word in set(words)}
+    hashes = np.fromiter(map(table.__getitem__, words), dtype=np.uint64, count=len(words))
+
+    multiplier = np.uint64(_MULTIPLIER)
+    grams = [hashes]
+    for n in range(2, ngrams + 1):
+        grams.append(grams[-1][:-1] * multiplier ^ hashes[n - 1 :])
+    mixed = np.concatenate(grams)
+    # Fold the high bits in before masking: a product's low bits only see low input bits
+    buckets: "numpy.ndarray" = np.unique((mixed ^ (mixed >> np.uint64(29))) & np.uint64(dim - 1))
+    return buckets.astype(np.intp)
+
+
+class SpamScorer:
+    """Linear model over hashed n-grams, scoring concurrent requests in batches."""
+
+    def __init__(
+        self,
+        weights: "numpy.ndarray",
+        bias: float,
+        ngrams: int = 2,
+        max_batch_size: int = 64,
+        linger_ms: float = 0.0,
+    ):
+        """
+        Initialize scorer.
+
+        Args:
+            weights: float32 weight per feature bucket (length is a power of two)
+            bias: Log prior odds of spam
+            ngrams: Longest n-gram length the model was trained with
+            max_batch_size: Score immediately once this many texts are pending
+            linger_ms: Wait this long for more texts (0 = next loop iteration)
+        """
+        if np is None:
+            raise RuntimeError(_NUMPY_REQUIRED)
+        if weights.ndim != 1 or len(weights) & (len(weights) - 1):
+            raise ValueError("Spam model weights must be a 1-D array with a power-of-two length")
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = float(bias)
+        self.ngrams = ngrams
+        self.max_batch_size = max_batch_size
+        self.linger = linger_ms / 1000
+
+        self.batches = 0
+        self.scored = 0
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    @property
+    def dim(self) -> int:
+        """Number of feature buckets."""
+        return len(self.weights)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "SpamScorer":
+        """
+        Load a model written by save().
+
+        Args:
+            path: .npz model file
+            **kwargs: Batching options passed to the constructor
+
+        Returns:
+            SpamScorer instance
+        """
+        if np is None:
+            raise RuntimeError(_NUMPY_REQUIRED)
+        with np.load(path, allow_pickle=False) as model:
+            return cls(model["weights"], float(model["bias"]), int(model["ngrams"]), **kwargs)
+
+    def save(self, path: str) -> None:
+        """
+        Write the model as an .npz file.
+
+        Args:
+            path: Destination file
+        """
+        if np is None:
+            raise RuntimeError(_NUMPY_REQUIRED)
+        np.savez(path, weights=self.weights, bias=self.bias, ngrams=self.ngrams)
+
+    def score_batch(self, texts: Sequence[str]) -> "numpy.ndarray":
+        """
+        Score texts synchronously.
+
+        Args:
+            texts: Texts to score
+
+        Returns:
+            Spam probability per text (0.0 - 1.0)
+        """
+        if np is None:
+            raise RuntimeError(_NUMPY_REQUIRED)
+        rows = [features(text, self.dim, self.ngrams) for text in texts]
+        indices = np.concatenate(rows) if rows else np.zeros(0, dtype=np.intp)
+        row_of = np.repeat(np.arange(len(rows)), [len(row) for row in rows])
+        logits = np.bincount(row_of, weights=self.weights[indices], minlength=len(rows))
+        # Logistic, without overflow
+        probabilities: "numpy.ndarray" = 0.5 + 0.5 * np.tanh((logits + self.bias) / 2)
+        return probabilities
+
+    async def score(self, text: str) -> float:
+        """
+        Score a text as part of the next batch.
+
+        Args:
+            text: Text to score
+
+        Returns:
+            Spam probability (0.0 - 1.0)
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[float]" = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.linger:
+                self._flush_handle = loop.call_later(self.linger, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Score every pending text and resolve the waiting callers."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        try:
+            scores = self.score_batch([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.scored += len(batch)
+        for (_, future), score in zip(batch, scores.tolist()):
+            if not future.done():
+                future.set_result(score)
+
+
+def train(
+    texts: Sequence[str],
+    labels: Sequence[bool],
+    dim: int = DEFAULT_DIM,
+    ngrams: int = 2,
+    alpha: float = 1.0,
+) -> SpamScorer:
+    """
+    Fit binarized multinomial Naive Bayes on labelled texts.
+
+    Args:
+        texts: Training texts (subject and message)
+        labels: True for spam
+        dim: Number of feature buckets (a power of two)
+        ngrams: Longest n-gram length
+        alpha: Additive smoothing
+
+    Returns:
+        SpamScorer whose weights are the per-bucket log-likelihood ratios
+    """
+    if np is None:
+        raise RuntimeError(_NUMPY_REQUIRED)
+    spam: "numpy.ndarray" = np.asarray(labels, dtype=bool)
+    if spam.all() or not spam.any():
+        raise ValueError("Training data needs both spam and non-spam submissions")
+
+    counts = np.zeros((2, dim))
+    for text, is_spam in zip(texts, spam):
+        counts[int(is_spam), features(text, dim, ngrams)] += 1  # distinct indices
+    counts += alpha
+    log_probabilities = np.log(counts) - np.log(counts.sum(axis=1, keepdims=True))
+
+    weights = (log_probabilities[1] - log_probabilities[0]).astype(np.float32)
+    bias = float(np.log(spam.sum()) - np.log((~spam).sum()))
+    return SpamScorer(weights, bias, ngrams)
+
+
+# Singleton instance (one per worker process, None when no model is configured)
+_spam_scorer: Optional[SpamScorer] = None
+
+
+def get_spam_scorer() -> Optional[SpamScorer]:
+    """
+    Get or load the spam scorer singleton.
+
+    Also used as a FastAPI dependency.
+
+    Returns:
+        SpamScorer instance, or None if SPAM_MODEL_PATH is not set
+    """
+    global _spam_scorer
+
+    if not settings.spam_model_path:
+        return None
+    if _spam_scorer is None:
+        _spam_scorer = SpamScorer.load(
+            settings.spam_model_path,
+            max_batch_size=settings.spam_batch_max_size,
+            linger_ms=settings.spam_batch_linger_ms,
+        )
+        logger.info(
+            "Spam model loaded",
+            extra={"path": settings.spam_model_path, "features": _spam_scorer.dim},
+        )
+
+    return _spam_scorer
@@ -0,0 +1,168 @@
+"""
+Compiled scanner for SQL injection and XSS patterns.
+
+Every rule is compiled once and paired with the literal substrings it
+cannot match without. A string is case-folded once, the literals are
+located with C-speed substring search, and only rules whose literals are
+present run their (precompiled) regex; rules that are plain literal
+alternations never need one. The scan reports which rule fired, checking
+rules in the same order as the original checks (XSS before SQL).
+
+Non-ASCII text (where case mapping can change length) is scanned on the
+same ``lower()`` (XSS) and
+``upper()`` (SQL) copies the original checks used. The literal prefilter
+is skipped for the four non-ASCII characters that case-insensitive
+regexes match to ASCII letters ("İ", "ı", "ſ", Kelvin sign), so every
+accept/reject decision is preserved.
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+SQL = "sql"
+XSS = "xss"
+
+
+class Rule(NamedTuple):
+    """A detection rule and the literals it requires."""
+
+    name: str
+    category: str
+    pattern: str
+    triggers: Tuple[str, ...]  # lower-case; the rule cannot match unless one is present
+    literal: bool = False  # pattern is exactly the alternation of its triggers
+
+
+RULES: List[Rule] = [
+    Rule("xss_script_block", XSS, r"<script[^>]*>.*?</script>", ("<script",)),
+    Rule("xss_javascript_uri", XSS, r"javascript:", ("javascript:",), literal=True),
+    Rule("xss_event_handler", XSS, r"on\w+\s*=", ("=",)),  # Event handlers like onclick=
+    Rule("xss_iframe", XSS, r"<iframe", ("<iframe",), literal=True),
+    Rule("xss_object", XSS, r"<object", ("<object",), literal=True),
+    Rule("xss_embed", XSS, r"<embed", ("<embed",), literal=True),
+    Rule("sql_quote_boolean", SQL, r"'\s*(?:OR|AND)\s*'", ("'",)),  # ' OR ' / ' AND '
+    Rule("sql_comment", SQL, r"--|#|/\*|\*/", ("--", "#", "/*", "*/"), literal=True),  # Comments
+    Rule("sql_statement_separator", SQL, r";|\|\||&&", (";", "||", "&&"), literal=True),
+    Rule("sql_union_select", SQL, r"\bUNION\b.*\bSELECT\b", ("union",)),  # UNION SELECT
+    Rule(
+        "sql_destructive_keyword",  # Dangerous keywords
+        SQL,
+        r"\bDROP\b|\bDELETE\b|\bINSERT\b",
+        ("drop", "delete", "insert"),
+    ),
+    Rule("sql_exec", SQL, r"\bEXEC\b|\bEXECUTE\b", ("exec",)),  # Execute commands
+]
+
+XSS_RULES = [rule for rule in RULES if rule.category == XSS]
+SQL_RULES = [rule for rule in RULES if rule.category == SQL]
+PATTERNS = {rule.name: rule.pattern for rule in RULES}
+_COMPILED = {rule.name: re.compile(rule.pattern, re.IGNORECASE) for rule in RULES}
+_UPPER_TRIGGERS = {rule.name: tuple(t.upper() for t in rule.triggers) for rule in RULES}
+_CASE_SPECIALS = re.compile("[\u0130\u0131\u017f\u212a]")  # İ ı ſ K(elvin)
+
+# Short fields (name, subject, email) are cheaper to reject with one pass over
+# every trigger than with a substring search per trigger
+_SHORT_TEXT = 256
+_ANY_TRIGGER = re.compile(
+    "|".join(
+        re.escape(trigger)
+        for trigger in sorted({t for rule in RULES for t in rule.triggers}, key=len, reverse=True)
+    )
+)
+
+
+class Threat(NamedTuple):
+    """A rule that matched an input string."""
+
+    rule: str
+    category: str
+    start: int
+
+    @property
+    def pattern(self) -> str:
+        """Source pattern of the rule."""
+        return PATTERNS[self.rule]
+
+
+def _match(rule: Rule, folded: str, triggers: Optional[Tuple[str, ...]]) -> Optional[Threat]:
+    """
+    Check one rule against case-converted text.
+
+    Args:
+        rule: Rule to check
+        folded: Text as the original check saw it (lower() or upper())
+        triggers: Rule literals in the case of ``folded`` (None = skip the prefilter)
+    """
+    if triggers is not None:
+        if rule.literal:
+            positions = [position for position in map(folded.find, triggers) if position >= 0]
+            return Threat(rule.name, rule.category, min(positions)) if positions else None
+
+        for trigger in triggers:
+            if trigger in folded:
+                break
+        else:
+            return None
+
+    match = _COMPILED[rule.name].search(folded)
+    return Threat(rule.name, rule.category, match.start()) if match else None
+
+
+def _first(rules: List[Rule], folded: str, upper: bool = False) -> Optional[Threat]:
+    """Return the first rule (in order) that matches the case-converted text."""
+    # Case-insensitive regexes match these to ASCII letters; literal search would not
+    prefilter = folded.isascii() or _CASE_SPECIALS.search(folded) is None
+    for rule in rules:
+        triggers = None
+        if prefilter:
+            triggers = _UPPER_TRIGGERS[rule.name] if upper else rule.triggers
+        threat = _match(rule, folded, triggers)
+        if threat is not None:
+            return threat
+    return None
+
+
+def scan(text: str) -> Optional[Threat]:
+    """
+    Scan a string against every rule.
+
+    Args:
+        text: Input text
+
+    Returns:
+        The first matching Threat (XSS rules before SQL rules), or None if clean
+    """
+    if text.isascii():
+        folded = text.lower()
+        if len(folded) <= _SHORT_TEXT and _ANY_TRIGGER.search(folded) is None:
+            return None
+        return _first(RULES, folded)
+    return scan_xss(text) or scan_sql(text)
+
+
+def scan_sql(text: str) -> Optional[Threat]:
+    """
+    Scan a string against the SQL injection rules only.
+
+    Args:
+        text: Input text
+
+    Returns:
+        First matching SQL Threat, or None
+    """
+    if text.isascii():
+        return _first(SQL_RULES, text.lower())
+    return _first(SQL_RULES, text.upper(), upper=True)
+
+
+def scan_xss(text: str) -> Optional[Threat]:
+    """
+    Scan a string against the XSS rules only.
+
+    Args:
+        text: Input text
+
+    Returns:
+        First matching XSS Threat, or None
+    """
+    return _first(XSS_RULES, text.lower())
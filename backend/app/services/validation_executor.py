@@ -0,0 +1,242 @@
+"""
+Bounded execution of CPU-bound input validation.
+
+Sanitizing a submission (threat scanning plus HTML stripping) is pure CPU
+work. Run inline it holds the event loop, and with it every other request
+of the worker, /health included. The executor can instead hand it to:
+
+- ``thread``: a small thread pool. The GIL is released every few
+  milliseconds, so the loop keeps serving other requests during a flood.
+- ``process``: a pool of pre-warmed worker processes. Large submissions are
+  validated in true parallel.
+
+Offloading has a fixed cost (a thread hand-off, or pickling for a process),
+so submissions smaller than ``offload_min_chars`` are always validated
+inline. At most ``max_pending`` offloaded validations may be queued or
+running; beyond that, callers are rejected immediately with
+ValidationBusyError (503) instead of piling up behind the pool.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.config import settings
+from app.services.latency import RollingHistogram
+from app.utils.exceptions import ValidationBusyError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STRATEGIES = ("inline", "thread", "process")
+
+
+def _warm_up() -> None:
+    """Process pool initializer: pay imports and regex compilation before the first request."""
+    from app.utils.logger import setup_logging
+
+    setup_logging()
+    import app.services.validation  # noqa: F401
+
+
+class ValidationExecutor:
+    """Runs validation inline, on a thread pool or on a process pool, with backpressure."""
+
+    def __init__(
+        self,
+        strategy: str = "inline",
+        workers: int = 2,
+        max_pending: int = 64,
+        offload_min_chars: int = 512,
+        window_seconds: float = 300.0,
+        slots: int = 5,
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            strategy: "inline", "thread" or "process"
+            workers: Pool size for the thread/process strategies
+            max_pending: Offloaded validations queued or running before rejecting
+            offload_min_chars: Smaller submissions are validated inline
+            window_seconds: Time span covered by the timing percentiles
+            slots: Rotation granularity of the timing window
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown validation strategy: {strategy}")
+        self.strategy = strategy
+        self.workers = workers
+        self.max_pending = max_pending
+        self.offload_min_chars = offload_min_chars
+        self.window_seconds = window_seconds
+
+        self.pending = 0
+        self.rejected = 0
+        self.failed: Dict[str, int] = {name: 0 for name in STRATEGIES}
+        self._timings = {name: RollingHistogram(window_seconds, slots) for name in STRATEGIES}
+        self._pool: Optional[Executor] = None
+
+    async def start(self) -> None:
+        """Create the pool and, for processes, spawn and warm every worker up front."""
+        pool = self._get_pool()
+        if isinstance(pool, ProcessPoolExecutor):
+            loop = asyncio.get_running_loop()
+            started = time.perf_counter()
+            pids = await asyncio.gather(
+                *(loop.run_in_executor(pool, os.getpid) for _ in range(self.workers))
+            )
+            logger.info(
+                "Validation process pool ready",
+                extra={
+                    "workers": len(set(pids)),
+                    "startup_ms": round((time.perf_counter() - started) * 1000, 1),
+                },
+            )
+
+    async def stop(self) -> None:
+        """Shut the pool down, waiting for running validations."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+    async def run(self, func: Callable[..., T], *args: Any, size: int = 0) -> T:
+        """
+        Run a validation function with the configured strategy.
+
+        Args:
+            func: Module-level (picklable) function or classmethod
+            *args: Picklable arguments
+            size: Input size in characters, used to keep small inputs inline
+
+        Returns:
+            Whatever ``func`` returns
+
+        Raises:
+            ValidationBusyError: If max_pending offloaded validations are in flight
+        """
+        if self.strategy == "inline" or size < self.offload_min_chars:
+            return self._run_inline(func, args)
+
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ValidationBusyError(
+                f"Validation queue is full ({self.pending}/{self.max_pending})"
+            )
+
+        self.pending += 1
+        started = time.monotonic()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_pool(), func, *args)
+        except ValueError:
+            raise
+        except Exception:
+            self.failed[self.strategy] += 1
+            raise
+        finally:
+            self.pending -= 1
+            now = time.monotonic()
+            self._timings[self.strategy].record(now - started, now)
+
+    def _run_inline(self, func: Callable[..., T], args: tuple) -> T:
+        started = time.monotonic()
+        try:
+            return func(*args)
+        except ValueError:
+            raise
+        except Exception:
+            self.failed["inline"] += 1
+            raise
+        finally:
+            now = time.monotonic()
+            self._timings["inline"].record(now - started, now)
+
+    def _get_pool(self) -> Optional[Executor]:
+        """Create the pool on first use (lifespan start, or lazily in scripts/tests)."""
+        if self._pool is None and self.strategy == "thread":
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="validation")
+        elif self._pool is None and self.strategy == "process":
+            # spawn: forking a process that already runs an event loop and
+            # thread pools can copy held locks into the child
+            self._pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up,
+            )
+        return self._pool
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe the executor for monitoring endpoints.
+
+        Returns:
+            Dict with configuration, current load and per-strategy timings
+        """
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "offload_min_chars": self.offload_min_chars,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "window_seconds": self.window_seconds,
+            "timings": {
+                name: {**histogram.summary(now), "failed": self.failed[name]}
+                for name, histogram in self._timings.items()
+                if name == "inline" or name == self.strategy
+            },
+        }
+
+
+# Singleton instance (one per worker process, owned by the app lifespan)
+_validation_executor: Optional[ValidationExecutor] = None
+
+
+def get_validation_executor() -> ValidationExecutor:
+    """
+    Get or create the validation executor singleton.
+
+    Also used as a FastAPI dependency.
+
+    Returns:
+        ValidationExecutor instance
+    """
+    global _validation_executor
+
+    if _validation_executor is None:
+        _validation_executor = ValidationExecutor(
+            strategy=settings.validation_strategy,
+            workers=settings.validation_workers,
+            max_pending=settings.validation_max_pending,
+            offload_min_chars=settings.validation_offload_min_chars,
+            window_seconds=settings.latency_window_seconds,
+            slots=settings.latency_window_slots,
+        )
+
+    return _validation_executor
+
+
+async def start_validation_executor() -> ValidationExecutor:
+    """
+    Create the validation executor singleton and warm up its pool.
+
+    Returns:
+        Running ValidationExecutor instance
+    """
+    executor = get_validation_executor()
+    await executor.start()
+    return executor
+
+
+async def stop_validation_executor() -> None:
+    """Shut down the validation executor singleton."""
+    global _validation_executor
+
+    if _validation_executor is not None:
+        await _validation_executor.stop()
+        _validation_executor = None
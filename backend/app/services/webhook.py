@@ -2,44 +2,101 @@
 n8n webhook client for forwarding contact form submissions.
 """
 
+import asyncio
+import importlib.util
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional
 import httpx
 from pydantic import HttpUrl
 from datetime import datetime, timezone
 
-from app.utils.exceptions import WebhookError
-from app.utils.security import generate_webhook_signature
-from app.config import settings
+from app.services.batching import WebhookBatcher
+from app.services.circuit_breaker import CircuitBreaker, create_circuit_breaker
+from app.services.latency import LatencyRecorder, get_latency_recorder
+from app.services.outbound_queue import OutboundGate, create_outbound_gate
+from app.services.retry import RetryPolicy, default_retry_policy
+from app.utils import deadline
+from app.utils.client import current_client
+from app.utils.exceptions import CircuitOpenError, DeadlineExceededError, WebhookError
+from app.utils.security import canonical_json, sign_body
+from app.config import WebhookDestination, settings
 
 logger = logging.getLogger(__name__)
 
+# Smallest time budget worth starting an attempt with
+MIN_ATTEMPT_SECONDS = 0.05
+
 
 class WebhookClient:
     """Client for sending data to n8n webhooks."""
 
-    def __init__(self, webhook_url: HttpUrl, timeout: int = 10, max_retries: int = 3):
+    def __init__(
+        self,
+        webhook_url: HttpUrl,
+        timeout: float = 10,
+        max_retries: int = 3,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        batch_size: int = 1,
+        batch_linger_ms: float = 0,
+        secret: Optional[str] = None,
+        name: str = "primary",
+        latency: Optional[LatencyRecorder] = None,
+        gate: Optional[OutboundGate] = None,
+    ):
         """
         Initialize webhook client.
 
         Args:
             webhook_url: n8n webhook URL
             timeout: Request timeout in seconds
-            max_retries: Maximum number of retry attempts
+            max_retries: Maximum number of attempts (including the first)
+            limits: Connection pool limits (keep-alive sockets are reused across requests)
+            http2: Negotiate HTTP/2 when the optional h2 package is installed
+            retry_policy: Decides which failures are retried and how long to wait
+            breaker: Circuit breaker guarding every attempt
+            batch_size: Submissions grouped per request (1 disables batching)
+            batch_linger_ms: Maximum time a submission waits for its batch to fill
+            secret: Signing secret (defaults to N8N_WEBHOOK_SECRET)
+            name: Destination name used in logs and monitoring
+            latency: Histograms receiving every attempt's latency
+            gate: Caps concurrent calls, queueing the rest fairly per client
         """
+        self.name = name
         self.webhook_url = str(webhook_url)
         self.timeout = timeout
         self.max_retries = max_retries
-
-        # Create async HTTP client
+        self.secret = settings.n8n_webhook_secret if secret is None else secret
+        self.retry_policy = retry_policy or default_retry_policy()
+        self.breaker = breaker or create_circuit_breaker(name)
+        self.latency = latency or get_latency_recorder()
+        self.gate = gate or create_outbound_gate(name)
+        self.batcher: Optional[WebhookBatcher] = None
+        if batch_size > 1:
+            self.batcher = WebhookBatcher(self.send_batch, batch_size, batch_linger_ms)
+
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested for n8n webhook but h2 is not installed")
+            http2 = False
+
+        # Create async HTTP client (pooled, reused for every submission)
         self.client = httpx.AsyncClient(
-            timeout=timeout, headers={"Content-Type": "application/json"}
+            timeout=timeout,
+            limits=limits or httpx.Limits(),
+            http2=http2,
+            headers={"Content-Type": "application/json"},
         )
 
     async def send_contact_form(self, data: Dict[str, Any], request_id: str) -> Dict[str, Any]:
         """
         Send contact form data to n8n webhook.
 
+        When batching is enabled the submission joins the next micro-batch
+        and this call resolves with its own per-item result.
+
         Args:
             data: Sanitized contact form data
             request_id: Unique request identifier
@@ -48,9 +105,101 @@ class WebhookClient:
             Webhook response data
 
         Raises:
-            WebhookError: If webhook request fails
+            WebhookError: If webhook request fails (``payload`` holds what was signed)
+        """
+        return await self.send_payload(self.build_payload(data, request_id))
+
+    async def send_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sign and send an already built payload (e.g. replayed from the dead-letter store).
+
+        Args:
+            payload: Payload produced by build_payload()
+
+        Returns:
+            Webhook response data
+
+        Raises:
+            WebhookError: If webhook request fails (``payload`` holds what was signed)
+        """
+        request_id = payload["request_id"]
+        # Serialized once: these exact bytes are signed and sent
+        body = canonical_json(payload)
+        signature = self._sign(body, request_id)
+
+        if self.batcher is not None:
+            # The batcher raises a separate error per caller, already carrying its payload
+            envelope = {"payload": payload, "signature": signature, "body": body}
+            return await self.batcher.submit(request_id, envelope)
+
+        headers = {}
+        if signature:
+            headers["X-Webhook-Signature"] = signature
+
+        logger.info(
+            "Sending contact form to n8n webhook",
+            extra={
+                "request_id": request_id,
+                "destination": self.name,
+                "webhook_url": self.webhook_url,
+            },
+        )
+
+        try:
+            response: Dict[str, Any] = await self._post(body, headers, request_id)
+        except WebhookError as e:
+            # Raised for this call only: keep the signature inputs for dead-lettering
+            e.payload = payload
+            raise
+        return response
+
+    async def send_batch(self, envelopes: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Send several signed submissions to n8n as one JSON array.
+
+        Each envelope keeps its own payload (with request_id) and signature.
+        The array is assembled from the already serialized payload bytes, so
+        every item carries exactly the bytes its signature was computed over.
+        n8n may answer with a list of per-item results, either directly or
+        under a "results" key; items it does not mention are considered
+        delivered when the batch request itself succeeds.
+
+        Args:
+            envelopes: {"payload": ..., "signature": ..., "body": ...} items
+
+        Returns:
+            Mapping of request_id to that item's result
+
+        Raises:
+            WebhookError: If the batch request fails as a whole
         """
-        payload = {
+        batch_id = f"batch_{envelopes[0]['payload']['request_id']}"
+
+        logger.info(
+            "Sending contact form batch to n8n webhook",
+            extra={"request_id": batch_id, "batch_size": len(envelopes)},
+        )
+
+        body = b"[" + b",".join(_envelope_bytes(envelope) for envelope in envelopes) + b"]"
+        response = await self._post(body, {}, batch_id)
+
+        results = response.get("results") if isinstance(response, dict) else response
+        by_request_id: Dict[str, Dict[str, Any]] = {}
+        if isinstance(results, list):
+            for result in results:
+                if isinstance(result, dict) and result.get("request_id"):
+                    by_request_id[result["request_id"]] = result
+
+        return {
+            envelope["payload"]["request_id"]: by_request_id.get(
+                envelope["payload"]["request_id"], {"success": True}
+            )
+            for envelope in envelopes
+        }
+
+    def build_payload(self, data: Dict[str, Any], request_id: str) -> Dict[str, Any]:
+        """Build the n8n payload for one submission."""
+        return {
             "request_id": request_id,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "form_data": {
@@ -60,30 +209,110 @@ class WebhookClient:
                 "message": data.get("message"),
                 "rating": data.get("rating", 0),
             },
-            "metadata": {"source": "portfolio_contact_form", "version": settings.api_version},
+            "metadata": {
+                "source": "portfolio_contact_form",
+                "version": settings.api_version,
+                **data.get("metadata", {}),
+            },
         }
 
-        # Generate webhook signature if secret is configured
-        headers = {}
-        if settings.n8n_webhook_secret:
-            signature = generate_webhook_signature(payload, settings.n8n_webhook_secret)
-            headers["X-Webhook-Signature"] = signature
-            logger.debug(
-                "Generated webhook signature",
-                extra={"request_id": request_id, "signature": signature[:8] + "..."},
-            )
+    def _sign(self, body: bytes, request_id: str) -> str:
+        """Generate webhook signature over the serialized body if secret is configured."""
+        if not self.secret:
+            return ""
 
-        logger.info(
-            "Sending contact form to n8n webhook",
-            extra={"request_id": request_id, "webhook_url": self.webhook_url},
+        signature = sign_body(body, self.secret)
+        logger.debug(
+            "Generated webhook signature",
+            extra={"request_id": request_id, "signature": signature[:8] + "..."},
         )
+        return signature
+
+    async def _post(self, body: bytes, headers: Dict[str, str], request_id: str) -> Any:
+        """
+        POST a serialized JSON body to n8n once an outbound slot is free.
+
+        The slot is held through retries, so a failing n8n does not receive
+        more concurrent calls than a healthy one. An open breaker fails the
+        call before it queues for a slot.
+
+        Args:
+            body: Canonical JSON request body
+            headers: Extra request headers
+            request_id: Identifier used in logs
+
+        Returns:
+            Decoded webhook response
+
+        Raises:
+            WebhookError: If webhook request fails (WebhookBusyError if no slot came free)
+            DeadlineExceededError: If the request deadline leaves no time for an attempt
+        """
+        try:
+            self.breaker.check()
+        except CircuitOpenError:
+            logger.warning("Webhook circuit open, failing fast", extra={"request_id": request_id})
+            raise
+
+        await self.gate.acquire(current_client())
+        try:
+            return await self._post_with_retries(body, headers, request_id)
+        finally:
+            self.gate.release()
+
+    async def _post_with_retries(
+        self, body: bytes, headers: Dict[str, str], request_id: str
+    ) -> Any:
+        """
+        POST a serialized JSON body to n8n with retries and circuit breaking.
+
+        Args:
+            body: Canonical JSON request body
+            headers: Extra request headers
+            request_id: Identifier used in logs
+
+        Returns:
+            Decoded webhook response
+
+        Raises:
+            WebhookError: If webhook request fails
+            DeadlineExceededError: If the request deadline leaves no time for an attempt
+        """
+        self.retry_policy.record_request()
 
         for attempt in range(1, self.max_retries + 1):
+            # Shrink the attempt timeout to whatever the request deadline allows
+            attempt_timeout = self.timeout
+            time_left = deadline.remaining()
+            if time_left is not None:
+                if time_left <= MIN_ATTEMPT_SECONDS:
+                    logger.warning(
+                        "Webhook deadline exhausted before attempt",
+                        extra={"request_id": request_id, "attempt": attempt},
+                    )
+                    raise DeadlineExceededError("No time left to call the webhook")
+                attempt_timeout = min(self.timeout, time_left)
+
             try:
-                response = await self.client.post(self.webhook_url, json=payload, headers=headers)
+                self.breaker.before_call()
+            except CircuitOpenError:
+                logger.warning(
+                    "Webhook circuit open, failing fast",
+                    extra={"request_id": request_id, "attempt": attempt},
+                )
+                raise
+
+            started = time.monotonic()
+            try:
+                response = await self.client.post(
+                    self.webhook_url, content=body, headers=headers, timeout=attempt_timeout
+                )
 
                 # Check response status
                 response.raise_for_status()
+                finished = time.monotonic()
+                self.breaker.record_success(finished - started)
+                self.latency.record(self.name, "success", attempt, finished - started, finished)
 
                 logger.info(
                     "Webhook request successful",
@@ -97,6 +326,15 @@ class WebhookClient:
                 return response.json() if response.text else {"success": True}
 
             except httpx.HTTPStatusError as e:
+                # n8n answered: only server-side trouble counts against the breaker
+                finished = time.monotonic()
+                if e.response.status_code >= 500 or e.response.status_code == 429:
+                    self.breaker.record_failure(finished - started)
+                else:
+                    self.breaker.record_success(finished - started)
+                outcome = f"http_{e.response.status_code // 100}xx"
+                self.latency.record(self.name, outcome, attempt, finished - started, finished)
+
                 logger.error(
                     "Webhook HTTP error",
                     extra={
@@ -107,39 +345,128 @@ class WebhookClient:
                     },
                 )
 
-                if attempt == self.max_retries:
-                    raise WebhookError(
-                        f"Webhook request failed after {self.max_retries} attempts"
-                    ) from e
+                if not await self._backoff(e, attempt, request_id):
+                    raise WebhookError(f"Webhook request failed after {attempt} attempts") from e
 
             except httpx.RequestError as e:
+                finished = time.monotonic()
+                self.breaker.record_failure(finished - started)
+                outcome = "timeout" if isinstance(e, httpx.TimeoutException) else "network_error"
+                self.latency.record(self.name, outcome, attempt, finished - started, finished)
                 logger.error(
                     "Webhook network error",
                     extra={"request_id": request_id, "attempt": attempt, "error": str(e)},
                 )
 
-                if attempt == self.max_retries:
-                    raise WebhookError(
-                        f"Webhook network error after {self.max_retries} attempts"
-                    ) from e
+                if not await self._backoff(e, attempt, request_id):
+                    raise WebhookError(f"Webhook network error after {attempt} attempts") from e
+
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
 
             except Exception as e:
+                finished = time.monotonic()
+                self.breaker.record_failure(finished - started)
+                self.latency.record(self.name, "error", attempt, finished - started, finished)
                 logger.exception(
                     "Unexpected webhook error", extra={"request_id": request_id, "attempt": attempt}
                 )
-
-                if attempt == self.max_retries:
-                    raise WebhookError("Unexpected error sending webhook") from e
+                raise WebhookError("Unexpected error sending webhook") from e
 
         # Should never reach here
         raise WebhookError("Webhook request failed")
 
+    async def _backoff(self, error: Exception, attempt: int, request_id: str) -> bool:
+        """
+        Apply the retry policy to a failed attempt, sleeping if it allows a retry.
+
+        Args:
+            error: Exception raised by the attempt
+            attempt: Attempt number that failed (1-based)
+            request_id: Unique request identifier
+
+        Returns:
+            True if the caller should retry, False to give up
+        """
+        decision = self.retry_policy.decide(attempt, self.max_retries, error)
+
+        # Skip retries that cannot complete before the request deadline
+        time_left = deadline.remaining()
+        if decision.retry and time_left is not None:
+            if decision.delay + MIN_ATTEMPT_SECONDS >= time_left:
+                decision = decision._replace(retry=False, reason="deadline")
+
+        logger.info(
+            "Webhook retry decision",
+            extra={
+                "request_id": request_id,
+                "attempt": attempt,
+                "retry": decision.retry,
+                "delay": round(decision.delay, 3),
+                "reason": decision.reason,
+            },
+        )
+
+        if decision.retry:
+            await asyncio.sleep(decision.delay)
+        return decision.retry
+
     async def close(self):
         """Close HTTP client connection."""
+        if self.batcher is not None:
+            await self.batcher.stop()
         await self.client.aclose()
 
 
-# Singleton instance
+def _envelope_bytes(envelope: Dict[str, Any]) -> bytes:
+    """Serialize a batch envelope around its pre-serialized payload (keys in canonical order)."""
+    body: bytes = envelope["body"]
+    signature = canonical_json(envelope["signature"])
+    return b'{"payload":' + body + b',"signature":' + signature + b"}"
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_webhook_client(destination: Optional[WebhookDestination] = None) -> WebhookClient:
+    """
+    Build a pooled webhook client from application settings.
+
+    Args:
+        destination: Extra destination to build a client for (None = primary n8n)
+
+    Returns:
+        WebhookClient instance
+    """
+    if destination is None:
+        destination = WebhookDestination(
+            name="primary",
+            url=settings.n8n_webhook_url,
+            secret=settings.n8n_webhook_secret,
+            timeout=None,
+        )
+
+    return WebhookClient(
+        webhook_url=destination.url,
+        timeout=destination.timeout or settings.n8n_timeout,
+        max_retries=settings.n8n_max_retries,
+        limits=httpx.Limits(
+            max_connections=settings.n8n_max_connections,
+            max_keepalive_connections=settings.n8n_max_keepalive_connections,
+            keepalive_expiry=settings.n8n_keepalive_expiry,
+        ),
+        http2=settings.n8n_http2,
+        batch_size=settings.n8n_batch_max_size,
+        batch_linger_ms=settings.n8n_batch_max_linger_ms,
+        secret=destination.secret,
+        name=destination.name,
+    )
+
+
+# Singleton instance (one per worker process, owned by the app lifespan)
 _webhook_client: Optional[WebhookClient] = None
 
 
@@ -147,14 +474,24 @@ def get_webhook_client() -> WebhookClient:
     """
     Get or create webhook client singleton.
 
+    Also used as a FastAPI dependency. The lifespan creates the client at
+    startup; lazy creation covers scripts and tests that run without it.
+
     Returns:
         WebhookClient instance
     """
     global _webhook_client
 
     if _webhook_client is None:
-        _webhook_client = WebhookClient(
-            webhook_url=settings.n8n_webhook_url, timeout=settings.n8n_timeout
-        )
+        _webhook_client = create_webhook_client()
 
     return _webhook_client
+
+
+async def close_webhook_client():
+    """Close the webhook client singleton and release pooled connections."""
+    global _webhook_client
+
+    if _webhook_client is not None:
+        await _webhook_client.close()
+        _webhook_client = None
@@ -0,0 +1,276 @@
+"""
+Re-drive dead-lettered submissions to their webhook destinations.
+
+Usage:
+    python -m app.tools.replay [--concurrency 16] [--rate 50] [--destination primary]
+                               [--max-breaker-wait 300]
+
+Entries are replayed with their original payload (same request_id and
+timestamp, so the same signature), with bounded parallelism and an
+optional requests-per-second cap. Each successful delivery is marked in
+the store as it happens, so an interrupted run resumes where it stopped
+and never re-sends what already went through.
+
+An entry whose destination keeps its circuit breaker open is retried
+until ``--max-breaker-wait`` seconds have passed; the run then stops with
+exit code 1 and leaves that entry and every entry not yet attempted
+pending for the next run.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from typing import Dict, Optional
+
+from app.config import settings
+from app.services.dead_letter import DeadLetter, DeadLetterStore
+from app.services.webhook import WebhookClient, create_webhook_client
+from app.utils.exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class RateShaper:
+    """Spaces request starts evenly to stay under a requests-per-second cap."""
+
+    def __init__(self, rate: float):
+        """
+        Initialize rate shaper.
+
+        Args:
+            rate: Maximum starts per second (0 disables shaping)
+        """
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait for the next free start slot."""
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class Replayer:
+    """Concurrent, resumable replay of a dead-letter store."""
+
+    def __init__(
+        self,
+        store: DeadLetterStore,
+        clients: Dict[str, WebhookClient],
+        concurrency: int = 16,
+        rate: float = 0.0,
+        destination: Optional[str] = None,
+        limit: Optional[int] = None,
+        max_breaker_wait: float = 300.0,
+    ):
+        """
+        Initialize replayer.
+
+        Args:
+            store: Dead-letter store to drain
+            clients: Destination name -> pooled client
+            concurrency: Maximum deliveries in flight
+            rate: Maximum deliveries started per second (0 = unlimited)
+            destination: Only replay entries for this destination
+            limit: Stop after this many entries
+            max_breaker_wait: Seconds an entry may wait for an open breaker before the run stops
+        """
+        self.store = store
+        self.clients = clients
+        self.concurrency = concurrency
+        self.shaper = RateShaper(rate)
+        self.destination = destination
+        self.limit = limit
+        self.max_breaker_wait = max_breaker_wait
+
+        self.total = 0
+        self.replayed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.blocked = 0  # left pending because a breaker stayed open
+        self._started = 0.0
+        self._stopping = False
+
+    async def run(self) -> bool:
+        """
+        Replay every pending entry.
+
+        Returns:
+            True if every attempted entry was delivered and the run was not stopped
+        """
+        self.total = await asyncio.to_thread(self.store.count_pending, self.destination)
+        if self.limit is not None:
+            self.total = min(self.total, self.limit)
+        self._started = time.monotonic()
+
+        queue: "asyncio.Queue[Optional[DeadLetter]]" = asyncio.Queue(maxsize=self.concurrency * 2)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)]
+        reporter = asyncio.create_task(self._report_progress())
+
+        try:
+            await self._produce(queue)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            reporter.cancel()
+            for worker in workers:
+                worker.cancel()
+            self._print_progress(final=True)
+
+        return self.failed == 0 and self.blocked == 0
+
+    async def _produce(self, queue: "asyncio.Queue[Optional[DeadLetter]]") -> None:
+        """Page through the store and feed the workers."""
+        cursor = (0.0, "")
+        produced = 0
+        while self.limit is None or produced < self.limit:
+            page_size = 500 if self.limit is None else min(500, self.limit - produced)
+            page = await asyncio.to_thread(self.store.pending, cursor, page_size, self.destination)
+            if not page:
+                return
+            for entry in page:
+                if self._stopping:
+                    return
+                await queue.put(entry)
+            produced += len(page)
+            cursor = (page[-1].failed_at, page[-1].request_id)
+
+    async def _worker(self, queue: "asyncio.Queue[Optional[DeadLetter]]") -> None:
+        """Deliver entries until the producer signals the end."""
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                return
+            if not self._stopping:  # otherwise drain: the entry stays pending
+                await self._replay(entry)
+
+    async def _replay(self, entry: DeadLetter) -> None:
+        """Re-deliver one entry and record the outcome."""
+        client = self.clients.get(entry.destination)
+        if client is None:
+            self.skipped += 1
+            logger.warning(
+                "Skipping dead letter for unknown destination",
+                extra={"request_id": entry.request_id, "destination": entry.destination},
+            )
+            return
+
+        give_up_at = time.monotonic() + self.max_breaker_wait
+        while True:
+            await self.shaper.wait()
+            try:
+                await client.send_payload(entry.payload)
+            except CircuitOpenError as e:
+                # Destination still down: back off instead of burning the entry
+                remaining = give_up_at - time.monotonic()
+                if remaining <= 0 or self._stopping:
+                    self._stop(entry)
+                    return
+                await asyncio.sleep(min(max(e.retry_after, 1.0), remaining))
+                continue
+            except Exception as e:
+                self.failed += 1
+                await asyncio.to_thread(
+                    self.store.mark_failed, entry.request_id, entry.destination, str(e)
+                )
+                return
+            break
+
+        self.replayed += 1
+        await asyncio.to_thread(self.store.mark_replayed, entry.request_id, entry.destination)
+
+    def _stop(self, entry: DeadLetter) -> None:
+        """Leave an entry pending and stop starting new ones."""
+        self.blocked += 1
+        if not self._stopping:
+            self._stopping = True
+            logger.error(
+                "Circuit breaker stayed open, stopping replay",
+                extra={
+                    "destination": entry.destination,
+                    "max_breaker_wait": self.max_breaker_wait,
+                },
+            )
+
+    async def _report_progress(self) -> None:
+        while True:
+            await asyncio.sleep(1)
+            self._print_progress()
+
+    def _print_progress(self, final: bool = False) -> None:
+        done = self.replayed + self.failed + self.skipped
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        print(
+            f"{'done' if final else 'progress'}: {done}/{self.total} "
+            f"(replayed={self.replayed} failed={self.failed} skipped={self.skipped} "
+            f"blocked={self.blocked}) "
+            f"{done / elapsed:.1f}/s",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+def build_clients() -> Dict[str, WebhookClient]:
+    """
+    Create one pooled client per configured destination.
+
+    Returns:
+        Destination name -> WebhookClient
+    """
+    clients = {"primary": create_webhook_client()}
+    for destination in settings.n8n_destinations:
+        clients[destination.name] = create_webhook_client(destination)
+    return clients
+
+
+async def main(args: argparse.Namespace) -> int:
+    """Run the replay and return the process exit code."""
+    store = DeadLetterStore(args.db)
+    clients = build_clients()
+    replayer = Replayer(
+        store,
+        clients,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        destination=args.destination,
+        limit=args.limit,
+        max_breaker_wait=args.max_breaker_wait,
+    )
+    try:
+        ok = await replayer.run()
+    finally:
+        for client in clients.values():
+            await client.close()
+        store.close()
+    return 0 if ok else 1
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Replay dead-lettered contact submissions.")
+    parser.add_argument("--db", default=settings.dead_letter_path, help="Dead-letter database")
+    parser.add_argument("--concurrency", type=int, default=16, help="Deliveries in flight")
+    parser.add_argument("--rate", type=float, default=0.0, help="Max deliveries/second (0=off)")
+    parser.add_argument("--destination", help="Only replay this destination")
+    parser.add_argument("--limit", type=int, help="Replay at most this many entries")
+    parser.add_argument(
+        "--max-breaker-wait",
+        type=float,
+        default=300.0,
+        help="Stop once a destination's breaker stayed open this many seconds",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,135 @@
+"""
+Train the spam scoring model from exported submissions.
+
+Usage:
+    python -m app.tools.train_spam submissions.jsonl [--output data/spam_model.npz]
+
+The input has one JSON object per line: a submission (either the fields
+themselves or the webhook payload, with them under "form_data") plus a
+"label" of "spam"/"ham" (or true/false, 1/0). Lines without a subject or
+message are rejected. A random holdout share is scored before the model
+is refit on everything and saved; point SPAM_MODEL_PATH at the output
+file and restart the workers to use it.
+"""
+
+import argparse
+import json
+import random
+import sys
+from typing import List, Tuple
+
+from app.config import settings
+from app.services.spam_scorer import DEFAULT_DIM, SpamScorer, train
+
+SPAM_LABELS = {"spam", "true", "1"}
+HAM_LABELS = {"ham", "false", "0"}
+
+
+def submission_text(record: dict) -> str:
+    """
+    Text scored for a submission, as in the contact route.
+
+    Raises:
+        ValueError: If the record has neither a subject nor a message
+    """
+    data = record.get("form_data") or record.get("data") or record
+    if "subject" not in data and "message" not in data:
+        raise ValueError("no subject or message (expected fields or a form_data payload)")
+    return f"{data.get('subject') or ''}\n{data.get('message') or ''}"
+
+
+def load_examples(path: str) -> Tuple[List[str], List[bool]]:
+    """
+    Read labelled submissions.
+
+    Args:
+        path: JSON Lines file
+
+    Returns:
+        (texts, labels) with True for spam
+
+    Raises:
+        ValueError: If a line has no recognizable label or no submission text
+    """
+    texts: List[str] = []
+    labels: List[bool] = []
+    with open(path, encoding="utf-8") as lines:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            label = str(record.get("label", "")).lower()
+            if label not in SPAM_LABELS | HAM_LABELS:
+                raise ValueError(f"{path}:{number}: label must be spam or ham, got {label!r}")
+            try:
+                texts.append(submission_text(record))
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}") from None
+            labels.append(label in SPAM_LABELS)
+    return texts, labels
+
+
+def evaluate(model: SpamScorer, texts: List[str], labels: List[bool], threshold: float) -> dict:
+    """
+    Score a labelled holdout at a threshold.
+
+    Returns:
+        Dict with precision, recall and the number of legitimate submissions dropped
+    """
+    flagged = (model.score_batch(texts) >= threshold).tolist()
+    true_positives = sum(f and spam for f, spam in zip(flagged, labels))
+    false_positives = sum(f and not spam for f, spam in zip(flagged, labels))
+    return {
+        "precision": true_positives / max(true_positives + false_positives, 1),
+        "recall": true_positives / max(sum(labels), 1),
+        "ham_dropped": false_positives,
+    }
+
+
+def main(args: argparse.Namespace) -> int:
+    """Train, evaluate and save the model, returning the process exit code."""
+    texts, labels = load_examples(args.input)
+    print(f"loaded {len(texts)} submissions ({sum(labels)} spam)", file=sys.stderr)
+
+    if args.holdout > 0:
+        order = list(range(len(texts)))
+        random.Random(args.seed).shuffle(order)
+        cut = int(len(order) * (1 - args.holdout))
+        fit, held = order[:cut], order[cut:]
+        model = train(
+            [texts[i] for i in fit], [labels[i] for i in fit], args.dim, args.ngrams, args.alpha
+        )
+        report = evaluate(
+            model, [texts[i] for i in held], [labels[i] for i in held], args.threshold
+        )
+        print(
+            f"holdout ({len(held)}) at threshold {args.threshold}: "
+            f"precision={report['precision']:.3f} recall={report['recall']:.3f} "
+            f"ham_dropped={report['ham_dropped']}",
+            file=sys.stderr,
+        )
+
+    model = train(texts, labels, args.dim, args.ngrams, args.alpha)
+    model.save(args.output)
+    print(f"saved {args.output}", file=sys.stderr)
+    return 0
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Train the contact form spam model.")
+    parser.add_argument("input", help="Labelled submissions (JSON Lines)")
+    parser.add_argument("--output", default="data/spam_model.npz", help="Model file to write")
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help="Feature buckets (2^n)")
+    parser.add_argument("--ngrams", type=int, default=2, help="Longest word n-gram")
+    parser.add_argument("--alpha", type=float, default=1.0, help="Additive smoothing")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share held out for scoring")
+    parser.add_argument(
+        "--threshold", type=float, default=settings.spam_threshold, help="Evaluate at"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Holdout shuffle seed")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
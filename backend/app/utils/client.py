@@ -0,0 +1,35 @@
+"""
+Client identifier of the current request, stored in a context variable.
+
+Set by the contact route and read by downstream code (e.g. the outbound
+webhook queue, which shares n8n capacity fairly between clients) without
+threading it through every call.
+"""
+
+from contextvars import ContextVar, Token
+
+# Empty outside requests (background deliveries, tools)
+_client: ContextVar[str] = ContextVar("request_client", default="")
+
+
+def set_client(identifier: str) -> Token:
+    """
+    Set the client identifier for the current context.
+
+    Args:
+        identifier: Client identifier (e.g. from get_request_identifier)
+
+    Returns:
+        Token for reset_client()
+    """
+    return _client.set(identifier)
+
+
+def reset_client(token: Token) -> None:
+    """Restore the client identifier that was active before set_client()."""
+    _client.reset(token)
+
+
+def current_client() -> str:
+    """Client identifier of the current context ("" if none)."""
+    return _client.get()
@@ -0,0 +1,80 @@
+"""
+Per-request deadline stored in a context variable.
+
+The deadline is set once at the ASGI edge and read by downstream code
+(e.g. the webhook client) to shrink timeouts and skip work that cannot
+finish within the remaining budget.
+"""
+
+import time
+from contextvars import Context, ContextVar, Token, copy_context
+from typing import Optional
+
+from app.utils.exceptions import DeadlineExceededError
+
+# Absolute deadline on the time.monotonic() clock, None when unbounded
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def set_deadline(budget_seconds: float) -> Token:
+    """
+    Start a time budget for the current context.
+
+    An enclosing, tighter deadline is never extended.
+
+    Args:
+        budget_seconds: Seconds from now until the deadline
+
+    Returns:
+        Token for reset_deadline()
+    """
+    deadline = time.monotonic() + budget_seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: Token) -> None:
+    """Restore the deadline that was active before set_deadline()."""
+    _deadline.reset(token)
+
+
+def context_without_deadline() -> Context:
+    """
+    Copy the current context with the deadline removed.
+
+    For tasks that may outlive the request (e.g. background deliveries);
+    other context variables such as the client identifier are kept.
+
+    Returns:
+        Context to pass to asyncio.create_task()
+    """
+    context = copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left in the current budget.
+
+    Returns:
+        Remaining seconds (may be negative), or None if no deadline is set
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(minimum: float = 0.0) -> None:
+    """
+    Ensure at least ``minimum`` seconds of budget are left.
+
+    Raises:
+        DeadlineExceededError: If the budget is (nearly) used up
+    """
+    left = remaining()
+    if left is not None and left <= minimum:
+        raise DeadlineExceededError("Request deadline exceeded")
@@ -2,10 +2,45 @@
 Custom exception classes.
 """
 
+from typing import Any, Dict, Optional
+
 
 class WebhookError(Exception):
     """Raised when n8n webhook request fails."""
 
+    # Payload that was signed for the failed delivery, if one was built
+    payload: Optional[Dict[str, Any]] = None
+
+
+class CircuitOpenError(WebhookError):
+    """Raised when the n8n circuit breaker is open and calls fail fast."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class WebhookBusyError(WebhookError):
+    """Raised when a webhook call waited too long for a free outbound slot."""
+
+    pass
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request's end-to-end time budget is used up."""
+
+    pass
+
+
+class ValidationBusyError(Exception):
+    """Raised when too many submissions are already waiting for validation."""
+
+    pass
+
+
+class IdempotencyConflictError(Exception):
+    """Raised when an idempotency key is reused for a different submission."""
+
     pass
 
 
@@ -5,9 +5,56 @@ Security utilities for webhook signature verification and HMAC generation.
 import hmac
 import hashlib
 import secrets
-from typing import Dict, Any
+from types import ModuleType
+from typing import Dict, Any, Optional
 import json
 
+orjson: Optional[ModuleType]
+try:  # Optional fast encoder
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def canonical_json(payload: Any) -> bytes:
+    """
+    Serialize a payload to canonical JSON bytes.
+
+    Keys are sorted, separators are compact and non-ASCII characters are
+    written as UTF-8 (the same bytes ``JSON.stringify`` produces). The
+    result is both signed and sent as the request body, so the receiver
+    can verify the signature against the raw body.
+
+    Args:
+        payload: JSON-serializable payload
+
+    Returns:
+        UTF-8 encoded canonical JSON
+    """
+    if orjson is not None:
+        body: bytes = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        return body
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+def sign_body(body: bytes, secret: str) -> str:
+    """
+    Generate HMAC-SHA256 signature for an already serialized body.
+
+    Args:
+        body: Exact request body bytes
+        secret: The signing secret
+
+    Returns:
+        Hex-encoded signature (empty string if no secret is configured)
+    """
+    if not secret:
+        return ""
+
+    return hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
 
 def generate_webhook_signature(payload: Dict[str, Any], secret: str) -> str:
     """
@@ -30,15 +77,7 @@ def generate_webhook_signature(payload: Dict[str, Any], secret: str) -> str:
     if not secret:
         return ""
 
-    # Convert payload to canonical JSON string
-    payload_string = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-    payload_bytes = payload_string.encode("utf-8")
-    secret_bytes = secret.encode("utf-8")
-
-    # Generate HMAC-SHA256 signature
-    signature = hmac.new(secret_bytes, payload_bytes, hashlib.sha256).hexdigest()
-
-    return signature
+    return sign_body(canonical_json(payload), secret)
 
 
 def verify_webhook_signature(payload: Dict[str, Any], signature: str, secret: str) -> bool:
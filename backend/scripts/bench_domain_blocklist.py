@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: disposable domain blocklist load time, memory and lookup cost.
+
+Generates a synthetic list of N domains, loads it through DomainBlocklist
+(as a reload would) and compares lookups with the original linear scan
+of a Python list.
+
+Run from the backend directory:
+    python scripts/bench_domain_blocklist.py [N]
+"""
+import random
+import string
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+sys.path.insert(0, ".")
+
+from app.services.domain_blocklist import DomainBlocklist  # noqa: E402
+
+TLDS = ["com", "net", "org", "io", "email", "xyz", "de", "fr", "co.uk"]
+
+
+def synthetic_domains(count: int) -> list:
+    rng = random.Random(42)
+    domains = set()
+    while len(domains) < count:
+        label = "".join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(5, 14)))
+        domains.add(f"{label}.{rng.choice(TLDS)}")
+    return sorted(domains)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    domains = synthetic_domains(count)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as handle:
+        handle.write("\n".join(domains) + "\n")
+        path = handle.name
+
+    load_seconds = min(timeit.repeat(lambda: DomainBlocklist(path=path), number=1, repeat=5))
+
+    tracemalloc.start()
+    blocklist = DomainBlocklist(path=path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"domains:              {len(blocklist):,}")
+    print(f"load time:            {load_seconds * 1000:.1f} ms")
+    print(f"memory per entry:     {current / len(blocklist):.0f} B")
+    print(f"peak while loading:   {peak / 2**20:.1f} MiB")
+
+    hit = f"someone@mx.{domains[len(domains) // 2]}"
+    miss = "someone@mail.example-company.com"
+    legacy = list(domains)
+    number = 20_000
+    for label, address in (("blocked subdomain", hit), ("permanent domain", miss)):
+        domain = address.split("@")[-1].lower()
+        linear = min(timeit.repeat(lambda: domain not in legacy, number=20, repeat=3)) / 20
+        indexed = (
+            min(timeit.repeat(lambda: blocklist.is_blocked(address), number=number, repeat=5))
+            / number
+        )
+        print(
+            f"{label:<21} linear list {linear * 1e6:>9.1f} µs   "
+            f"suffix sets {indexed * 1e6:>6.2f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: near-duplicate signature cost and index lookup latency.
+
+Fills a NearDuplicateIndex with random signatures (the index only sees
+signatures, so this matches real traffic with no collisions), then times
+lookups of unseen and of near-duplicate messages.
+
+Run from the backend directory:
+    python scripts/bench_near_duplicate.py [entries]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, ".")
+
+from app.services.near_duplicate import (  # noqa: E402
+    SIGNATURE_BINS,
+    NearDuplicateIndex,
+    signature,
+)
+
+MESSAGE = ("I would like to discuss a project with you about a new site. " * 17)[:1000]
+VARIANT = MESSAGE.replace("new site", "new shop", 1)
+
+
+def main() -> None:
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    number = 5000
+    cost = min(timeit.repeat(lambda: signature(MESSAGE), number=number, repeat=5)) / number
+    print(f"signature (1000 chars)     {cost * 1e6:8.1f} µs")
+
+    index = NearDuplicateIndex(max_entries=entries)
+    tracemalloc.start()
+    for number in range(entries):
+        index.add(os.urandom(SIGNATURE_BINS * 4), f"req_{number}", 0.0)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"index memory ({entries} entries)", end=" ")
+    print(f"{size / 2**20:.1f} MiB ({size / entries:.0f} B/entry)")
+
+    index.add(signature(MESSAGE), "req_original", 0.0)
+    unseen = signature("A completely different message about hiring you for a mobile app.")
+    similar = signature(VARIANT)
+    assert index.query(unseen, 1.0) is None
+    assert index.query(similar, 1.0).request_id == "req_original"
+
+    number = 20000
+    for label, fingerprint in (("lookup miss", unseen), ("lookup near-duplicate", similar)):
+        cost = min(timeit.repeat(lambda: index.query(fingerprint, 1.0), number=number, repeat=5))
+        print(f"{label:<27}{cost / number * 1e6:8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: outbound webhook queue under a burst from one noisy client.
+
+A simulated n8n serves 10 calls at a time in 20 ms each. One client
+submits 300 calls at once; 20 other clients submit one call each right
+after. Compares how long the quiet clients wait behind the burst with a
+plain FIFO semaphore and with the fair gate, then measures the gate's
+own acquire/release cost.
+
+Run from the backend directory:
+    python scripts/bench_outbound_queue.py
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from app.services.outbound_queue import OutboundGate  # noqa: E402
+
+SLOTS = 10
+CALL_SECONDS = 0.02
+
+
+async def burst(acquire, release) -> None:
+    waits = {"noisy": [], "quiet": []}
+
+    async def call(client: str) -> None:
+        queued = time.monotonic()
+        await acquire(client)
+        waits["noisy" if client == "noisy" else "quiet"].append(time.monotonic() - queued)
+        try:
+            await asyncio.sleep(CALL_SECONDS)
+        finally:
+            release()
+
+    tasks = [asyncio.create_task(call("noisy")) for _ in range(300)]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(call(f"quiet-{n}")) for n in range(20)]
+    await asyncio.gather(*tasks)
+
+    for kind, values in waits.items():
+        print(
+            f"  {kind:<5} wait p50 {statistics.median(values) * 1000:6.0f} ms"
+            f"  max {max(values) * 1000:6.0f} ms"
+        )
+
+
+async def main() -> None:
+    semaphore = asyncio.Semaphore(SLOTS)
+
+    async def fifo_acquire(client: str) -> None:
+        await semaphore.acquire()
+
+    print("FIFO semaphore")
+    await burst(fifo_acquire, semaphore.release)
+
+    gate = OutboundGate(max_in_flight=SLOTS, max_wait=60.0)
+    print("fair gate")
+    await burst(gate.acquire, gate.release)
+
+    gate = OutboundGate(max_in_flight=SLOTS)
+    started = time.perf_counter()
+    for _ in range(100_000):
+        await gate.acquire("client")
+        gate.release()
+    per_call = (time.perf_counter() - started) / 100_000 * 1e6
+    print(f"acquire + release (free slot)  {per_call:6.2f} µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
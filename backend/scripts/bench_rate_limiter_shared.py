@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: shared-memory rate limit table under multi-process contention.
+
+Forks 1 to 8 processes that hit one memory-mapped table at once, like
+gunicorn workers, in two patterns:
+
+- "hot": every process hammers the same 4 client keys (same probe windows,
+  so the window locks serialize them). The allowed total must be exactly
+  4 x limit: any lost update would let extra requests through.
+- "spread": every hit is from a different client (mostly disjoint windows).
+
+The private (per-process) table is timed first as the lock-free baseline.
+
+Run from the backend directory:
+    python scripts/bench_rate_limiter_shared.py [hits_per_process]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from app.services.rate_limiter import RateLimiter, RateLimitStore  # noqa: E402
+
+LIMIT = 100
+
+
+def worker(path: str, pattern: str, hits: int, start, results) -> None:
+    limiter = RateLimiter(limit=LIMIT, period=3600.0, store=RateLimitStore(65536, path=path))
+    prefix = f"{os.getpid()}-"
+    keys = [f"hot-{n % 4}" if pattern == "hot" else f"{prefix}{n}" for n in range(hits)]
+    start.wait()
+
+    started = time.perf_counter()
+    allowed = sum(limiter.hit(key, now=0.0).allowed for key in keys)
+    results.put((time.perf_counter() - started, allowed))
+    limiter.store.close()
+
+
+def run(path: str, pattern: str, processes: int, hits: int):
+    context = multiprocessing.get_context("fork")
+    start, results = context.Event(), context.Queue()
+    workers = [
+        context.Process(target=worker, args=(path, pattern, hits, start, results))
+        for _ in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    time.sleep(0.2)
+    start.set()
+    outcomes = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+    os.unlink(path)
+
+    elapsed = max(seconds for seconds, _ in outcomes)
+    return processes * hits / elapsed, sum(allowed for _, allowed in outcomes)
+
+
+def main() -> None:
+    hits = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    private = RateLimiter(limit=LIMIT, period=3600.0, store=RateLimitStore(65536))
+    keys = [str(n) for n in range(hits)]
+    started = time.perf_counter()
+    for key in keys:
+        private.hit(key, now=0.0)
+    print(f"private table, 1 process      {hits / (time.perf_counter() - started):>12,.0f} hits/s")
+
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    for pattern in ("hot", "spread"):
+        for processes in (1, 2, 4, 8):
+            path = os.path.join(directory, f"bench-rate-limit-{os.getpid()}")
+            rate, allowed = run(path, pattern, processes, hits)
+            check = f"allowed={allowed}" + (" (expected 400)" if pattern == "hot" else "")
+            print(f"shared {pattern:<6} {processes} processes  {rate:>12,.0f} hits/s  {check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HTML stripping cost per field, bleach vs tiered sanitizer.
+
+Run from the backend directory:
+    python scripts/bench_sanitizer.py
+"""
+import sys
+import timeit
+
+import bleach
+
+sys.path.insert(0, ".")
+
+from app.services.sanitizer import strip_markup  # noqa: E402
+
+CORPUS = {
+    "name (plain)": "Jane Smith",
+    "email (plain)": "jane.smith@example.com",
+    "subject (plain)": "Interested in a web development project",
+    "message (plain, 1000 B)": (
+        "I would like to discuss a project with you about a new site. " * 17
+    )[:1000],
+    "message (R&D, x > y)": "Our R&D team thinks x > y, can we talk? " * 5,
+    "message (<b> tags)": "Hi, <b>urgent</b>: please call me back <i>today</i>. " * 5,
+    "message (<p> + link)": '<p>Hello</p><p>See <a href="https://example.com">this</a></p>' * 3,
+}
+
+
+def legacy(text: str) -> str:
+    return bleach.clean(text, tags=[], attributes={}, strip=True)
+
+
+def main() -> None:
+    print(f"{'input':<28}{'bleach µs':>12}{'tiered µs':>12}{'speedup':>10}")
+    for label, text in CORPUS.items():
+        assert strip_markup(text) == legacy(text), label
+        number = 2000
+        before = min(timeit.repeat(lambda: legacy(text), number=number, repeat=5)) / number
+        after = min(timeit.repeat(lambda: strip_markup(text), number=number, repeat=5)) / number
+        print(f"{label:<28}{before * 1e6:>12.2f}{after * 1e6:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark: spam scoring cost per submission, alone and micro-batched.
+
+Trains a model on a synthetic corpus with the default 2^18 feature
+buckets, then times feature hashing and score_batch() for batches of
+1 to 64 submissions.
+
+Run from the backend directory:
+    python scripts/bench_spam_scorer.py
+"""
+import random
+import sys
+import timeit
+
+sys.path.insert(0, ".")
+
+from app.services.spam_scorer import features, train  # noqa: E402
+
+VOCABULARY = (
+    "project website design react fastapi portfolio call week budget hire freelance "
+    "cheap seo ranking google guaranteed backlinks crypto offer click traffic buy now"
+).split()
+
+
+def corpus(size: int, words: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(VOCABULARY, k=words)) for _ in range(size)]
+
+
+def main() -> None:
+    texts = corpus(2000, 60)
+    model = train(texts, [i % 2 == 0 for i in range(len(texts))])
+    message = corpus(1, 170, seed=1)[0]  # roughly 1000 characters
+
+    number = 5000
+    cost = min(timeit.repeat(lambda: features(message), number=number, repeat=5)) / number
+    print(f"feature hashing (1000 chars)  {cost * 1e6:8.1f} µs")
+
+    for size in (1, 8, 64):
+        batch = [message] * size
+        number = 20000 // size
+        cost = min(timeit.repeat(lambda: model.score_batch(batch), number=number, repeat=5))
+        print(f"score_batch({size:>2})                {cost / number / size * 1e6:8.1f} µs/item")
+
+
+if __name__ == "__main__":
+    main()
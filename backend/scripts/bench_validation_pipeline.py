@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: validation cost per contact request, before and after fusing.
+
+"legacy" is the original pipeline: ContactRequest validators with inline
+regexes (re.match + re.search for the name, re.sub for subject/message),
+then InputValidator.sanitize_contact_form(contact.model_dump()).
+"fused" is the current ContactRequest plus InputValidator.sanitize_model.
+
+Run from the backend directory:
+    python scripts/bench_validation_pipeline.py
+"""
+import re
+import sys
+import timeit
+
+from pydantic import field_validator
+
+sys.path.insert(0, ".")
+
+from app.models import ContactRequest  # noqa: E402
+from app.services.validation import InputValidator  # noqa: E402
+
+
+class LegacyContactRequest(ContactRequest):
+    """ContactRequest with the original field validators."""
+
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, v: str) -> str:
+        if not re.match(r"^[\w\s\-']+$", v, re.UNICODE) or re.search(r"\d", v):
+            raise ValueError("Name must contain only letters, spaces, hyphens, and apostrophes")
+        return v.strip()
+
+    @field_validator("subject", "message")
+    @classmethod
+    def sanitize_text(cls, v: str) -> str:
+        v = re.sub(r"\s+", " ", v)
+        return v.strip()
+
+
+PAYLOADS = {
+    "short message": {
+        "name": "Jane Smith",
+        "email": "jane.smith@example.com",
+        "subject": "Project inquiry",
+        "message": "Hello, I would like to discuss a project with you.",
+        "rating": 5,
+    },
+    "1000-char message": {
+        "name": "Jane Smith",
+        "email": "jane.smith@example.com",
+        "subject": "Interested in a web development project",
+        "message": ("I would like to discuss a project with you about a new site. " * 17)[:1000],
+        "rating": 5,
+    },
+    "non-ASCII 1000 chars": {
+        "name": "Zoë Müller-Lüdenscheidt",
+        "email": "zoe@example.de",
+        "subject": "Anfrage zu einem Projekt für Genève",
+        "message": ("Bonjour, je voudrais discuter d’un projet à Genève.\n\n" * 20)[:1000],
+        "rating": 4,
+    },
+}
+
+
+def legacy(payload: dict) -> dict:
+    contact = LegacyContactRequest.model_validate(payload)
+    return InputValidator.sanitize_contact_form(contact.model_dump())
+
+
+def fused(payload: dict) -> dict:
+    contact = ContactRequest.model_validate(payload)
+    return InputValidator.sanitize_model(contact)
+
+
+def main() -> None:
+    print(f"{'payload':<24}{'legacy µs':>12}{'fused µs':>12}{'speedup':>10}")
+    for label, payload in PAYLOADS.items():
+        assert legacy(payload) == fused(payload), label
+        number = 5000
+        before = min(timeit.repeat(lambda: legacy(payload), number=number, repeat=5)) / number
+        after = min(timeit.repeat(lambda: fused(payload), number=number, repeat=5)) / number
+        print(f"{label:<24}{before * 1e6:>12.1f}{after * 1e6:>12.1f}{before / after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: webhook payload serialization and signing per request.
+
+Compares the previous path (canonical json.dumps for the signature, then a
+second json.dumps when httpx encodes ``json=``) with the serialize-once
+path used by WebhookClient (one canonical encode, signed and sent as-is).
+
+Run from the backend directory:
+    python scripts/bench_webhook_payload.py [iterations]
+"""
+import hashlib
+import hmac
+import json
+import sys
+import timeit
+from datetime import datetime, timezone
+
+sys.path.insert(0, ".")
+
+from app.utils import security  # noqa: E402
+from app.utils.security import canonical_json, sign_body  # noqa: E402
+
+SECRET = "benchmark-secret-key"
+PAYLOAD = {
+    "request_id": "0123456789abcdef0123456789abcdef",
+    "timestamp": datetime.now(timezone.utc).isoformat(),
+    "form_data": {
+        "name": "José García-López",
+        "email": "jose@example.com",
+        "subject": "Project inquiry 🎮",
+        "message": "Hello! I'd like to talk about a project. " * 20,
+        "rating": 5,
+    },
+    "metadata": {"source": "portfolio_contact_form", "version": "1.0.0"},
+}
+
+
+def double_encode() -> bytes:
+    """Previous path: sign one serialization, send another."""
+    signed = json.dumps(PAYLOAD, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    hmac.new(SECRET.encode("utf-8"), signed, hashlib.sha256).hexdigest()
+    return json.dumps(PAYLOAD).encode("utf-8")  # What httpx does for json=
+
+
+def encode_once() -> bytes:
+    """Current path: one canonical encode, signed and sent."""
+    body = canonical_json(PAYLOAD)
+    sign_body(body, SECRET)
+    return body
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    encoder = "orjson" if security.orjson is not None else "json (stdlib)"
+
+    baseline = min(timeit.repeat(double_encode, number=iterations, repeat=5)) / iterations
+    current = min(timeit.repeat(encode_once, number=iterations, repeat=5)) / iterations
+
+    print(f"encoder: {encoder}, payload: {len(encode_once())} bytes, {iterations} iterations")
+    print(f"sign + send, double encode: {baseline * 1e6:8.2f} us/request")
+    print(f"sign + send, encode once:   {current * 1e6:8.2f} us/request")
+    print(
+        f"saving:                     {(baseline - current) * 1e6:8.2f} us/request "
+        f"({(1 - current / baseline) * 100:.0f}%)"
+    )
+
+
+if __name__ == "__main__":
+    main()
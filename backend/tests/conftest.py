@@ -7,6 +7,26 @@ import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import AsyncClient, ASGITransport
 from app.main import app
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def fresh_webhook_client(monkeypatch, tmp_path):
+    """Give every test its own webhook client, dead-letter store, caches and rate limits."""
+    monkeypatch.setattr("app.services.webhook._webhook_client", None)
+    monkeypatch.setattr("app.services.dispatcher._webhook_dispatcher", None)
+    monkeypatch.setattr("app.services.dead_letter._dead_letter_store", None)
+    monkeypatch.setattr("app.services.idempotency._idempotency_cache", None)
+    monkeypatch.setattr("app.services.health_probe._health_prober", None)
+    monkeypatch.setattr("app.services.latency._latency_recorder", None)
+    monkeypatch.setattr("app.services.domain_blocklist._domain_blocklist", None)
+    monkeypatch.setattr("app.services.validation_executor._validation_executor", None)
+    monkeypatch.setattr("app.services.near_duplicate._near_duplicate_index", None)
+    monkeypatch.setattr("app.services.spam_scorer._spam_scorer", None)
+    monkeypatch.setattr("app.services.rate_limiter._rate_limiter", None)
+    monkeypatch.setattr("app.services.admission._admission_controller", None)
+    monkeypatch.setattr(settings, "rate_limit_per_hour", 100)
+    monkeypatch.setattr(settings, "dead_letter_path", str(tmp_path / "dead_letters.db"))
 
 
 @pytest.fixture
@@ -0,0 +1,145 @@
+"""
+Tests for adaptive admission control.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import admission
+from app.services.admission import AdmissionController
+from app.services.dispatcher import WebhookDispatcher
+from app.services.validation_executor import ValidationExecutor
+from app.utils.exceptions import CircuitOpenError, ValidationBusyError
+
+
+def test_requests_over_the_limit_are_shed():
+    """Test that a route admits up to its limit, others keep their own."""
+    controller = AdmissionController(initial_limit=2, min_limit=1)
+    contact, other = controller.route("/api/contact"), controller.route("/anything")
+
+    assert controller.try_acquire(contact) is not None
+    assert controller.try_acquire(contact) is not None
+    assert controller.try_acquire(contact) is None
+    assert controller.try_acquire(other) is not None  # shared "*" limit
+
+    disabled = AdmissionController(initial_limit=1, min_limit=1, enabled=False)
+    route = disabled.route("/api/contact")
+    assert all(disabled.try_acquire(route) is not None for _ in range(5))
+
+    snapshot = controller.snapshot()["routes"]
+    assert snapshot["/api/contact"] == {
+        "limit": 2,
+        "in_flight": 2,
+        "admitted": 2,
+        "shed": 1,
+        "decreases": 0,
+    }
+    assert snapshot["*"]["in_flight"] == 1
+
+
+def test_aimd_limit_adapts_to_latency():
+    """Test multiplicative decrease once per window and additive increase."""
+    controller = AdmissionController(
+        initial_limit=20, min_limit=4, max_limit=22, backoff_ratio=0.5, latency_target=1.0
+    )
+    route = controller.route("/api/contact")
+    slow = [controller.try_acquire(route) - 2.0 for _ in range(3)]  # admitted 2 s ago
+
+    controller.release(route, slow[0])
+    assert route.limit == 10
+    controller.release(route, slow[1])  # admitted before the cut: same congestion
+    controller.release(route, slow[2], overloaded=True)
+    assert route.limit == 10
+    assert route.decreases == 1
+
+    for _ in range(10):
+        controller.release(route, controller.try_acquire(route))
+    assert route.limit == pytest.approx(11, abs=0.1)  # +1 per limit's worth of completions
+
+    for _ in range(1000):
+        controller.release(route, controller.try_acquire(route))
+    assert route.limit == 22
+
+    for _ in range(10):
+        controller.release(route, controller.try_acquire(route), overloaded=True)
+    assert route.limit == 4  # floor
+
+
+@pytest.mark.asyncio
+async def test_event_loop_lag_cuts_busy_routes():
+    """Test that a blocked loop shrinks limits of routes with requests in flight."""
+    controller = AdmissionController(initial_limit=10, max_loop_lag=0.02, lag_interval=0.01)
+    contact = controller.route("/api/contact")
+    controller.try_acquire(contact)
+    await controller.start()
+    try:
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # CPU-bound work holding the loop
+        await asyncio.sleep(0.02)
+    finally:
+        await controller.stop()
+
+    assert controller.lag_events >= 1
+    assert contact.decreases >= 1
+    assert controller.route("/other").decreases == 0  # idle: not its fault
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_with_503_but_never_health(
+    async_client, valid_contact_data, monkeypatch
+):
+    """Test the fast 503 for excess contact requests while /health still answers."""
+    controller = AdmissionController(initial_limit=1, min_limit=1)
+    monkeypatch.setattr(admission, "_admission_controller", controller)
+    release = asyncio.Event()
+
+    async def slow_post(*args, **kwargs):
+        await release.wait()
+        return httpx.Response(
+            200, json={"ok": True}, request=httpx.Request("POST", str(settings.n8n_webhook_url))
+        )
+
+    # request(), not post(): the test client is an httpx.AsyncClient too
+    submit = async_client.request("POST", "/api/contact", json=valid_contact_data)
+    with patch.object(httpx.AsyncClient, "post", side_effect=slow_post):
+        first = asyncio.create_task(submit)
+        while not controller.route("/api/contact").in_flight:
+            await asyncio.sleep(0.001)
+
+        shed = await async_client.request("POST", "/api/contact", json=valid_contact_data)
+        health = await async_client.get("/health")
+        stats = await async_client.get("/health/admission")
+        release.set()
+        assert (await first).status_code == 200
+
+    assert shed.status_code == 503
+    assert shed.json()["error_code"] == "OVERLOADED"
+    assert shed.headers["Retry-After"] == "1"
+    assert health.status_code == 200
+    assert stats.json()["routes"]["/api/contact"]["shed"] == 1
+    assert controller.route("/api/contact").in_flight == 0
+
+
+def test_only_local_overload_cuts_the_limit(client, valid_contact_data, monkeypatch):
+    """Test that a fast 503 while n8n is down keeps the limit, a full validation queue cuts it."""
+    controller = AdmissionController(initial_limit=16, min_limit=1)
+    monkeypatch.setattr(admission, "_admission_controller", controller)
+    route = controller.route("/api/contact")
+
+    with patch.object(
+        WebhookDispatcher, "send_contact_form", side_effect=CircuitOpenError("open", 5)
+    ):
+        response = client.post("/api/contact", json=valid_contact_data)
+    assert response.json()["error_code"] == "WEBHOOK_ERROR"
+    assert route.decreases == 0 and route.limit > 16
+
+    with patch.object(ValidationExecutor, "run", side_effect=ValidationBusyError("full")):
+        response = client.post("/api/contact", json=valid_contact_data)
+    assert response.status_code == 503
+    assert response.json()["error_code"] == "VALIDATION_BUSY"
+    assert route.decreases == 1 and route.limit < 16
@@ -68,6 +68,51 @@ def test_contact_form_xss_attempt(client, mock_n8n_webhook):
     assert response.status_code == 400
 
 
+def test_contact_form_disposable_email(client, valid_contact_data, mock_n8n_webhook):
+    """Test that disposable email domains are rejected with 400."""
+    valid_contact_data["email"] = "someone@tempmail.com"
+
+    response = client.post("/api/contact", json=valid_contact_data)
+
+    assert response.status_code == 400
+
+
+def test_contact_form_duplicate_is_replayed(client, valid_contact_data, monkeypatch):
+    """Test that a repeated submission gets the original response without a second send."""
+    calls = []
+
+    async def mock_send(self, data, request_id):
+        calls.append(request_id)
+        return {"success": True}
+
+    monkeypatch.setattr("app.services.webhook.WebhookClient.send_contact_form", mock_send)
+
+    first = client.post("/api/contact", json=valid_contact_data)
+    valid_contact_data["email"] = valid_contact_data["email"].upper()
+    second = client.post("/api/contact", json=valid_contact_data)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json()["request_id"] == first.json()["request_id"]
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert len(calls) == 1
+
+
+def test_contact_form_idempotency_key(client, valid_contact_data, mock_n8n_webhook):
+    """Test explicit Idempotency-Key reuse and conflicts."""
+    headers = {"Idempotency-Key": "submit-42"}
+
+    first = client.post("/api/contact", json=valid_contact_data, headers=headers)
+    valid_contact_data["message"] = "A different message with enough content."
+    conflict = client.post("/api/contact", json=valid_contact_data, headers=headers)
+    fresh = client.post("/api/contact", json=valid_contact_data)
+
+    assert first.status_code == 200
+    assert conflict.status_code == 422
+    assert fresh.status_code == 200
+    assert fresh.json()["request_id"] != first.json()["request_id"]
+
+
 def test_rate_limiting(client, valid_contact_data, mock_n8n_webhook):
     """Test rate limiting enforcement."""
     # Note: Rate limit is 100/hour in test config, so this test
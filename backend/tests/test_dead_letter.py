@@ -0,0 +1,135 @@
+"""
+Tests for the dead-letter store and replay tool.
+"""
+
+import asyncio
+
+import pytest
+import httpx
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.dead_letter import DeadLetterStore
+from app.services.dispatcher import WebhookDispatcher
+from app.services.webhook import WebhookClient
+from app.tools.replay import Replayer
+from app.utils.exceptions import CircuitOpenError, WebhookError
+
+
+def _payload(request_id: str) -> dict:
+    return {"request_id": request_id, "timestamp": "2026-01-01T00:00:00+00:00", "form_data": {}}
+
+
+def test_dead_letter_store_is_idempotent(tmp_path):
+    """Test that re-recording a request keeps one entry per destination."""
+    store = DeadLetterStore(str(tmp_path / "dlq.db"))
+    store.record("req_a", "primary", _payload("req_a"), "down")
+    store.record("req_a", "primary", _payload("req_a"), "still down")
+    store.record("req_a", "archive", _payload("req_a"), "down")
+
+    assert store.count_pending() == 2
+    assert store.count_pending("primary") == 1
+    assert store.pending(destination="primary")[0].error == "still down"
+
+    store.mark_replayed("req_a", "primary")
+    assert [e.destination for e in store.pending()] == ["archive"]
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_dead_letters_signed_payload(tmp_path):
+    """Test that a failed delivery stores the exact payload that was signed."""
+    store = DeadLetterStore(str(tmp_path / "dlq.db"))
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact", max_retries=1  # type: ignore
+    )
+    dispatcher = WebhookDispatcher([client], dead_letters=store)
+
+    with patch.object(client.client, "post", side_effect=httpx.ConnectError("refused")):
+        with pytest.raises(WebhookError):
+            await dispatcher.send_contact_form({"name": "Test User"}, "req_dead")
+
+    [entry] = store.pending()
+    assert entry.request_id == "req_dead"
+    assert entry.destination == "primary"
+    assert entry.payload["form_data"]["name"] == "Test User"
+    assert "timestamp" in entry.payload
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_skips_dead_letter_when_disabled(tmp_path):
+    """Test that queued retries (dead_letter=False) do not dead-letter."""
+    store = DeadLetterStore(str(tmp_path / "dlq.db"))
+    client = MagicMock()
+    client.name = "primary"
+    client.send_contact_form = AsyncMock(side_effect=WebhookError("down"))
+    dispatcher = WebhookDispatcher([client], dead_letters=store)
+
+    with pytest.raises(WebhookError):
+        await dispatcher.send_contact_form({"name": "Test"}, "req_retry", dead_letter=False)
+
+    assert store.count_pending() == 0
+    store.close()
+
+
+def test_sync_failure_answered_with_503_is_not_dead_lettered(client, valid_contact_data):
+    """Test that a failure the client is told to retry leaves nothing to replay."""
+    dead_letter = AsyncMock()
+    with patch.object(WebhookClient, "send_contact_form", side_effect=WebhookError("down")):
+        with patch.object(WebhookDispatcher, "_dead_letter", dead_letter):
+            response = client.post("/api/contact", json=valid_contact_data)
+
+    assert response.status_code == 503
+    dead_letter.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_replay_resumes_and_preserves_signature(tmp_path):
+    """Test concurrent replay, failure bookkeeping and resumption."""
+    store = DeadLetterStore(str(tmp_path / "dlq.db"))
+    for index in range(10):
+        store.record(f"req_{index}", "primary", _payload(f"req_{index}"), "down")
+    store.record("req_x", "gone", _payload("req_x"), "down")
+
+    sent = []
+
+    async def flaky_send(payload):
+        sent.append(payload["request_id"])
+        if payload["request_id"] == "req_3":
+            raise WebhookError("still down")
+        return {"success": True}
+
+    client = MagicMock()
+    client.send_payload = flaky_send
+    replayer = Replayer(store, {"primary": client}, concurrency=4, rate=0)
+
+    assert await replayer.run() is False
+    assert (replayer.replayed, replayer.failed, replayer.skipped) == (9, 1, 1)
+    assert sent.count("req_3") == 1
+
+    # Second run only retries what is still pending
+    sent.clear()
+    client.send_payload = AsyncMock(return_value={"success": True})
+    replayer = Replayer(store, {"primary": client}, destination="primary")
+    assert await replayer.run() is True
+    client.send_payload.assert_awaited_once_with(_payload("req_3"))
+    assert store.count_pending("primary") == 0
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_stops_when_breaker_stays_open(tmp_path):
+    """Test that an open breaker ends the run unsuccessfully with entries left pending."""
+    store = DeadLetterStore(str(tmp_path / "dlq.db"))
+    for index in range(5):
+        store.record(f"req_{index}", "primary", _payload(f"req_{index}"), "down")
+
+    client = MagicMock()
+    client.send_payload = AsyncMock(side_effect=CircuitOpenError("open", retry_after=30))
+    replayer = Replayer(store, {"primary": client}, concurrency=2, max_breaker_wait=0.05)
+
+    assert await asyncio.wait_for(replayer.run(), timeout=5) is False
+    assert replayer.replayed == replayer.failed == 0
+    assert replayer.blocked >= 1
+    assert store.count_pending() == 5
+    store.close()
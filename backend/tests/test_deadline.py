@@ -0,0 +1,137 @@
+"""
+Tests for end-to-end request deadlines.
+"""
+
+import asyncio
+import pytest
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.middleware.deadline import DeadlineMiddleware
+from app.models import ContactRequest
+from app.routes.contact import _process_submission
+from app.services.retry import ExponentialBackoffPolicy
+from app.services.validation_executor import ValidationExecutor
+from app.services.webhook import WebhookClient
+from app.utils import deadline
+from app.utils.exceptions import DeadlineExceededError, WebhookError
+
+
+def _slow_app(route_timeouts=None) -> FastAPI:
+    """Build a tiny app with a slow and a fast route behind the middleware."""
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware, default_timeout=5, route_timeouts=route_timeouts)
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(1)
+        return {"done": True}
+
+    @app.get("/budget")
+    async def budget():
+        return {"remaining": deadline.remaining()}
+
+    return app
+
+
+def test_deadline_middleware_cancels_slow_request():
+    """Test that an exhausted budget turns into a 504 with a specific code."""
+    client = TestClient(_slow_app({"/slow": 0.05}))
+
+    response = client.get("/slow")
+
+    assert response.status_code == 504
+    assert response.json()["error_code"] == "DEADLINE_EXCEEDED"
+
+
+def test_deadline_middleware_exposes_remaining_budget():
+    """Test that routes see the configured budget through the contextvar."""
+    client = TestClient(_slow_app())
+
+    remaining = client.get("/budget").json()["remaining"]
+
+    assert 4 < remaining <= 5
+    assert deadline.remaining() is None  # Reset after the request
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_shrinks_attempt_timeout():
+    """Test that per-attempt timeouts never exceed the remaining budget."""
+    client = WebhookClient(webhook_url="https://test.n8n.webhook.url/contact")  # type: ignore
+
+    with patch.object(client.client, "post") as mock_post:
+        mock_response = MagicMock()
+        mock_response.text = ""
+        mock_response.raise_for_status = MagicMock()
+        mock_post.return_value = mock_response
+
+        token = deadline.set_deadline(2)
+        try:
+            await client.send_contact_form({"name": "Test User"}, "req_test123")
+        finally:
+            deadline.reset_deadline(token)
+
+        assert mock_post.call_args.kwargs["timeout"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_skips_retry_past_deadline(monkeypatch):
+    """Test that a retry whose backoff outlasts the budget is not attempted."""
+    monkeypatch.setattr("app.services.retry.random.uniform", lambda low, high: high)
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact",  # type: ignore
+        retry_policy=ExponentialBackoffPolicy(base_delay=10, max_delay=10),
+    )
+
+    with patch.object(client.client, "post", side_effect=httpx.ConnectError("refused")) as post:
+        token = deadline.set_deadline(0.5)
+        try:
+            with pytest.raises(WebhookError):
+                await client.send_contact_form({"name": "Test User"}, "req_test123")
+        finally:
+            deadline.reset_deadline(token)
+
+        assert post.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_refuses_expired_budget():
+    """Test that no attempt starts once the budget is gone."""
+    client = WebhookClient(webhook_url="https://test.n8n.webhook.url/contact")  # type: ignore
+
+    with patch.object(client.client, "post") as mock_post:
+        token = deadline.set_deadline(0)
+        try:
+            with pytest.raises(DeadlineExceededError):
+                await client.send_contact_form({"name": "Test User"}, "req_test123")
+        finally:
+            deadline.reset_deadline(token)
+
+        mock_post.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_expired_budget_stops_submission_before_delivery():
+    """Test that a budget used up by validation skips the webhook and the queue."""
+    contact = ContactRequest(
+        name="Test User", email="test@example.com", subject="Test", message="Hello there, world"
+    )
+    dispatcher = MagicMock()
+    dispatcher.send_contact_form = AsyncMock()
+    delivery_queue = MagicMock()
+    delivery_queue.enqueue = AsyncMock()
+
+    for queue in (None, delivery_queue):
+        token = deadline.set_deadline(0)
+        try:
+            with pytest.raises(DeadlineExceededError):
+                await _process_submission(
+                    contact, "req_late", dispatcher, queue, ValidationExecutor()
+                )
+        finally:
+            deadline.reset_deadline(token)
+
+    dispatcher.send_contact_form.assert_not_called()
+    delivery_queue.enqueue.assert_not_called()
@@ -0,0 +1,181 @@
+"""
+Tests for the durable delivery queue (queued / 202 Accepted mode).
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.main import app
+from app.services.dead_letter import DeadLetterStore
+from app.services.delivery_queue import ContactSpool, DeliveryQueue, get_delivery_queue
+from app.services.dispatcher import WebhookDispatcher
+from app.tools.replay import Replayer
+from app.utils.exceptions import CircuitOpenError, WebhookError
+
+
+FORM_DATA = {
+    "name": "Test User",
+    "email": "test@example.com",
+    "subject": "Test Subject",
+    "message": "This is a test message with enough content.",
+    "rating": 5,
+}
+
+
+def test_spool_append_claim_ack(tmp_path):
+    """Test that spooled submissions survive reopening and are leased once."""
+    path = str(tmp_path / "spool.db")
+    spool = ContactSpool(path)
+    spool.append_many([("req_a", FORM_DATA), ("req_b", FORM_DATA)])
+    spool.close()
+
+    spool = ContactSpool(path)
+    assert spool.depth() == 2
+
+    first = spool.claim(lease_seconds=60)
+    second = spool.claim(lease_seconds=60)
+    assert first is not None and second is not None
+    assert {first.request_id, second.request_id} == {"req_a", "req_b"}
+    assert first.data == FORM_DATA
+    assert spool.claim(lease_seconds=60) is None  # Both leased
+
+    spool.ack(first.request_id)
+    assert spool.depth() == 1
+    spool.close()
+
+
+def test_spool_retry_and_dead(tmp_path):
+    """Test rescheduling and parking of failed submissions."""
+    spool = ContactSpool(str(tmp_path / "spool.db"))
+    spool.append_many([("req_a", FORM_DATA)])
+    spool.claim(lease_seconds=60)
+
+    assert spool.retry_later("req_a", delay=0, error="boom") == 1
+    entry = spool.claim(lease_seconds=60)
+    assert entry is not None and entry.attempts == 1
+
+    spool.mark_dead("req_a", "boom")
+    assert spool.depth() == 0
+    assert spool.claim(lease_seconds=60) is None
+    spool.close()
+
+
+@pytest.mark.asyncio
+async def test_delivery_queue_forwards_and_retries(tmp_path):
+    """Test that workers deliver spooled submissions and retry failures."""
+    webhook_client = MagicMock()
+    webhook_client.send_contact_form = AsyncMock(
+        side_effect=[WebhookError("down"), {"success": True}]
+    )
+    queue = DeliveryQueue(
+        ContactSpool(str(tmp_path / "spool.db")),
+        webhook_client,
+        workers=1,
+        poll_interval=0.01,
+    )
+    await queue.start()
+
+    await queue.enqueue(FORM_DATA, "req_queued")
+    for _ in range(200):
+        if queue.spool.depth() == 0:
+            break
+        await asyncio.sleep(0.01)
+
+    assert webhook_client.send_contact_form.await_count == 2
+    assert queue.spool.depth() == 0
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_spool_errors(tmp_path):
+    """Test that a failing spool operation does not end the worker."""
+    webhook_client = MagicMock()
+    webhook_client.send_contact_form = AsyncMock(return_value={"success": True})
+    queue = DeliveryQueue(
+        ContactSpool(str(tmp_path / "spool.db")),
+        webhook_client,
+        workers=1,
+        poll_interval=0.01,
+    )
+    claim = queue.spool.claim
+    failures = [sqlite3.OperationalError("database is locked")]
+
+    def flaky_claim(lease_seconds):
+        if failures:
+            raise failures.pop()
+        return claim(lease_seconds)
+
+    queue.spool.claim = flaky_claim  # type: ignore[method-assign]
+    await queue.start()
+
+    await queue.enqueue(FORM_DATA, "req_locked")
+    for _ in range(200):
+        if queue.spool.depth() == 0:
+            break
+        await asyncio.sleep(0.01)
+
+    assert not failures
+    assert queue.spool.depth() == 0
+    webhook_client.send_contact_form.assert_awaited_once()
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_final_attempt_rejected_by_breaker_is_not_dead_lettered(tmp_path):
+    """Test that an open breaker keeps the last attempt spooled, so replay sends nothing."""
+    store = DeadLetterStore(str(tmp_path / "dlq.db"))
+    webhook_client = MagicMock()
+    webhook_client.name = "primary"
+    webhook_client.build_payload.return_value = {"request_id": "req_breaker", "form_data": {}}
+    webhook_client.send_contact_form = AsyncMock(
+        side_effect=[
+            CircuitOpenError("open"),
+            CircuitOpenError("open"),
+            {"success": True},  # n8n recovered
+        ]
+    )
+    queue = DeliveryQueue(
+        ContactSpool(str(tmp_path / "spool.db")),
+        WebhookDispatcher([webhook_client], dead_letters=store),
+        workers=1,
+        max_attempts=1,
+        poll_interval=0.01,
+    )
+    await queue.start()
+
+    await queue.enqueue(FORM_DATA, "req_breaker")
+    for _ in range(200):
+        if queue.spool.depth() == 0:
+            break
+        await asyncio.sleep(0.01)
+
+    assert webhook_client.send_contact_form.await_count == 3
+    assert queue.spool.depth() == 0
+    assert store.count_pending() == 0
+    await queue.stop()
+
+    replay_client = MagicMock()
+    replay_client.send_payload = AsyncMock()
+    assert await Replayer(store, {"primary": replay_client}).run() is True
+    replay_client.send_payload.assert_not_awaited()
+    store.close()
+
+
+def test_contact_form_queued_returns_202(client, valid_contact_data, tmp_path):
+    """Test that queued mode spools the submission and returns 202."""
+    queue = DeliveryQueue(ContactSpool(str(tmp_path / "spool.db")), MagicMock())
+    queue.enqueue = AsyncMock()  # type: ignore[method-assign]
+    app.dependency_overrides[get_delivery_queue] = lambda: queue
+    try:
+        response = client.post("/api/contact", json=valid_contact_data)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 202
+    request_id = response.json()["request_id"]
+    queue.enqueue.assert_awaited_once()
+    assert queue.enqueue.await_args.kwargs["request_id"] == request_id
+    queue.spool.close()
@@ -0,0 +1,116 @@
+"""
+Tests for multi-destination webhook fan-out.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.dispatcher import WebhookDispatcher, parse_quorum
+from app.utils import deadline
+from app.utils.exceptions import DeadlineExceededError, WebhookError
+
+
+def _destination(name: str, delay: float = 0.0, fail: bool = False) -> MagicMock:
+    """Build a fake destination client."""
+    client = MagicMock()
+    client.name = name
+    client.delivered = False
+
+    async def send_contact_form(data, request_id):
+        client.deadline = deadline.remaining()
+        await asyncio.sleep(delay)
+        if fail:
+            raise WebhookError(f"{name} down")
+        client.delivered = True
+        return {"success": True, "from": name}
+
+    client.send_contact_form = send_contact_form
+    client.close = AsyncMock()
+    return client
+
+
+def test_parse_quorum():
+    """Test quorum settings translation."""
+    assert parse_quorum("any", 3) == 1
+    assert parse_quorum("all", 3) == 3
+    assert parse_quorum("2", 3) == 2
+    assert parse_quorum("5", 3) == 3
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_returns_at_fastest_quorum():
+    """Test that "any" returns on the first ack while stragglers keep running."""
+    fast = _destination("primary")
+    slow = _destination("archive", delay=0.05)
+    dispatcher = WebhookDispatcher([fast, slow], quorum="any")
+
+    result = await dispatcher.send_contact_form({"name": "Test"}, "req_fanout")
+
+    assert result["destinations"] == {"primary": {"success": True, "from": "primary"}}
+    assert slow.delivered is False
+    assert dispatcher.snapshot()["background_deliveries"] == 1
+
+    await dispatcher.close()
+    assert slow.delivered is True
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_tolerates_failures_within_quorum():
+    """Test that a failed destination does not fail a reachable quorum."""
+    dispatcher = WebhookDispatcher(
+        [_destination("primary", fail=True), _destination("backup"), _destination("archive")],
+        quorum="2",
+    )
+
+    result = await dispatcher.send_contact_form({"name": "Test"}, "req_fanout")
+
+    assert set(result["destinations"]) == {"backup", "archive"}
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_fails_when_quorum_unreachable():
+    """Test that "all" fails fast once any destination fails."""
+    slow = _destination("archive", delay=0.05)
+    dispatcher = WebhookDispatcher([_destination("primary", fail=True), slow], quorum="all")
+
+    with pytest.raises(WebhookError, match="quorum"):
+        await dispatcher.send_contact_form({"name": "Test"}, "req_fanout")
+
+    await dispatcher.close()
+    assert slow.delivered is True
+
+
+@pytest.mark.asyncio
+async def test_stragglers_run_without_the_request_deadline():
+    """Test that deliveries outliving the response are not bound by its deadline."""
+    slow = _destination("archive", delay=0.05)
+    dispatcher = WebhookDispatcher([_destination("primary"), slow], quorum="any")
+
+    token = deadline.set_deadline(0.01)
+    try:
+        await dispatcher.send_contact_form({"name": "Test"}, "req_fanout")
+    finally:
+        deadline.reset_deadline(token)
+
+    await dispatcher.close()
+    assert slow.deadline is None
+    assert slow.delivered is True
+
+
+@pytest.mark.asyncio
+async def test_deadline_before_quorum_cancels_deliveries():
+    """Test that running out of time before quorum fails and abandons the deliveries."""
+    slow = _destination("archive", delay=0.05)
+    dispatcher = WebhookDispatcher([_destination("primary", delay=0.05), slow], quorum="any")
+
+    token = deadline.set_deadline(0.01)
+    try:
+        with pytest.raises(DeadlineExceededError):
+            await dispatcher.send_contact_form({"name": "Test"}, "req_fanout")
+    finally:
+        deadline.reset_deadline(token)
+
+    assert dispatcher.snapshot()["background_deliveries"] == 0
+    await asyncio.sleep(0.1)
+    assert slow.delivered is False
@@ -0,0 +1,168 @@
+"""
+Tests for the disposable email domain blocklist.
+"""
+
+import asyncio
+import os
+import signal
+import pytest
+
+from app.config import settings
+from app.services.domain_blocklist import (
+    DomainBlocklist,
+    get_domain_blocklist,
+    parse_domains,
+    start_domain_blocklist,
+    stop_domain_blocklist,
+)
+from app.services.validation import InputValidator
+
+
+def _write(path, *domains, mtime=None):
+    path.write_text("\n".join(domains) + "\n", encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_parse_domains_skips_comments_and_normalizes():
+    """Test comments, blank lines, case and trailing dots."""
+    lines = ["# header", "", "  TempMail.COM.  ", "yopmail.com # inline comment", "   "]
+
+    assert parse_domains(lines) == {"tempmail.com", "yopmail.com"}
+
+
+@pytest.mark.parametrize(
+    "address,blocked",
+    [
+        ("someone@tempmail.com", True),
+        ("someone@TEMPMAIL.com", True),
+        ("someone@x.tempmail.com", True),
+        ("someone@a.b.tempmail.com.", True),
+        ("tempmail.com", True),
+        ("someone@nottempmail.com", False),
+        ("someone@tempmail.com.evil.org", False),
+        ("someone@corp.tempmail.com", False),
+        ("someone@x.corp.tempmail.com", False),
+        ("someone@com", False),
+        ("someone@", False),
+    ],
+)
+def test_blocklist_matches_subdomains_and_allowlist(address, blocked):
+    """Test suffix matching with the most specific entry winning."""
+    blocklist = DomainBlocklist(["tempmail.com"], allowed=["corp.tempmail.com"])
+
+    assert blocklist.is_blocked(address) is blocked
+
+
+def test_blocked_subdomain_under_allowed_parent():
+    """Test that a blocked subdomain of an allowed domain is still blocked."""
+    blocklist = DomainBlocklist(["spam.example.com"], allowed=["example.com"])
+
+    assert blocklist.is_blocked("a@spam.example.com") is True
+    assert blocklist.is_blocked("a@example.com") is False
+
+
+def test_bundled_list_is_loaded_by_default():
+    """Test that the shipped list backs InputValidator.validate_email_domain."""
+    blocklist = get_domain_blocklist()
+
+    assert len(blocklist) > 10
+    assert blocklist.loaded_at is not None
+    assert InputValidator.validate_email_domain("a@mailinator.com") is False
+    assert InputValidator.validate_email_domain("a@inbox.mailinator.com") is False
+    assert InputValidator.validate_email_domain("a@gmail.com") is True
+
+
+def test_explicit_domains_keep_subdomain_matching():
+    """Test the blocked_domains override of validate_email_domain."""
+    assert InputValidator.validate_email_domain("a@x.bad.io", ["bad.io"]) is False
+    assert InputValidator.validate_email_domain("a@tempmail.com", ["bad.io"]) is True
+
+
+def test_reload_if_changed_swaps_index(tmp_path):
+    """Test that an mtime change installs the new list."""
+    path = tmp_path / "blocklist.txt"
+    _write(path, "one.example", mtime=1_000_000)
+    blocklist = DomainBlocklist(path=str(path))
+
+    assert blocklist.is_blocked("a@one.example") is True
+    assert blocklist.reload_if_changed() is False
+
+    _write(path, "two.example", mtime=2_000_000)
+    assert blocklist.reload_if_changed() is True
+    assert blocklist.is_blocked("a@one.example") is False
+    assert blocklist.is_blocked("a@two.example") is True
+
+
+def test_failed_reload_keeps_previous_index(tmp_path):
+    """Test that a missing or unreadable file keeps the loaded domains."""
+    path = tmp_path / "blocklist.txt"
+    _write(path, "one.example")
+    blocklist = DomainBlocklist(path=str(path))
+
+    path.unlink()
+    assert blocklist.reload() is False
+    assert blocklist.is_blocked("a@one.example") is True
+
+    path.write_bytes(b"\xff\xfe\xfa not utf-8")
+    assert blocklist.reload() is False
+    assert blocklist.is_blocked("a@one.example") is True
+
+
+def test_missing_file_at_startup_blocks_nothing(tmp_path):
+    """Test that a misconfigured path does not break the contact form."""
+    blocklist = DomainBlocklist(path=str(tmp_path / "missing.txt"))
+
+    assert len(blocklist) == 0
+    assert blocklist.is_blocked("a@tempmail.com") is False
+
+
+@pytest.mark.asyncio
+async def test_watcher_reloads_on_file_change(tmp_path, monkeypatch):
+    """Test that the background watcher picks up edits without a restart."""
+    path = tmp_path / "blocklist.txt"
+    _write(path, "one.example", mtime=1_000_000)
+    monkeypatch.setattr(settings, "disposable_domains_path", str(path))
+    monkeypatch.setattr(settings, "disposable_domains_reload_interval", 0.01)
+
+    blocklist = await start_domain_blocklist()
+    try:
+        _write(path, "two.example", mtime=2_000_000)
+        for _ in range(200):
+            if blocklist.is_blocked("a@two.example"):
+                break
+            await asyncio.sleep(0.01)
+        assert blocklist.is_blocked("a@two.example") is True
+    finally:
+        await stop_domain_blocklist()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP is Unix-only")
+async def test_sighup_forces_reload(tmp_path, monkeypatch):
+    """Test that SIGHUP reloads even when the mtime did not change."""
+    path = tmp_path / "blocklist.txt"
+    _write(path, "one.example", mtime=1_000_000)
+    monkeypatch.setattr(settings, "disposable_domains_path", str(path))
+    monkeypatch.setattr(settings, "disposable_domains_reload_interval", 0)
+
+    blocklist = await start_domain_blocklist()
+    try:
+        _write(path, "two.example", mtime=1_000_000)
+        os.kill(os.getpid(), signal.SIGHUP)
+        for _ in range(200):
+            if blocklist.is_blocked("a@two.example"):
+                break
+            await asyncio.sleep(0.01)
+        assert blocklist.is_blocked("a@two.example") is True
+    finally:
+        await stop_domain_blocklist()
+
+
+def test_contact_form_rejects_disposable_subdomain(client, valid_contact_data):
+    """Test that subdomains of disposable providers are rejected with 400."""
+    valid_contact_data["email"] = "someone@inbox.yopmail.com"
+
+    response = client.post("/api/contact", json=valid_contact_data)
+
+    assert response.status_code == 400
@@ -0,0 +1,87 @@
+"""
+Tests for the background n8n health prober.
+"""
+
+import asyncio
+import pytest
+import httpx
+from unittest.mock import MagicMock, patch
+
+from app.services.health_probe import WebhookHealthProber, get_health_prober
+from app.services.webhook import WebhookClient
+
+
+def _response(status_code: int) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+
+def _prober(**kwargs) -> WebhookHealthProber:
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact", secret="probe-secret"  # type: ignore
+    )
+    return WebhookHealthProber(client, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_prober_keeps_rolling_statistics():
+    """Test status, EWMA latency, success ratio and last error over a window."""
+    prober = _prober(window=3, ewma_alpha=0.5)
+    outcomes = [_response(200), _response(503), httpx.ConnectError("refused"), _response(200)]
+
+    with patch.object(prober.client.client, "post", side_effect=outcomes) as post:
+        for _ in outcomes:
+            await prober.refresh()
+
+    assert "X-Webhook-Signature" in post.call_args.kwargs["headers"]
+    snapshot = prober.snapshot()
+    assert snapshot["healthy"] is True
+    assert snapshot["status_code"] == 200
+    assert snapshot["probe"]["samples"] == 3
+    assert snapshot["probe"]["success_ratio"] == pytest.approx(1 / 3, abs=1e-3)
+    assert snapshot["probe"]["last_error"].startswith("Connection failed")
+    assert snapshot["probe"]["ewma_latency_ms"] >= 0
+    assert "error" not in snapshot
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_probe():
+    """Test that simultaneous on-demand refreshes send a single ping."""
+    prober = _prober()
+
+    async def slow_post(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return _response(200)
+
+    with patch.object(prober.client.client, "post", side_effect=slow_post) as post:
+        results = await asyncio.gather(*[prober.refresh() for _ in range(10)])
+
+    assert post.call_count == 1
+    assert len(set(results)) == 1
+
+
+@pytest.mark.asyncio
+async def test_background_loop_probes_on_interval():
+    """Test that the started prober refreshes without any caller."""
+    prober = _prober(interval=0.01)
+
+    with patch.object(prober.client.client, "post", return_value=_response(200)) as post:
+        await prober.start()
+        await asyncio.sleep(0.05)
+        await prober.stop()
+
+    assert post.call_count >= 2
+    assert not prober.is_stale()
+
+
+def test_health_endpoint_serves_cached_snapshot(client):
+    """Test that polling the endpoint does not ping n8n while results are fresh."""
+    prober = get_health_prober()
+
+    with patch.object(prober.client.client, "post", return_value=_response(200)) as post:
+        responses = [client.get("/api/webhook/health") for _ in range(5)]
+
+    assert post.call_count == 1
+    assert all(r.status_code == 200 and r.json()["healthy"] for r in responses)
+    assert responses[-1].json()["probe"]["samples"] == 1
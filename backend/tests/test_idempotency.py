@@ -0,0 +1,94 @@
+"""
+Tests for idempotency keys and duplicate-submission suppression.
+"""
+
+import asyncio
+import pytest
+
+from app.models import ContactRequest
+from app.services.idempotency import IdempotencyCache, idempotency_key
+from app.utils.exceptions import IdempotencyConflictError
+
+
+def _contact(**overrides) -> ContactRequest:
+    data = {
+        "name": "Test User",
+        "email": "test@example.com",
+        "subject": "Test Subject",
+        "message": "This is a test message with enough content.",
+        "rating": 5,
+    }
+    data.update(overrides)
+    return ContactRequest(**data)
+
+
+def test_content_key_normalizes_submission():
+    """Test that whitespace and email case do not change the content key."""
+    key, fingerprint = idempotency_key(_contact(), None)
+
+    assert key == f"content:{fingerprint}"
+    assert idempotency_key(_contact(subject="  Test   Subject "), None)[0] == key
+    assert idempotency_key(_contact(email="TEST@example.com"), None)[0] == key
+    assert idempotency_key(_contact(rating=4), None)[0] != key
+    assert idempotency_key(_contact(), "abc")[0] == "key:abc"
+
+    with pytest.raises(ValueError):
+        idempotency_key(_contact(), "x" * 256)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_call():
+    """Test that in-flight duplicates collapse onto a single operation."""
+    cache = IdempotencyCache(ttl_seconds=60, max_entries=10)
+    calls = 0
+
+    async def operation():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "sent"
+
+    results = await asyncio.gather(*[cache.run("k", "fp", operation) for _ in range(5)])
+
+    assert calls == 1
+    assert [value for value, _ in results] == ["sent"] * 5
+    assert sum(not replayed for _, replayed in results) == 1
+    assert await cache.run("k", "fp", operation) == ("sent", True)
+
+    with pytest.raises(IdempotencyConflictError):
+        await cache.run("k", "other", operation)
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached_and_entries_are_bounded():
+    """Test that failed operations can be retried and the LRU bound holds."""
+    cache = IdempotencyCache(ttl_seconds=60, max_entries=2)
+
+    async def fail():
+        raise RuntimeError("webhook down")
+
+    async def succeed():
+        return "ok"
+
+    with pytest.raises(RuntimeError):
+        await cache.run("k", "fp", fail)
+    assert await cache.run("k", "fp", succeed) == ("ok", False)
+
+    await cache.run("a", "fp", succeed)
+    await cache.run("b", "fp", succeed)
+    assert len(cache) == 2
+    assert await cache.run("k", "fp", succeed) == ("ok", False)  # Evicted, runs again
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    """Test that results are only replayed within the TTL."""
+    cache = IdempotencyCache(ttl_seconds=0.01, max_entries=10)
+
+    async def succeed():
+        return "ok"
+
+    await cache.run("k", "fp", succeed)
+    await asyncio.sleep(0.02)
+
+    assert await cache.run("k", "fp", succeed) == ("ok", False)
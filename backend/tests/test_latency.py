@@ -0,0 +1,97 @@
+"""
+Tests for rolling webhook latency histograms.
+"""
+
+import pytest
+import httpx
+from unittest.mock import MagicMock, patch
+
+from app.services.latency import (
+    BUCKETS,
+    LatencyRecorder,
+    RollingHistogram,
+    bucket_index,
+    bucket_upper_bound,
+)
+from app.services.webhook import WebhookClient
+from app.services.retry import ExponentialBackoffPolicy
+
+
+def test_bucket_bounds_are_tight():
+    """Test that every value lands in a bucket whose upper bound is within 12.5%."""
+    value = 2e-6
+    while value < 200:
+        upper = bucket_upper_bound(bucket_index(value))
+        assert value <= upper <= value * 1.125
+        value *= 1.07
+
+    assert bucket_index(0) == 0
+    assert bucket_index(1e-9) == 0
+    assert bucket_index(1e6) == BUCKETS - 1
+
+
+def test_histogram_percentiles():
+    """Test percentiles and max of a known distribution."""
+    histogram = RollingHistogram(window_seconds=60, slots=6)
+    for ms in range(1, 101):
+        histogram.record(ms / 1000, now=1000.0)
+
+    summary = histogram.summary(now=1000.0)
+
+    assert summary["count"] == 100
+    assert 50 <= summary["p50_ms"] <= 50 * 1.125
+    assert 90 <= summary["p90_ms"] <= 90 * 1.125
+    assert 99 <= summary["p99_ms"] <= 100
+    assert summary["max_ms"] == 100
+
+
+def test_histogram_window_rotates():
+    """Test that slots older than the window stop counting and are recycled."""
+    histogram = RollingHistogram(window_seconds=60, slots=6)
+    histogram.record(0.5, now=1000.0)
+    histogram.record(0.01, now=1035.0)
+
+    assert histogram.summary(now=1035.0)["count"] == 2
+    assert histogram.summary(now=1065.0) == {
+        "count": 1,
+        "p50_ms": 10.0,
+        "p90_ms": 10.0,
+        "p99_ms": 10.0,
+        "max_ms": 10.0,
+    }
+    assert histogram.summary(now=1200.0)["count"] == 0
+
+    histogram.record(0.2, now=1200.0)
+    assert histogram.summary(now=1200.0)["max_ms"] == 200
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_records_each_attempt():
+    """Test that attempts are split by destination, outcome and attempt number."""
+    recorder = LatencyRecorder()
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact",  # type: ignore
+        retry_policy=ExponentialBackoffPolicy(base_delay=0, max_delay=0),
+        name="backup",
+        latency=recorder,
+    )
+    ok = MagicMock()
+    ok.text = ""
+    ok.raise_for_status = MagicMock()
+
+    with patch.object(client.client, "post", side_effect=[httpx.ConnectError("refused"), ok]):
+        await client.send_contact_form({"name": "Test User"}, "req_latency")
+
+    series = {(s["destination"], s["outcome"], s["attempt"]): s for s in recorder.snapshot()}
+    assert set(series) == {("backup", "network_error", 1), ("backup", "success", 2)}
+    assert series[("backup", "success", 2)]["count"] == 1
+    await client.close()
+
+
+def test_latency_endpoint(client):
+    """Test that the latency endpoint exposes the rolling window."""
+    response = client.get("/api/webhook/latency")
+
+    assert response.status_code == 200
+    assert response.json()["window_seconds"] > 0
+    assert isinstance(response.json()["series"], list)
@@ -4,14 +4,18 @@ Tests the complete flow: Contact form → Backend → n8n → Notifications
 """
 
 import asyncio
+import json
 import pytest
 import httpx
 from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime
 
 from app.config import settings
+from app.utils import security
 from app.utils.security import (
+    canonical_json,
     generate_webhook_signature,
+    sign_body,
     verify_webhook_signature,
 )
 
@@ -44,7 +48,7 @@ class TestN8NIntegration:
 
         # Verify webhook payload structure
         call_args = mock_n8n_webhook.call_args
-        webhook_payload = call_args.kwargs.get("json") or call_args.args[0]
+        webhook_payload = json.loads(call_args.kwargs["content"])
 
         assert "request_id" in webhook_payload
         assert "timestamp" in webhook_payload
@@ -85,9 +89,10 @@ class TestN8NIntegration:
             signature = headers["X-Webhook-Signature"]
             assert len(signature) == 64  # SHA256 hex = 64 chars
 
-            # Verify signature is valid
-            payload = call_args.kwargs.get("json")
-            assert verify_webhook_signature(payload, signature, "test-secret-key")
+            # Verify signature covers the exact body sent
+            body = call_args.kwargs["content"]
+            assert signature == sign_body(body, "test-secret-key")
+            assert verify_webhook_signature(json.loads(body), signature, "test-secret-key")
 
     async def test_webhook_retry_on_failure(self, async_client):
         """Test that webhook retries on failure."""
@@ -108,7 +113,7 @@ class TestN8NIntegration:
             if "n8n" in url_str or "webhook" in url_str:
                 call_count["count"] += 1
                 if call_count["count"] <= 2:
-                    raise httpx.RequestError("Connection failed")
+                    raise httpx.ConnectError("Connection failed")
                 return mock_response
             # Pass through non-webhook calls
             return await original_post(self, url, **kwargs)
@@ -136,7 +141,7 @@ class TestN8NIntegration:
             """Always fail for webhook URLs."""
             url_str = str(url)
             if "n8n" in url_str or "webhook" in url_str:
-                raise httpx.RequestError("Connection failed")
+                raise httpx.ConnectError("Connection failed")
             # Pass through non-webhook calls
             return await original_post(self, url, **kwargs)
 
@@ -199,7 +204,7 @@ class TestN8NIntegration:
 
         # Get webhook payload
         call_args = mock_n8n_webhook.call_args
-        payload = call_args.kwargs.get("json")
+        payload = json.loads(call_args.kwargs["content"])
 
         # Verify n8n workflow can extract these fields
         form_data_payload = payload["form_data"]
@@ -267,7 +272,7 @@ class TestN8NIntegration:
 
         # Verify special characters are preserved
         call_args = mock_n8n_webhook.call_args
-        payload = call_args.kwargs.get("json")
+        payload = json.loads(call_args.kwargs["content"])
 
         assert payload["form_data"]["name"] == "José García-López"
         assert "🎮" in payload["form_data"]["subject"]
@@ -359,6 +364,15 @@ class TestWebhookSecurity:
 
         assert signature == ""
 
+    def test_canonical_json_is_encoder_independent(self, monkeypatch):
+        """Test that the fast encoder and the stdlib fallback produce identical bytes."""
+        payload = {"b": {"z": 1, "a": [1.5, None, True]}, "a": 'José 🎮 "q" </script>'}
+        fast = canonical_json(payload)
+
+        monkeypatch.setattr(security, "orjson", None)
+        assert canonical_json(payload) == fast
+        assert fast.startswith(b'{"a":"Jos\xc3\xa9')
+
     def test_verification_without_secret_passes(self):
         """Test that verification passes when no secret is configured."""
         payload = {"name": "Eve"}
@@ -0,0 +1,158 @@
+"""
+Tests for near-duplicate submission detection.
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from app.config import settings
+from app.services.dispatcher import WebhookDispatcher
+from app.services.near_duplicate import NearDuplicateIndex, signature, similarity
+from app.utils.exceptions import CircuitOpenError
+
+SPAM = (
+    "Get cheap SEO services for your website today! We guarantee first page ranking "
+    "on Google within 30 days or your money back. Our team of certified experts has "
+    "helped more than five hundred small businesses grow their organic traffic. "
+    "Visit our site for a free audit and a personalised growth plan."
+)
+SPAM_VARIANT = SPAM.replace("cheap", "affordable")
+UNRELATED = (
+    "Hi, I saw your portfolio and would love to discuss a freelance React project "
+    "for our startup. Are you available for a call next week?"
+)
+
+
+def _accept(index, text, request_id, now):
+    """Check a submission, then index it as the contact route does once it is accepted."""
+    fingerprint, match = index.check(text, now=now)
+    index.add(fingerprint, request_id, now)
+    return match
+
+
+def test_similarity_separates_variants_from_unrelated_text():
+    """Test the MinHash estimate on an edited copy and on a different message."""
+    original = signature(SPAM)
+
+    assert similarity(original, signature(SPAM)) == 1.0
+    assert similarity(original, signature(SPAM.upper() + " !!!")) == 1.0
+    assert similarity(original, signature(SPAM_VARIANT)) >= 0.6
+    assert similarity(original, signature(UNRELATED)) < 0.2
+
+
+def test_short_texts_have_no_signature():
+    """Test that messages below min_words are never compared."""
+    assert signature("Hello there, quick question", min_words=8) is None
+    assert NearDuplicateIndex(min_words=8).check("Hello there, quick question") == (None, None)
+
+
+def test_index_reports_newest_similar_submission():
+    """Test that lookups find the newest similar submission and do not index it."""
+    index = NearDuplicateIndex(threshold=0.6)
+
+    assert _accept(index, SPAM, "req_1", 0.0) is None
+    assert _accept(index, UNRELATED, "req_2", 1.0) is None
+    match = _accept(index, SPAM_VARIANT, "req_3", 2.0)
+    assert match.request_id == "req_1"
+    assert match.similarity >= 0.6
+    assert match.age_seconds == 2.0
+    assert _accept(index, SPAM, "req_4", 3.0).request_id == "req_3"
+    assert len(index) == 4
+
+    assert index.check(SPAM_VARIANT, now=4.0)[1].request_id == "req_4"
+    assert len(index) == 4
+
+
+def test_entries_expire_after_ttl():
+    """Test time-based eviction."""
+    index = NearDuplicateIndex(ttl_seconds=60)
+    _accept(index, SPAM, "req_1", 0.0)
+
+    assert _accept(index, SPAM, "req_2", 30.0).request_id == "req_1"
+    assert _accept(index, SPAM, "req_3", 100.0) is None
+    assert len(index) == 1
+
+
+def test_max_entries_evicts_oldest_and_cleans_buckets():
+    """Test the entry cap and that evicted ids leave every LSH bucket."""
+    index = NearDuplicateIndex(max_entries=3)
+    for number in range(10):
+        _accept(index, f"{SPAM} campaign {number}", f"req_{number}", float(number))
+
+    assert len(index) == 3
+    live = set(index._entries)
+    for band in index._bands:
+        for bucket in band.values():
+            ids = bucket if isinstance(bucket, list) else [bucket]
+            assert set(ids) <= live
+            assert len(ids) > 1 or not isinstance(bucket, list)
+    assert _accept(index, SPAM, "req_new", 10.0).request_id == "req_9"
+
+
+def _submit(client, valid_contact_data, message):
+    with patch.object(httpx.AsyncClient, "post") as post:
+        post.return_value = httpx.Response(
+            200, json={"ok": True}, request=httpx.Request("POST", str(settings.n8n_webhook_url))
+        )
+        response = client.post(
+            "/api/contact", json={**valid_contact_data, "subject": "Offer", "message": message}
+        )
+    return response, post
+
+
+def test_near_duplicate_is_flagged_in_webhook_metadata(client, valid_contact_data, monkeypatch):
+    """Test that flag mode forwards the submission with near-duplicate metadata."""
+    monkeypatch.setattr(settings, "near_duplicate_action", "flag")
+
+    first, post = _submit(client, valid_contact_data, SPAM)
+    assert "near_duplicate" not in json.loads(post.call_args.kwargs["content"])["metadata"]
+
+    second, post = _submit(client, valid_contact_data, SPAM_VARIANT)
+    assert second.status_code == 200
+    metadata = json.loads(post.call_args.kwargs["content"])["metadata"]
+    assert metadata["source"] == "portfolio_contact_form"
+    assert metadata["near_duplicate"]["of"] == first.json()["request_id"]
+    assert metadata["near_duplicate"]["similarity"] >= 0.6
+
+
+def test_near_duplicate_is_rejected_in_reject_mode(client, valid_contact_data, monkeypatch):
+    """Test that reject mode answers 400 without calling n8n."""
+    monkeypatch.setattr(settings, "near_duplicate_action", "reject")
+
+    _submit(client, valid_contact_data, SPAM)
+    response, post = _submit(client, valid_contact_data, SPAM_VARIANT)
+
+    assert response.status_code == 400
+    post.assert_not_called()
+
+
+def test_retry_after_503_does_not_match_itself(client, valid_contact_data, monkeypatch):
+    """Test that a submission is only indexed once accepted, so its retry goes through."""
+    monkeypatch.setattr(settings, "near_duplicate_action", "reject")
+    send = AsyncMock(side_effect=[CircuitOpenError("open", retry_after=1), {"success": True}])
+    payload = {**valid_contact_data, "subject": "Offer", "message": SPAM}
+
+    with patch.object(WebhookDispatcher, "send_contact_form", send):
+        failed = client.post("/api/contact", json=payload)
+        retried = client.post("/api/contact", json=payload)
+
+    assert failed.status_code == 503
+    assert retried.status_code == 200
+    assert "near_duplicate" not in send.await_args.kwargs["data"].get("metadata", {})
+
+    # Once accepted it is indexed like any other submission
+    response, post = _submit(client, valid_contact_data, SPAM_VARIANT)
+    assert response.status_code == 400
+
+
+def test_detection_can_be_turned_off(client, valid_contact_data, monkeypatch):
+    """Test that "off" skips detection entirely."""
+    monkeypatch.setattr(settings, "near_duplicate_action", "off")
+
+    _submit(client, valid_contact_data, SPAM)
+    response, post = _submit(client, valid_contact_data, SPAM_VARIANT)
+
+    assert response.status_code == 200
+    assert "near_duplicate" not in json.loads(post.call_args.kwargs["content"])["metadata"]
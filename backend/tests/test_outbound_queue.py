@@ -0,0 +1,204 @@
+"""
+Tests for the bounded, fair outbound webhook queue.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.outbound_queue import OutboundGate
+from app.services.webhook import WebhookClient
+from app.utils import deadline
+from app.utils.client import reset_client, set_client
+from app.utils.exceptions import CircuitOpenError, DeadlineExceededError, WebhookBusyError
+
+
+async def _queue(gate, clients, served):
+    """Start one waiter per client identifier, recording the order they get a slot."""
+
+    async def wait(client):
+        await gate.acquire(client)
+        served.append(client)
+
+    tasks = [asyncio.create_task(wait(client)) for client in clients]
+    await asyncio.sleep(0)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_cap_hands_slots_over_without_exceeding_it():
+    """Test that a release passes the slot to a waiter instead of freeing it."""
+    gate = OutboundGate(max_in_flight=2)
+    await gate.acquire("a")
+    await gate.acquire("b")
+    served = []
+    tasks = await _queue(gate, ["c"], served)
+
+    assert gate.in_flight == 2 and gate.depth == 1 and served == []
+    gate.release()
+    await asyncio.gather(*tasks)
+    assert served == ["c"]
+    assert gate.in_flight == 2 and gate.depth == 0
+
+    gate.release()
+    gate.release()
+    assert gate.in_flight == 0
+    assert gate.snapshot()["queued_clients"] == 0  # idle clients keep no state
+
+
+@pytest.mark.asyncio
+async def test_noisy_client_cannot_starve_others():
+    """Test fair order: late clients get their share instead of queueing behind a burst."""
+    gate = OutboundGate(max_in_flight=1, weights={"partner": 2.0})
+    await gate.acquire("noisy")
+    served = []
+    tasks = await _queue(gate, ["noisy"] * 6, served)
+    tasks += await _queue(gate, ["quiet", "partner", "partner", "partner", "partner"], served)
+
+    for _ in range(len(tasks)):
+        gate.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    # Finish tags: noisy 1..6, quiet 1, partner (weight 2) 0.5..2 - ties go first come
+    assert served == [
+        "partner",
+        "noisy",
+        "quiet",
+        "partner",
+        "partner",
+        "noisy",
+        "partner",
+        "noisy",
+        "noisy",
+        "noisy",
+        "noisy",
+    ]
+    assert gate.snapshot()["max_queue_depth"] == 11
+
+
+@pytest.mark.asyncio
+async def test_wait_is_bounded_by_timeout_and_deadline():
+    """Test WebhookBusyError after max_wait and DeadlineExceededError within the deadline."""
+    gate = OutboundGate(max_in_flight=1, max_wait=0.02)
+    await gate.acquire()
+
+    with pytest.raises(WebhookBusyError):
+        await gate.acquire("client")
+
+    token = deadline.set_deadline(0.01)
+    try:
+        with pytest.raises(DeadlineExceededError):
+            await gate.acquire("client")
+    finally:
+        deadline.reset_deadline(token)
+
+    waiter = asyncio.create_task(gate.acquire("cancelled"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    snapshot = gate.snapshot()
+    assert snapshot["timeouts"] == 2
+    assert snapshot["queue_depth"] == 0 and snapshot["queued_clients"] == 0
+    assert snapshot["wait"]["count"] == 4
+
+    gate.release()  # nobody waiting any more: the slot is freed
+    assert gate.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_caps_concurrent_calls():
+    """Test that a burst reaches n8n at most max_in_flight calls at a time."""
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact",  # type: ignore
+        gate=OutboundGate(max_in_flight=2),
+    )
+    running, peak = 0, 0
+
+    async def slow_post(*args, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return httpx.Response(200, json={"ok": True}, request=httpx.Request("POST", args[0]))
+
+    async def submit(number):
+        token = set_client(f"10.0.0.{number % 3}")
+        try:
+            return await client.send_contact_form({"name": "Test"}, f"req_{number}")
+        finally:
+            reset_client(token)
+
+    with patch.object(client.client, "post", side_effect=slow_post):
+        results = await asyncio.gather(*(submit(number) for number in range(8)))
+
+    assert results == [{"ok": True}] * 8
+    assert peak == 2
+    assert client.gate.snapshot()["queued"] == 6
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_before_queueing_for_a_slot():
+    """Test that an open breaker rejects a call without waiting in the gate."""
+    breaker = CircuitBreaker(minimum_calls=1)
+    breaker.record_failure(0.1)
+    gate = OutboundGate(max_in_flight=1, max_wait=5)
+    await gate.acquire("10.0.0.1")  # every slot taken
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact",  # type: ignore
+        breaker=breaker,
+        gate=gate,
+    )
+
+    with pytest.raises(CircuitOpenError):
+        await asyncio.wait_for(client.send_contact_form({"name": "Test"}, "req_open"), 1)
+
+    assert gate.snapshot()["queued"] == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_queues_under_its_main_client():
+    """Test that a batch waits for a slot as the client with most items in it."""
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact",  # type: ignore
+        batch_size=3,
+        batch_linger_ms=1000,
+    )
+
+    async def submit(identifier, request_id):
+        token = set_client(identifier)
+        try:
+            return await client.send_contact_form({"name": "Test"}, request_id)
+        finally:
+            reset_client(token)
+
+    response = httpx.Response(200, text="", request=httpx.Request("POST", client.webhook_url))
+    with (
+        patch.object(client.client, "post", return_value=response),
+        patch.object(client.gate, "acquire", wraps=client.gate.acquire) as acquire,
+    ):
+        await asyncio.gather(
+            submit("10.0.0.1", "req_a"), submit("10.0.0.2", "req_b"), submit("10.0.0.2", "req_c")
+        )
+
+    acquire.assert_called_once_with("10.0.0.2")
+    await client.close()
+
+
+def test_webhook_queue_endpoint(client):
+    """Test the queue metrics endpoint."""
+    response = client.get("/api/webhook/queue")
+
+    assert response.status_code == 200
+    primary = response.json()["destinations"][0]
+    assert primary["name"] == "primary"
+    assert primary["in_flight"] == 0
+    assert set(primary["wait"]) >= {"count", "p50_ms", "p99_ms"}
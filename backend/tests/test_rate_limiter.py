@@ -0,0 +1,248 @@
+"""
+Tests for the memory-bounded GCRA rate limiter.
+"""
+
+import multiprocessing
+from unittest.mock import patch
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from app.config import settings
+from app.middleware.rate_limit import get_request_identifier
+from app.services.rate_limiter import RateLimiter, RateLimitStore, parse_address
+
+
+def test_burst_then_even_refill():
+    """Test GCRA: `limit` requests at once, then one per period/limit."""
+    limiter = RateLimiter(limit=3, period=3600.0)
+
+    decisions = [limiter.hit("1.2.3.4", now=0.0) for _ in range(4)]
+
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert [d.remaining for d in decisions[:3]] == [2, 1, 0]
+    assert decisions[3].retry_after == pytest.approx(1200.0)
+    assert decisions[2].reset_after == pytest.approx(3600.0)
+
+    assert not limiter.hit("1.2.3.4", now=1199.0).allowed
+    assert limiter.hit("1.2.3.4", now=1200.0).allowed
+    assert limiter.hit("5.6.7.8", now=1200.0).allowed  # other clients are independent
+    assert limiter.hit("1.2.3.4", now=1200.0 + 3600.0).remaining == 2  # fully idle again
+
+
+def test_rejected_requests_do_not_consume_quota():
+    """Test that hammering while limited does not push the retry time back."""
+    limiter = RateLimiter(limit=1, period=60.0)
+    limiter.hit("client", now=0.0)
+
+    for second in range(1, 60):
+        assert not limiter.hit("client", now=float(second)).allowed
+    assert limiter.hit("client", now=60.0).allowed
+    assert limiter.snapshot()["rejected"] == 59
+
+
+def test_spoofed_flood_keeps_memory_flat():
+    """Test that distinct keys beyond capacity recycle slots instead of growing."""
+    store = RateLimitStore(capacity=1024)
+    limiter = RateLimiter(limit=5, period=3600.0, store=store)
+    memory = store.memory_bytes
+
+    for number in range(20_000):
+        limiter.hit(f"10.{number >> 16}.{(number >> 8) & 255}.{number & 255}", now=0.0)
+
+    snapshot = limiter.snapshot()
+    assert snapshot["memory_bytes"] == memory == (1024 + 7) * 16  # + probe overflow slots
+    assert snapshot["occupied"] <= 1024 + 7
+    assert snapshot["evictions"] == 20_000 - snapshot["occupied"]
+    assert snapshot["allowed"] == 20_000
+
+
+def test_idle_slots_are_reused_without_eviction():
+    """Test that keys past their TAT give up their slot for free."""
+    limiter = RateLimiter(limit=2, period=10.0, store=RateLimitStore(capacity=64))
+    for number in range(32):
+        limiter.hit(f"first-{number}", now=0.0)
+    evicted, occupied = limiter.store.evictions, limiter.store.occupied
+
+    for number in range(32):
+        limiter.hit(f"second-{number}", now=100.0)
+
+    assert limiter.store.evictions == evicted
+    assert limiter.store.occupied >= occupied
+
+
+def test_parse_address():
+    """Test address parsing for prefix masking."""
+    assert parse_address("203.0.113.7") == (32, 0xCB007107)
+    assert parse_address("::ffff:203.0.113.7") == (32, 0xCB007107)
+    assert parse_address("2001:db8::1") == (128, 0x20010DB8 << 96 | 1)
+    for identifier in ("testclient", "1.2.3", "fe80::1%eth0", "", "1.2.3.4\x00"):
+        assert parse_address(identifier) is None
+
+
+def test_addresses_are_grouped_by_prefix():
+    """Test that rotating addresses inside a client's prefix shares one quota."""
+    limiter = RateLimiter(limit=2, period=3600.0)
+
+    assert limiter.hit("2001:db8:0:1::1", now=0.0).allowed
+    assert limiter.hit("2001:db8:0:1:ffff::2", now=0.0).allowed
+    assert not limiter.hit("2001:db8:0:1:dead:beef::3", now=0.0).allowed  # same /64
+    assert limiter.hit("2001:db8:0:2::1", now=0.0).allowed  # next /64
+    assert limiter.hit("203.0.113.7", now=0.0).allowed
+    assert limiter.hit("203.0.113.8", now=0.0).allowed  # IPv4: exact by default
+
+    by_24 = RateLimiter(limit=1, period=3600.0, prefixes=(24, 48))
+    assert by_24.hit("203.0.113.7", now=0.0).allowed
+    assert not by_24.hit("203.0.113.200", now=0.0).allowed
+    assert by_24.hit("203.0.114.7", now=0.0).allowed
+
+
+def test_network_limit_is_checked_with_the_client_limit():
+    """Test the hierarchical limit: all levels pass and count, or none counts."""
+    limiter = RateLimiter(limit=2, period=3600.0, network_limit=3)
+
+    assert limiter.hit("198.51.100.1", now=0.0).remaining == 1
+    assert limiter.hit("198.51.100.2", now=0.0).remaining == 1  # network: 1 left
+    assert limiter.hit("198.51.100.2", now=0.0).remaining == 0
+
+    rejected = limiter.hit("198.51.100.3", now=0.0)  # own quota untouched, network's used up
+    assert not rejected.allowed
+    assert rejected.limit == 3
+    assert rejected.retry_after == pytest.approx(1200.0)
+    assert limiter.hit("198.51.101.1", now=0.0).allowed  # other /24
+
+    # The network rejection did not consume the client's quota
+    assert limiter.hit("198.51.100.3", now=1200.0).remaining == 0  # network's refill
+    assert limiter.hit("198.51.100.3", now=2400.0).allowed
+
+    snapshot = limiter.snapshot()
+    assert snapshot["network"] == {"limit": 3, "ipv4_prefix": 24, "ipv6_prefix": 48, "rejected": 1}
+    assert snapshot["rejected"] == 1
+
+
+def test_shared_table_is_seen_by_every_store_on_the_path(tmp_path):
+    """Test two workers' stores (and a restarted one) enforcing one quota."""
+    path = str(tmp_path / "rate-limit")
+    first = RateLimiter(limit=3, period=3600.0, store=RateLimitStore(1024, path=path))
+    second = RateLimiter(limit=3, period=3600.0, store=RateLimitStore(1024, path=path))
+
+    assert first.hit("client", now=0.0).remaining == 2
+    assert second.hit("client", now=0.0).remaining == 1
+    first.store.close()
+
+    restarted = RateLimiter(limit=3, period=3600.0, store=RateLimitStore(1024, path=path))
+    assert restarted.hit("client", now=0.0).remaining == 0
+    assert not second.hit("client", now=0.0).allowed
+    assert restarted.snapshot()["occupied"] == 1
+    assert restarted.snapshot()["shared"] is True
+
+    resized = RateLimiter(limit=3, period=3600.0, store=RateLimitStore(2048, path=path))
+    assert resized.hit("client", now=0.0).remaining == 2  # other layout: fresh table
+    assert not second.hit("client", now=0.0).allowed  # old mapping stays consistent
+    for limiter in (second, restarted, resized):
+        limiter.store.close()
+
+
+def _hammer(path, hits):
+    limiter = RateLimiter(limit=50, period=3600.0, store=RateLimitStore(1024, path=path))
+    try:
+        return sum(limiter.hit(f"client-{number % 4}", now=0.0).allowed for number in range(hits))
+    finally:
+        limiter.store.close()
+
+
+def test_concurrent_processes_never_exceed_the_shared_quota(tmp_path):
+    """Test that window locks make check-and-increment atomic across processes."""
+    path = str(tmp_path / "rate-limit")
+    RateLimitStore(1024, path=path).close()
+
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        allowed = pool.starmap(_hammer, [(path, 2000)] * 4)
+
+    assert sum(allowed) == 4 * 50  # 4 clients x limit, however the hits interleave
+
+
+def _request(client_host, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "headers": headers, "client": (client_host, 1234)})
+
+
+def test_request_identifier_trusts_only_configured_proxy_hops(monkeypatch):
+    """Test that client-supplied X-Forwarded-For entries cannot pick the key."""
+    monkeypatch.setattr(settings, "rate_limit_proxy_hops", 1)
+    assert get_request_identifier(_request("10.0.0.1", "6.6.6.6, 203.0.113.7")) == "203.0.113.7"
+    assert get_request_identifier(_request("10.0.0.1")) == "10.0.0.1"
+
+    monkeypatch.setattr(settings, "rate_limit_proxy_hops", 2)
+    assert get_request_identifier(_request("10.0.0.1", "6.6.6.6, 203.0.113.7")) == "6.6.6.6"
+
+    monkeypatch.setattr(settings, "rate_limit_proxy_hops", 0)
+    assert get_request_identifier(_request("10.0.0.1", "6.6.6.6")) == "10.0.0.1"
+
+
+def test_contact_form_is_rate_limited(client, valid_contact_data, monkeypatch):
+    """Test 429 with Retry-After once a client's quota is used up."""
+    monkeypatch.setattr(settings, "rate_limit_per_hour", 2)
+
+    with patch.object(httpx.AsyncClient, "post") as post:
+        post.return_value = httpx.Response(
+            200, json={"ok": True}, request=httpx.Request("POST", str(settings.n8n_webhook_url))
+        )
+        first = client.post("/api/contact", json=valid_contact_data)
+        valid_contact_data["message"] = "A second message with enough content."
+        second = client.post("/api/contact", json=valid_contact_data)
+        valid_contact_data["message"] = "A third message with enough content."
+        third = client.post("/api/contact", json=valid_contact_data)
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["X-RateLimit-Remaining"] == "1"
+    assert second.headers["X-RateLimit-Remaining"] == "0"
+    assert third.status_code == 429
+    assert third.json()["error_code"] == "RATE_LIMIT_EXCEEDED"
+    assert third.headers["Retry-After"] == "1800"
+    assert post.call_count == 2
+
+    stats = client.get("/health/rate-limit").json()
+    assert stats["allowed"] == 2
+    assert stats["rejected"] == 1
+
+
+def test_over_limit_requests_are_rejected_before_body_parsing(client, monkeypatch):
+    """Test that a 429 is sent without reading (here: failing to parse) the body."""
+    monkeypatch.setattr(settings, "rate_limit_per_hour", 1)
+    headers = {"Content-Type": "application/json"}
+
+    first = client.post("/api/contact", content=b"{not json", headers=headers)
+    second = client.post("/api/contact", content=b"{not json", headers=headers)
+
+    assert first.status_code == 422  # counted, then parsed by FastAPI
+    assert second.status_code == 429
+    assert second.json()["error_code"] == "RATE_LIMIT_EXCEEDED"
+    assert client.get("/health").status_code == 200  # other paths are not limited
+
+
+def test_declared_oversized_body_gets_413(client, monkeypatch):
+    """Test the Content-Length cap (checked before the rate limiter)."""
+    monkeypatch.setattr(settings, "rate_limit_per_hour", 1)
+
+    response = client.post("/api/contact", content=b"x" * (settings.max_request_body_bytes + 1))
+
+    assert response.status_code == 413
+    assert response.json()["error_code"] == "PAYLOAD_TOO_LARGE"
+    assert client.get("/health/rate-limit").json()["allowed"] == 0
+
+
+def test_streamed_oversized_body_gets_413(client, valid_contact_data):
+    """Test the byte cap on chunked bodies without Content-Length."""
+
+    def chunks(total):
+        for _ in range(total // 1024):
+            yield b" " * 1024
+
+    oversized = client.post("/api/contact", content=chunks(settings.max_request_body_bytes + 1024))
+    assert oversized.status_code == 413
+    assert oversized.json()["error_code"] == "PAYLOAD_TOO_LARGE"
+
+    small = client.post("/api/contact", content=chunks(2048))
+    assert small.status_code == 422  # within the cap: reaches validation
@@ -0,0 +1,186 @@
+"""
+Differential tests for the tiered HTML sanitizer.
+
+bleach is the reference: strip_markup must return exactly what
+``bleach.clean(text, tags=[], attributes={}, strip=True)`` returns, whichever
+tier ends up handling the input.
+"""
+
+import random
+from unittest.mock import patch
+
+import bleach
+import pytest
+
+from app.services import sanitizer
+from app.services.validation import InputValidator
+
+
+def reference(text: str) -> str:
+    return bleach.clean(text, tags=[], attributes={}, strip=True)
+
+
+CASES = [
+    # Plain text (tier 1)
+    "",
+    "Jane Smith",
+    "jane@example.com",
+    "Bonjour, je voudrais discuter d’un projet à Genève.",
+    "Line one\nLine two\ttabbed",
+    "emoji 🎉 and CJK 漢字",
+    # Simple inline tags, stray brackets, bare ampersands (tier 2)
+    "<b>bold</b> text",
+    "<B >Bold</B>",
+    "a<br/>b<br />c<BR>d",
+    "<span><em>nested</em></span>",
+    "<unknown>x</unknown>",
+    "x > y",
+    "x < y",
+    "1 < 2 > 0",
+    "Tom & Jerry",
+    "a&&b",
+    "R&D",
+    "&x",
+    "&nbsp without semicolon",
+    "trailing &",
+    "<<b>>",
+    "<3 you",
+    "a <b",
+    # Everything bleach must handle (tier 3)
+    '<a href="https://example.com">link</a>',
+    "<b onclick=alert(1)>x</b>",
+    "<p>para</p><p>two</p>",
+    "text<div>block</div>more",
+    "<h1>Title</h1>",
+    "<ul><li>one</li><li>two</li></ul>",
+    "<script>alert('xss')</script>",
+    "<style>a<b</style>",
+    "<textarea><b>x</b></textarea>",
+    "<title>t</title>",
+    "<!-- comment -->visible",
+    "<?php echo 1 ?>",
+    "<!DOCTYPE html>x",
+    "</ x>y",
+    "</b/>",
+    "&amp; &lt; &gt;",
+    "&#60;script&#62;",
+    "&nbsp;&copy;",
+    "&unknown;",
+    "a\r\nb\rc",
+    "nul\x00byte",
+    "bell\x07 and form\x0cfeed",
+    "<svg><circle/></svg>",
+    "<table><tr><td>x</td></tr></table>",
+    "<b>unterminated",
+    "<img src=x onerror=alert(1)>",
+]
+
+TOKENS = [
+    "a",
+    "b",
+    " ",
+    "\n",
+    "\t",
+    "<",
+    ">",
+    "&",
+    "/",
+    "=",
+    "'",
+    '"',
+    "!",
+    "?",
+    "-",
+    "é",
+    "<b>",
+    "</b>",
+    "<B >",
+    "<br/>",
+    "<span>",
+    "</span>",
+    "<em>",
+    "<img>",
+    "<p>",
+    "</p>",
+    "<div>",
+    "<li>",
+    "<script>",
+    "</script>",
+    "<style>",
+    "<textarea>",
+    '<a href="x">',
+    "<i",
+    "<!--",
+    "-->",
+    "<?",
+    "</ ",
+    "&amp;",
+    "&lt;",
+    "&#60;",
+    "&nbsp",
+    "\r\n",
+    "\x00",
+    "\x0c",
+]
+
+
+def _fuzz_corpus(size: int = 3000):
+    rng = random.Random(2024)
+    for _ in range(size):
+        yield "".join(rng.choice(TOKENS) for _ in range(rng.randint(1, 10)))
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_strip_markup_matches_bleach(text):
+    """Test hand-picked inputs across all three tiers."""
+    assert sanitizer.strip_markup(text) == reference(text)
+
+
+def test_strip_markup_matches_bleach_on_fuzzed_corpus():
+    """Test thousands of random token soups for identical output."""
+    for text in _fuzz_corpus():
+        assert sanitizer.strip_markup(text) == reference(text), repr(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Jane Smith", "Hello, I would like to discuss a project.", "d’un projet à Genève"],
+)
+def test_plain_text_is_returned_unchanged(text):
+    """Test that markup-free text skips bleach and is returned as-is."""
+    with patch.object(sanitizer.bleach, "clean") as clean:
+        assert sanitizer.strip_markup(text) is text
+    clean.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("<b>Hi</b> & bye", "Hi &amp; bye"),
+        ("x < y > z", "x &lt; y &gt; z"),
+        ("a<br/>b", "ab"),
+        ("R&D at AT&T", "R&amp;D at AT&amp;T"),
+    ],
+)
+def test_simple_markup_skips_bleach(text, expected):
+    """Test that simple inline tags are stripped without bleach."""
+    with patch.object(sanitizer.bleach, "clean") as clean:
+        assert sanitizer.strip_markup(text) == expected
+    clean.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["<p>x</p>", "<b class=x>y</b>", "&amp;", "<!-- c -->", "<script>x</script>", "a\x00b"],
+)
+def test_ambiguous_markup_falls_back_to_bleach(text):
+    """Test that anything beyond simple inline tags is handed to bleach."""
+    with patch.object(sanitizer.bleach, "clean", wraps=bleach.clean) as clean:
+        sanitizer.strip_markup(text)
+    clean.assert_called_once()
+
+
+def test_sanitize_html_uses_strip_markup():
+    """Test that the validator keeps stripping surrounding whitespace."""
+    assert InputValidator.sanitize_html("  <b>Jane</b> Smith \n") == "Jane Smith"
+    assert InputValidator.sanitize_html("  plain  ") == "plain"
@@ -0,0 +1,146 @@
+"""
+Tests for the spam scorer and its training tool.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import settings
+
+np = pytest.importorskip("numpy")
+
+from app.services.spam_scorer import SpamScorer, features, train  # noqa: E402
+from app.services.webhook import WebhookClient  # noqa: E402
+from app.tools import train_spam  # noqa: E402
+
+SPAM = [
+    "Cheap SEO services, first page ranking on Google guaranteed",
+    "Buy backlinks now, guaranteed ranking and cheap traffic",
+    "Crypto investment opportunity, guaranteed returns, click now",
+    "Cheap traffic for your website, buy now and rank on Google",
+]
+HAM = [
+    "I saw your portfolio and would like to discuss a React project",
+    "Are you available for a freelance project next month?",
+    "Loved your article on FastAPI, do you have time for a call?",
+    "We are hiring a backend developer and your work looks great",
+]
+
+
+@pytest.fixture
+def model():
+    """Spam model trained on the small corpus above."""
+    return train(SPAM + HAM, [True] * len(SPAM) + [False] * len(HAM), dim=1 << 12)
+
+
+def test_features_are_stable_distinct_buckets():
+    """Test hashing: case/punctuation-insensitive, unigrams plus bigrams, in range."""
+    buckets = features("Buy now, BUY now!", dim=1 << 10)
+
+    assert buckets.tolist() == features("buy now buy now", dim=1 << 10).tolist()
+    assert len(buckets) == 4  # "buy", "now", "buy now", "now buy"
+    assert all(0 <= bucket < 1 << 10 for bucket in buckets)
+    assert len(features("", dim=1 << 10)) == 0
+
+
+def test_model_separates_spam_from_legitimate_messages(model):
+    """Test training and batch scoring."""
+    scores = model.score_batch(
+        ["Guaranteed cheap ranking, buy backlinks now", "Could we discuss a project next week?"]
+    )
+
+    assert scores[0] > 0.9
+    assert scores[1] < 0.1
+    assert model.score_batch([""])[0] == pytest.approx(0.5)  # equal priors, no features
+
+
+def test_save_and_load_round_trip(model, tmp_path):
+    """Test the .npz model format."""
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = SpamScorer.load(path, max_batch_size=8)
+
+    assert loaded.dim == model.dim
+    assert loaded.max_batch_size == 8
+    np.testing.assert_array_equal(loaded.score_batch(SPAM), model.score_batch(SPAM))
+
+
+def test_weights_must_have_power_of_two_length():
+    """Test constructor validation (features are folded with a bit mask)."""
+    with pytest.raises(ValueError):
+        SpamScorer(np.zeros(1000, dtype=np.float32), 0.0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_scores_share_one_batch(model):
+    """Test micro-batching: one scoring pass per loop iteration, split at max_batch_size."""
+    texts = SPAM + HAM
+    model.max_batch_size = 5
+
+    scores = await asyncio.gather(*(model.score(text) for text in texts))
+
+    assert scores == pytest.approx(model.score_batch(texts).tolist())
+    assert model.scored == len(texts)
+    assert model.batches == 2
+
+
+def test_training_tool_writes_a_loadable_model(tmp_path, capsys):
+    """Test the CLI on webhook payloads and bare submissions."""
+    webhook = WebhookClient(webhook_url="https://test.n8n.webhook.url/contact")  # type: ignore
+    lines = [
+        {**webhook.build_payload({"subject": "Offer", "message": text}, "req"), "label": "spam"}
+        for text in SPAM
+    ]
+    lines += [{"subject": "Hello", "message": text, "label": False} for text in HAM]
+    source = tmp_path / "submissions.jsonl"
+    source.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+    output = tmp_path / "model.npz"
+
+    args = train_spam.parse_args([str(source), "--output", str(output), "--dim", "4096"])
+    assert train_spam.main(args) == 0
+
+    scores = SpamScorer.load(str(output)).score_batch(["Offer\ncheap ranking guaranteed"])
+    assert scores[0] > 0.9
+    assert "loaded 8 submissions (4 spam)" in capsys.readouterr().err
+
+    source.write_text(json.dumps(lines[0]) + "\n" + json.dumps({"text": "hi", "label": "ham"}))
+    with pytest.raises(ValueError, match="submissions.jsonl:2: no subject or message"):
+        train_spam.main(args)
+
+
+def _submit(client, valid_contact_data, message):
+    with patch.object(httpx.AsyncClient, "post") as post:
+        post.return_value = httpx.Response(
+            200, json={"ok": True}, request=httpx.Request("POST", str(settings.n8n_webhook_url))
+        )
+        response = client.post("/api/contact", json={**valid_contact_data, "message": message})
+    return response, post
+
+
+def test_spam_score_is_forwarded_in_metadata(client, valid_contact_data, model, monkeypatch):
+    """Test that legitimate submissions carry their score to n8n."""
+    monkeypatch.setattr(settings, "spam_model_path", "model.npz")
+    monkeypatch.setattr("app.services.spam_scorer._spam_scorer", model)
+
+    response, post = _submit(client, valid_contact_data, "Could we discuss a React project?")
+
+    assert response.status_code == 200
+    metadata = json.loads(post.call_args.kwargs["content"])["metadata"]
+    assert 0 <= metadata["spam_score"] < 0.1
+
+
+def test_spam_is_not_forwarded(client, valid_contact_data, model, monkeypatch):
+    """Test the threshold short-circuit: usual response, no n8n call."""
+    monkeypatch.setattr(settings, "spam_model_path", "model.npz")
+    monkeypatch.setattr(settings, "spam_threshold", 0.9)
+    monkeypatch.setattr("app.services.spam_scorer._spam_scorer", model)
+
+    response, post = _submit(client, valid_contact_data, "Cheap backlinks, guaranteed ranking now")
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    post.assert_not_called()
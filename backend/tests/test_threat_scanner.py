@@ -0,0 +1,161 @@
+"""
+Equivalence tests for the compiled threat scanner.
+
+The reference functions below are the original rule-by-rule checks; the
+scanner must make the same accept/reject decision on every input.
+"""
+
+import random
+import re
+import pytest
+
+from app.services import threat_scanner
+from app.services.validation import InputValidator
+
+LEGACY_SQL = [
+    r"('\s*(OR|AND)\s*')",
+    r"(--|#|\/\*|\*\/)",
+    r"(;|\|\||&&)",
+    r"(\bUNION\b.*\bSELECT\b)",
+    r"(\bDROP\b|\bDELETE\b|\bINSERT\b)",
+    r"(\bEXEC\b|\bEXECUTE\b)",
+]
+LEGACY_XSS = [
+    r"<script[^>]*>.*?</script>",
+    r"javascript:",
+    r"on\w+\s*=",
+    r"<iframe",
+    r"<object",
+    r"<embed",
+]
+
+
+def legacy_sql_safe(text: str) -> bool:
+    upper = text.upper()
+    return not any(re.search(p, upper, re.IGNORECASE) for p in LEGACY_SQL)
+
+
+def legacy_xss_safe(text: str) -> bool:
+    lower = text.lower()
+    return not any(re.search(p, lower, re.IGNORECASE) for p in LEGACY_XSS)
+
+
+def legacy_verdict(text: str) -> str:
+    if not legacy_xss_safe(text):
+        return "xss"
+    if not legacy_sql_safe(text):
+        return "sql"
+    return "ok"
+
+
+CASES = [
+    "This is a normal message",
+    "'; DROP TABLE users; --",
+    "<script>alert('xss')</script>",
+    "<SCRIPT src=x>\n</script>",
+    "<script>a</script>",
+    "admin' or '1'='1",
+    "a ' AND ' b",
+    "union all select password",
+    "UNION\nSELECT",
+    "reunion selection",
+    "Please execute the plan",
+    "exec",
+    "execution",
+    "dropdown menu",
+    "drop it",
+    "Call me on Monday = great",
+    "onclick =alert(1)",
+    "Javascript:void(0)",
+    "<IFRAME src=x>",
+    "<object data=x>",
+    "<embed src=x>",
+    "email me at a#b",
+    "50/50 split */",
+    "rock && roll",
+    "either || or",
+    "a-b - c",
+    "insert coin; delete <iframe",
+    "drop <script>x</script>",
+    "ſelect union ſelect",
+    "İnsert text",
+    "ﬆop ﬁle ß ŉ",
+    "straße drop",
+    "ǰavascript:",
+    "KELVIN K union Select",
+    "ON CLICK=",
+    "oN =",
+    "",
+]
+
+ALPHABET = list("abcdeijklnoprstuvxy '\"<>/=:;#-*|&\n\t") + [
+    "union",
+    "select",
+    "drop",
+    "exec",
+    "execute",
+    "insert",
+    "delete",
+    " or ",
+    " and ",
+    "script",
+    "</script>",
+    "javascript",
+    "on",
+    "iframe",
+    "object",
+    "embed",
+    "ſ",
+    "ı",
+    "İ",
+    "ß",
+    "ﬁ",
+    "ǰ",
+    "K",
+    "é",
+    " ",
+]
+
+
+def _fuzz_corpus(size: int = 3000):
+    rng = random.Random(1337)
+    for _ in range(size):
+        yield "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 12)))
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_scanner_matches_legacy_rules(text):
+    """Test hand-picked inputs, including case-mapping edge cases."""
+    assert InputValidator.validate_no_sql_injection(text) is legacy_sql_safe(text)
+    assert InputValidator.validate_no_script_tags(text) is legacy_xss_safe(text)
+
+    threat = threat_scanner.scan(text)
+    assert (threat.category if threat else "ok") == legacy_verdict(text)
+
+
+def test_scanner_matches_legacy_rules_on_fuzzed_corpus():
+    """Test thousands of random token soups for identical decisions."""
+    for text in _fuzz_corpus():
+        threat = threat_scanner.scan(text)
+        assert (threat.category if threat else "ok") == legacy_verdict(text), text
+        assert (threat_scanner.scan_sql(text) is None) is legacy_sql_safe(text), text
+        assert (threat_scanner.scan_xss(text) is None) is legacy_xss_safe(text), text
+
+
+def test_scanner_reports_rule():
+    """Test that the firing rule and its position are reported."""
+    threat = threat_scanner.scan("hello; <iframe src=x>")
+
+    assert threat.rule == "xss_iframe"
+    assert threat.category == "xss"
+    assert threat.start == 7
+    assert threat_scanner.scan("x UNION y SELECT").rule == "sql_union_select"
+    assert threat_scanner.scan("fine") is None
+
+
+def test_sanitize_contact_form_reports_xss_before_sql():
+    """Test that mixed attacks keep the original error message."""
+    with pytest.raises(ValueError, match="Dangerous content detected in message"):
+        InputValidator.sanitize_contact_form({"message": "'; drop table x; <iframe>"})
+    with pytest.raises(ValueError, match="Suspicious input detected in message"):
+        InputValidator.sanitize_contact_form({"message": "'; drop table x"})
@@ -2,7 +2,12 @@
 Tests for input validation and sanitization.
 """
 
+import random
+import re
 import pytest
+from pydantic import ValidationError
+
+from app.models import ContactRequest
 from app.services.validation import InputValidator
 
 
@@ -83,3 +88,59 @@ def test_validate_email_domain():
 
     assert InputValidator.validate_email_domain(valid_email) is True
     assert InputValidator.validate_email_domain(disposable_email) is False
+
+
+def _legacy_name_ok(v: str) -> bool:
+    return bool(re.match(r"^[\w\s\-']+$", v, re.UNICODE)) and not re.search(r"\d", v)
+
+
+def _legacy_text(v: str) -> str:
+    return re.sub(r"\s+", " ", v).strip()
+
+
+def test_model_validators_match_legacy_regexes():
+    """Test the precompiled name check and split/join normalization on random input."""
+    alphabet = list("aZ_-'0.@!é漢 \t\n\r\x0b\x0c\x1c\x85\xa0\u2028\u3000") + ["٣", "²", "\u0301"]
+    rng = random.Random(17)
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(2, 12)))
+        try:
+            ContactRequest.validate_name(text)
+            accepted = True
+        except ValueError:
+            accepted = False
+        assert accepted is _legacy_name_ok(text), repr(text)
+        assert ContactRequest.sanitize_text(text) == _legacy_text(text), repr(text)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"subject": "Hello <b>there</b> & more", "message": "Tom & Jerry\n\n  <i>again</i> x > y"},
+        {"name": "Zoë O'Brien-Smith", "rating": 0},
+        {"message": "<p>Paragraph</p> with a <a href='x'>link</a> inside"},
+    ],
+)
+def test_sanitize_model_matches_sanitize_contact_form(valid_contact_data, overrides):
+    """Test that the attribute-based pass equals sanitizing a model_dump() copy."""
+    contact = ContactRequest(**{**valid_contact_data, **overrides})
+
+    sanitized = InputValidator.sanitize_model(contact)
+
+    assert sanitized == InputValidator.sanitize_contact_form(contact.model_dump())
+    assert list(sanitized) == list(contact.model_dump())
+
+
+def test_sanitize_model_rejects_threats(valid_contact_data):
+    """Test that the fused pass keeps the per-field error messages."""
+    contact = ContactRequest(**{**valid_contact_data, "subject": "union all select 1"})
+
+    with pytest.raises(ValueError, match="Suspicious input detected in subject"):
+        InputValidator.sanitize_model(contact)
+
+
+def test_name_with_digits_is_rejected(valid_contact_data):
+    """Test that digits are still rejected by the single-pass name pattern."""
+    with pytest.raises(ValidationError):
+        ContactRequest(**{**valid_contact_data, "name": "Agent 47"})
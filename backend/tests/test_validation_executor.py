@@ -0,0 +1,139 @@
+"""
+Tests for the bounded validation executor.
+"""
+
+import asyncio
+import threading
+import pytest
+
+from app.config import Settings
+from app.models import ContactRequest
+from app.services.validation import InputValidator
+from app.services.validation_executor import ValidationExecutor
+from app.utils.exceptions import ValidationBusyError
+
+FORM = {
+    "name": "Jane Smith",
+    "email": "jane@example.com",
+    "subject": "Project <b>inquiry</b>",
+    "message": "Hello & welcome " * 20,
+    "rating": 5,
+}
+
+
+@pytest.mark.asyncio
+async def test_inline_strategy_runs_on_the_loop_thread():
+    """Test that inline validation runs in place and is timed."""
+    executor = ValidationExecutor("inline")
+
+    ident = await executor.run(threading.get_ident, size=10_000)
+
+    assert ident == threading.get_ident()
+    assert executor.snapshot()["timings"]["inline"]["count"] == 1
+    assert "thread" not in executor.snapshot()["timings"]
+
+
+def test_default_offload_threshold_is_reachable():
+    """Test that the largest valid submission is big enough to be offloaded by default."""
+    fields = ContactRequest.model_fields
+    largest = 254 + sum(  # 254: longest valid email address
+        constraint.max_length
+        for name in ("name", "subject", "message")
+        for constraint in fields[name].metadata
+        if hasattr(constraint, "max_length")
+    )
+
+    assert Settings.model_fields["validation_offload_min_chars"].default < largest
+
+
+@pytest.mark.asyncio
+async def test_thread_strategy_offloads_large_inputs_only():
+    """Test that only inputs above offload_min_chars leave the event loop."""
+    executor = ValidationExecutor("thread", workers=1, offload_min_chars=100)
+    try:
+        small = await executor.run(threading.get_ident, size=99)
+        large = await executor.run(threading.get_ident, size=100)
+    finally:
+        await executor.stop()
+
+    assert small == threading.get_ident()
+    assert large != threading.get_ident()
+    timings = executor.snapshot()["timings"]
+    assert timings["inline"]["count"] == 1
+    assert timings["thread"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_saturated_queue_rejects_immediately():
+    """Test fast rejection once max_pending validations are in flight."""
+    executor = ValidationExecutor("thread", workers=1, max_pending=2, offload_min_chars=0)
+    release = threading.Event()
+    try:
+        blocked = [asyncio.create_task(executor.run(release.wait, 5, size=1)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(ValidationBusyError):
+            await executor.run(release.wait, 5, size=1)
+
+        release.set()
+        assert await asyncio.gather(*blocked) == [True, True]
+    finally:
+        release.set()
+        await executor.stop()
+
+    snapshot = executor.snapshot()
+    assert snapshot["rejected"] == 1
+    assert snapshot["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_content_is_not_counted_as_failure():
+    """Test that ValueError (dangerous input) propagates without failure metrics."""
+    executor = ValidationExecutor("thread", offload_min_chars=0)
+    try:
+        with pytest.raises(ValueError, match="Dangerous content detected in message"):
+            await executor.run(
+                InputValidator.sanitize_contact_form, {"message": "<iframe src=x>"}, size=14
+            )
+        with pytest.raises(ZeroDivisionError):
+            await executor.run(divmod, 1, 0, size=1)
+    finally:
+        await executor.stop()
+
+    assert executor.snapshot()["timings"]["thread"]["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_process_strategy_matches_inline_result():
+    """Test that pre-warmed worker processes return the same sanitized data."""
+    executor = ValidationExecutor("process", workers=1, offload_min_chars=0)
+    try:
+        await executor.start()
+        result = await executor.run(InputValidator.sanitize_contact_form, FORM, size=1)
+    finally:
+        await executor.stop()
+
+    assert result == InputValidator.sanitize_contact_form(FORM)
+    assert executor.snapshot()["timings"]["process"]["count"] == 1
+
+
+def test_unknown_strategy_is_rejected():
+    """Test constructor validation of the strategy name."""
+    with pytest.raises(ValueError):
+        ValidationExecutor("fibers")
+
+
+def test_contact_form_returns_503_when_validation_is_saturated(
+    client, valid_contact_data, monkeypatch
+):
+    """Test that saturation sheds load with 503 VALIDATION_BUSY and Retry-After."""
+    executor = ValidationExecutor("thread", max_pending=1, offload_min_chars=0)
+    executor.pending = 1
+    monkeypatch.setattr("app.services.validation_executor._validation_executor", executor)
+
+    response = client.post("/api/contact", json=valid_contact_data)
+
+    assert response.status_code == 503
+    assert response.json()["error_code"] == "VALIDATION_BUSY"
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/health/validation").json()["rejected"] == 1
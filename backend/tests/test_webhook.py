@@ -2,11 +2,17 @@
 Tests for n8n webhook client.
 """
 
+import asyncio
+import json
 import pytest
 import httpx
 from unittest.mock import AsyncMock, patch, MagicMock
-from app.services.webhook import WebhookClient
-from app.utils.exceptions import WebhookError
+from app.config import settings
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.retry import ExponentialBackoffPolicy, RetryBudget, parse_retry_after
+from app.services.webhook import WebhookClient, get_webhook_client, close_webhook_client
+from app.utils.exceptions import CircuitOpenError, WebhookError
+from app.utils.security import generate_webhook_signature
 
 
 @pytest.mark.asyncio
@@ -80,3 +86,253 @@ async def test_webhook_client_close():
         mock_close.return_value = AsyncMock()
         await client.close()
         mock_close.assert_called_once()
+
+
+def test_webhook_client_applies_timeout_and_limits():
+    """Test that timeout and pool limits reach the underlying HTTP client."""
+    limits = httpx.Limits(max_connections=7, max_keepalive_connections=3)
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact", timeout=4, limits=limits  # type: ignore
+    )
+
+    assert client.client.timeout == httpx.Timeout(4)
+    pool = client.client._transport._pool  # type: ignore[attr-defined]
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+
+
+@pytest.mark.asyncio
+async def test_get_webhook_client_is_pooled_singleton():
+    """Test that the dependency reuses one client and close releases it."""
+    first = get_webhook_client()
+    second = get_webhook_client()
+
+    assert first is second
+    assert first.timeout == settings.n8n_timeout
+
+    await close_webhook_client()
+    assert first.client.is_closed
+    assert get_webhook_client() is not first
+
+
+def _status_error(status_code: int, headers=None) -> httpx.HTTPStatusError:
+    """Build an HTTPStatusError for the given status."""
+    request = httpx.Request("POST", "https://test.n8n.webhook.url/contact")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_retry_policy_classification():
+    """Test that only idempotent-safe failures are retried."""
+    policy = ExponentialBackoffPolicy(base_delay=0.1, max_delay=1.0)
+
+    assert policy.decide(1, 3, httpx.ConnectError("refused")).retry is True
+    assert policy.decide(1, 3, _status_error(503)).retry is True
+    assert policy.decide(1, 3, _status_error(400)).retry is False
+    assert policy.decide(1, 3, _status_error(500)).retry is False
+    assert policy.decide(1, 3, httpx.ReadTimeout("slow")).retry is False
+    assert policy.decide(3, 3, httpx.ConnectError("refused")).reason == "max_attempts"
+
+    for attempt in range(1, 3):
+        delay = policy.decide(attempt, 3, httpx.ConnectError("refused")).delay
+        assert 0 <= delay <= 0.1 * 2 ** (attempt - 1)
+
+
+def test_retry_policy_honours_retry_after():
+    """Test that Retry-After overrides backoff and long waits give up."""
+    policy = ExponentialBackoffPolicy(base_delay=0.1, max_delay=5.0)
+
+    decision = policy.decide(1, 3, _status_error(429, {"Retry-After": "2"}))
+    assert decision.retry is True and decision.delay == 2.0
+
+    decision = policy.decide(1, 3, _status_error(503, {"Retry-After": "120"}))
+    assert decision.retry is False and decision.reason == "retry_after_too_long"
+
+    assert parse_retry_after("not-a-date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_retry_budget_limits_retries():
+    """Test that the token bucket caps retries to a fraction of traffic."""
+    budget = RetryBudget(ratio=0.5, min_per_second=0, burst=2)
+    policy = ExponentialBackoffPolicy(base_delay=0, budget=budget)
+    error = httpx.ConnectError("refused")
+
+    assert policy.decide(1, 5, error).retry is True
+    assert policy.decide(1, 5, error).retry is True
+    assert policy.decide(1, 5, error).reason == "budget_exhausted"
+
+    budget.record_request()
+    budget.record_request()
+    assert policy.decide(1, 5, error).retry is True
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_does_not_retry_client_errors():
+    """Test that a 4xx response fails immediately without retries."""
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact", max_retries=3  # type: ignore
+    )
+
+    with patch.object(client.client, "post") as mock_post:
+        mock_response = MagicMock()
+        mock_response.raise_for_status.side_effect = _status_error(400)
+        mock_post.return_value = mock_response
+
+        with pytest.raises(WebhookError):
+            await client.send_contact_form({"name": "Test User"}, "req_test123")
+
+        assert mock_post.call_count == 1
+
+
+def test_circuit_breaker_opens_and_recovers(monkeypatch):
+    """Test open -> half-open -> closed transitions."""
+    now = {"t": 1000.0}
+    monkeypatch.setattr("app.services.circuit_breaker.time.monotonic", lambda: now["t"])
+    breaker = CircuitBreaker(minimum_calls=4, open_seconds=10, half_open_max_calls=1)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_success(0.1)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure(0.1)
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == pytest.approx(10)
+
+    now["t"] += 11
+    breaker.before_call()  # First probe admitted
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # Probe slots exhausted
+
+    breaker.record_success(0.1)
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_trips_on_slow_calls():
+    """Test that a latency brownout opens the breaker too."""
+    breaker = CircuitBreaker(minimum_calls=3, slow_call_seconds=1.0, slow_call_rate_threshold=0.6)
+
+    for _ in range(3):
+        breaker.record_success(2.5)
+
+    assert breaker.state == "open"
+    assert breaker.snapshot()["slow_call_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_fails_fast_when_circuit_open():
+    """Test that an open breaker short-circuits without touching the network."""
+    breaker = CircuitBreaker(minimum_calls=1)
+    breaker.record_failure(0.1)
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact", breaker=breaker  # type: ignore
+    )
+
+    with patch.object(client.client, "post") as mock_post:
+        with pytest.raises(CircuitOpenError):
+            await client.send_contact_form({"name": "Test User"}, "req_test123")
+        mock_post.assert_not_called()
+
+
+def test_webhook_config_reports_circuit_state(client):
+    """Test that the config endpoint exposes breaker state."""
+    response = client.get("/api/webhook/config")
+
+    assert response.status_code == 200
+    assert response.json()["circuit_breaker"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_batches_concurrent_submissions():
+    """Test that concurrent submissions share one POST and get per-item results."""
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact",  # type: ignore
+        batch_size=3,
+        batch_linger_ms=1000,
+        secret="batch-secret",
+    )
+
+    with patch.object(client.client, "post") as mock_post:
+        mock_response = MagicMock()
+        mock_response.text = "[...]"
+        mock_response.json.return_value = [
+            {"request_id": "req_b", "success": False, "error": "rejected"},
+        ]
+        mock_response.raise_for_status = MagicMock()
+        mock_post.return_value = mock_response
+
+        results = await asyncio.gather(
+            *[
+                client.send_contact_form({"name": "Test User"}, request_id)
+                for request_id in ("req_a", "req_b", "req_c")
+            ],
+            return_exceptions=True,
+        )
+
+        assert mock_post.call_count == 1
+        envelopes = json.loads(mock_post.call_args.kwargs["content"])
+        assert [e["payload"]["request_id"] for e in envelopes] == ["req_a", "req_b", "req_c"]
+        assert all(
+            e["signature"] == generate_webhook_signature(e["payload"], "batch-secret")
+            for e in envelopes
+        )
+
+    assert results[0] == {"success": True}
+    assert isinstance(results[1], WebhookError)
+    assert results[2] == {"success": True}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_gives_each_caller_its_own_error():
+    """Test that every caller of a failed batch gets an error carrying its own payload."""
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact",  # type: ignore
+        batch_size=2,
+        batch_linger_ms=1000,
+        max_retries=1,
+    )
+
+    with patch.object(client.client, "post", side_effect=httpx.ConnectError("refused")):
+        errors = await asyncio.gather(
+            *[
+                client.send_contact_form({"name": "Test User"}, request_id)
+                for request_id in ("req_a", "req_b")
+            ],
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(error, WebhookError) for error in errors)
+    assert errors[0] is not errors[1]
+    assert [error.payload["request_id"] for error in errors] == ["req_a", "req_b"]
+    assert errors[0].__cause__ is errors[1].__cause__
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_webhook_batcher_flushes_after_linger():
+    """Test that a partial batch is flushed once max_linger_ms elapses."""
+    client = WebhookClient(
+        webhook_url="https://test.n8n.webhook.url/contact",  # type: ignore
+        batch_size=50,
+        batch_linger_ms=5,
+    )
+
+    with patch.object(client.client, "post") as mock_post:
+        mock_response = MagicMock()
+        mock_response.text = ""
+        mock_response.raise_for_status = MagicMock()
+        mock_post.return_value = mock_response
+
+        result = await asyncio.wait_for(
+            client.send_contact_form({"name": "Test User"}, "req_single"), timeout=1
+        )
+
+    assert result == {"success": True}
+    assert len(json.loads(mock_post.call_args.kwargs["content"])) == 1
+    await client.close()